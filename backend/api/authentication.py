@@ -2,6 +2,7 @@
 
 This module provides a `registered_user` dependency injection function for other routes
 to use to both ensure a user is authenticated and resolve to the logged in User's model.
+Async routes use its `async_registered_user` counterpart, which does not occupy a thread.
 Further, this module provides the routes and logic for backend authentication.
 
 The router is mounted at `/auth` and provides the following endpoints:
@@ -67,7 +68,7 @@ from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 from fastapi.responses import RedirectResponse
 from ..env import getenv
-from ..services import UserService, GitHubService
+from ..services import AsyncUserService, UserService, GitHubService
 from ..models import User
 
 
@@ -93,7 +94,25 @@ def registered_user(
             auth_info = jwt.decode(
                 token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
             )
-            user = user_service.get(auth_info["pid"])
+            user = user_service.get_registered(auth_info["pid"])
+            if user:
+                return user
+        except:
+            ...
+    raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+async def async_registered_user(
+    user_service: AsyncUserService = Depends(),
+    token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
+) -> User:
+    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated."""
+    if token:
+        try:
+            auth_info = jwt.decode(
+                token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
+            )
+            user = await user_service.get_registered(auth_info["pid"])
             if user:
                 return user
         except:
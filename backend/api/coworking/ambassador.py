@@ -2,11 +2,12 @@
 
 This API is used to make and manage reservations."""
 
-from typing import Sequence
-from fastapi import APIRouter, Depends
+from typing import Iterator, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from ..authentication import registered_user
 from ...services.coworking.reservation import ReservationService
-from ...models import User
+from ...models import User, KeysetPaginated, KeysetPaginationParams
 from ...models.coworking import Reservation, ReservationPartial
 
 __authors__ = ["Kris Jordan"]
@@ -28,6 +29,43 @@ def active_and_upcoming_reservations(
     return reservation_svc.list_all_active_and_upcoming(subject)
 
 
+@api.get("/page", tags=["Coworking"])
+def active_and_upcoming_reservations_page(
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+    cursor: str = "",
+    page_size: int = Query(default=25, ge=1, le=100),
+) -> KeysetPaginated[Reservation]:
+    """List one page of active and upcoming reservations, latest first.
+
+    Pass the `next_cursor` of a page as `cursor` to fetch the following page."""
+    pagination_params = KeysetPaginationParams(cursor=cursor, page_size=page_size)
+    try:
+        return reservation_svc.list_all_active_and_upcoming_page(
+            subject, pagination_params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api.get("/stream", tags=["Coworking"])
+def stream_active_and_upcoming_reservations(
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> StreamingResponse:
+    """Stream active and upcoming reservations as newline-delimited JSON, latest first.
+
+    Reservations are sent as they are read, so the first can be rendered before the last has
+    been loaded."""
+    reservations = reservation_svc.stream_all_active_and_upcoming(subject)
+
+    def lines() -> Iterator[str]:
+        for reservation in reservations:
+            yield reservation.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @api.put("/checkin", tags=["Coworking"])
 def checkin_reservation(
     reservation: ReservationPartial,
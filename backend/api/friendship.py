@@ -1,11 +1,33 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+from typing import Any, List
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.services.coworking.reservation import ReservationService
-from ..services.friendship import FriendshipService
+from ..database import async_db_session
+from ..services.friendship import (
+    AsyncFriendshipService,
+    FriendshipService,
+    SUGGESTIONS_PER_USER,
+)
+from ..services.presence import presence_hub
 from ..models.user import User
-from .authentication import registered_user
+from ..models.friend_request_result import FriendRequestResult
+from ..models.friend_suggestion import FriendSuggestion
+from ..models.pagination import KeysetPaginated, KeysetPaginationParams
+from .authentication import async_registered_user, registered_user
 
 api = APIRouter(prefix="/api/friendships")
 openapi_tags = {
@@ -13,6 +35,8 @@ openapi_tags = {
     "description": "Managing friendships and listing users.",
 }
 
+PRESENCE_KEEPALIVE_SECONDS = 15
+
 
 class CoworkingStatusForm(BaseModel):
     is_coworking: bool
@@ -38,6 +62,36 @@ def list_users(
     return friendship_service.list_eligible_users(user.pid)
 
 
+@api.get("/users/page", response_model=KeysetPaginated[User], tags=["Friendships"])
+async def list_users_page(
+    user: User = Depends(async_registered_user),
+    friendship_service: AsyncFriendshipService = Depends(),
+    cursor: str = "",
+    page_size: int = Query(default=10, ge=1, le=100),
+    filter: str = "",
+):
+    """
+    List one page of the users eligible for a friend request from the current user.
+
+    Args:
+        cursor (str): The `next_cursor` of the previous page, or empty for the first page.
+        page_size (int): The maximum number of users to return.
+        filter (str): An optional prefix of the first name, last name or onyen to search for.
+
+    Returns:
+        KeysetPaginated[User]: A page of eligible users and the cursor of the next page.
+    """
+    pagination_params = KeysetPaginationParams(
+        cursor=cursor, page_size=page_size, filter=filter
+    )
+    try:
+        return await friendship_service.list_eligible_users_page(
+            user.pid, pagination_params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @api.post("/send-request/{receiver_id}", tags=["Friendships"])
 def send_friend_request(
     receiver_id: int,
@@ -67,9 +121,9 @@ def send_friend_request(
 
 
 @api.get("/requests/received", response_model=List[User], tags=["Friendships"])
-def get_received_friend_requests(
-    user: User = Depends(registered_user),
-    friendship_service: FriendshipService = Depends(),
+async def get_received_friend_requests(
+    user: User = Depends(async_registered_user),
+    friendship_service: AsyncFriendshipService = Depends(),
 ):
     """
     Get all received friend requests for the authenticated user.
@@ -78,31 +132,42 @@ def get_received_friend_requests(
         list[FriendRequest]: A list of received friend requests.
     """
     try:
-        received_requests = friendship_service.get_received_requests(user.pid)
+        received_requests = await friendship_service.get_received_requests(user.pid)
         return received_requests
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @api.get("/requests/received/count", response_model=int, tags=["Friendships"])
-def get_received_friend_requests_count(
-    user: User = Depends(registered_user),
-    friendship_service: FriendshipService = Depends(),
+async def get_received_friend_requests_count(
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    user: User = Depends(async_registered_user),
+    friendship_service: AsyncFriendshipService = Depends(),
 ):
     """
     Get the count of received friend requests for the authenticated user.
 
+    The response carries an ETag derived from the count, so clients polling with
+    `If-None-Match` receive an empty 304 response while the count is unchanged.
+
     Returns:
         int: The number of received friend requests.
     """
     try:
-        received_requests_count = friendship_service.get_received_requests_count(
+        received_requests_count = await friendship_service.get_received_requests_count(
             user.pid
         )
-        return received_requests_count
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    etag = f'"{user.pid}-{received_requests_count}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return received_requests_count
+
 
 @api.put("/accept/{request_id}", tags=["Friendships"])
 def accept_friend_request(
@@ -147,10 +212,66 @@ def reject_friend_request(
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@api.get("/friends", response_model=list[User], tags=["Friendships"])
-def get_friends(
+@api.post(
+    "/send-requests",
+    response_model=list[FriendRequestResult],
+    tags=["Friendships"],
+)
+def send_friend_requests(
+    receiver_ids: list[int] = Body(),
     user: User = Depends(registered_user),
     friendship_service: FriendshipService = Depends(),
+):
+    """
+    Send friend requests to many users at once.
+
+    Args:
+        receiver_ids (list[int]): The pids of the users to send friend requests to.
+        user (User): The user sending the requests, obtained from the dependency.
+
+    Returns:
+        list[FriendRequestResult]: Whether the request to each receiver was sent.
+    """
+    return friendship_service.create_friend_requests(user.pid, receiver_ids)
+
+
+@api.put("/accept-all", response_model=list[FriendRequestResult], tags=["Friendships"])
+def accept_all_friend_requests(
+    user: User = Depends(registered_user),
+    friendship_service: FriendshipService = Depends(),
+):
+    """
+    Accept every pending friend request received by the authenticated user.
+
+    Returns:
+        list[FriendRequestResult]: The senders whose requests were accepted.
+    """
+    return friendship_service.accept_requests(user.pid)
+
+
+@api.put("/reject-many", response_model=list[FriendRequestResult], tags=["Friendships"])
+def reject_friend_requests(
+    sender_ids: list[int] = Body(),
+    user: User = Depends(registered_user),
+    friendship_service: FriendshipService = Depends(),
+):
+    """
+    Reject many pending friend requests at once.
+
+    Args:
+        sender_ids (list[int]): The pids of the senders whose requests to reject.
+        user (User): The user rejecting the requests, obtained from the dependency.
+
+    Returns:
+        list[FriendRequestResult]: Whether the request from each sender was rejected.
+    """
+    return friendship_service.reject_requests(user.pid, sender_ids)
+
+
+@api.get("/friends", response_model=list[User], tags=["Friendships"])
+async def get_friends(
+    user: User = Depends(async_registered_user),
+    friendship_service: AsyncFriendshipService = Depends(),
 ):
     """
     Get all friends for the authenticated user.
@@ -159,11 +280,29 @@ def get_friends(
         list[User]: A list of friends for the authenticated user.
     """
     try:
-        return friendship_service.get_friends(user.pid)
+        return await friendship_service.get_friends(user.pid)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@api.get("/suggestions", response_model=list[FriendSuggestion], tags=["Friendships"])
+async def get_friend_suggestions(
+    k: int = Query(default=10, ge=1, le=SUGGESTIONS_PER_USER),
+    user: User = Depends(async_registered_user),
+    friendship_service: AsyncFriendshipService = Depends(),
+):
+    """
+    Suggest users for the authenticated user to befriend, ranked by mutual friends.
+
+    Args:
+        k (int): The maximum number of suggestions to return.
+
+    Returns:
+        list[FriendSuggestion]: The suggested users and their mutual friend counts.
+    """
+    return await friendship_service.suggest_friends(user.pid, k)
+
+
 @api.put("/update-coworking/{user_pid}", tags=["Coworking"])
 def update_coworking_status(
     user_pid: int,
@@ -180,14 +319,65 @@ def update_coworking_status(
     )
 
 
+@api.get("/friends-coworking-status/stream", tags=["Friendships"])
+async def stream_friends_coworking_status(
+    request: Request,
+    user: User = Depends(async_registered_user),
+    friendship_service: AsyncFriendshipService = Depends(),
+    session: AsyncSession = Depends(async_db_session),
+):
+    """
+    Stream the coworking status of the authenticated user's friends as server-sent events.
+
+    The stream opens with a `snapshot` event holding the same list as
+    `/friends-coworking-status/{user_pid}`, followed by a `presence` event for each friend
+    whose coworking status changes. Comment lines are sent periodically as a keep-alive.
+    """
+    # Subscribe before reading the snapshot so no change between the two is missed.
+    subscription = presence_hub.subscribe(user.pid)
+    try:
+        snapshot = await friendship_service.get_friends_coworking_status(user.pid)
+    except Exception:
+        presence_hub.unsubscribe(subscription)
+        raise
+    # The stream can stay open for hours; give the database connection back now rather
+    # than when the response ends.
+    await session.close()
+
+    async def events():
+        try:
+            yield _server_sent_event("snapshot", snapshot)
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.get(), timeout=PRESENCE_KEEPALIVE_SECONDS
+                    )
+                    yield _server_sent_event("presence", message)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            presence_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _server_sent_event(event: str, data: Any) -> str:
+    """Format a named server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @api.get(
     "/friends-coworking-status/{user_pid}",
     response_model=list[dict],
     tags=["Friendships"],
 )
-def get_friends_coworking_status(
+async def get_friends_coworking_status(
     user_pid: int,
-    friendship_service: FriendshipService = Depends(),
+    friendship_service: AsyncFriendshipService = Depends(),
 ):
     """
     Get the coworking status of friends.
@@ -195,4 +385,4 @@ def get_friends_coworking_status(
     Args:
         user_id (int): The ID of the user.
     """
-    return friendship_service.get_friends_coworking_status(user_pid)
+    return await friendship_service.get_friends_coworking_status(user_pid)
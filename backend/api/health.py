@@ -5,6 +5,7 @@ Production systems monitor these end points upon deployment, and at regular inte
 
 
 from fastapi import APIRouter, Depends
+from ..models import PoolsStatus
 from ..services.health import HealthService
 
 
@@ -23,3 +24,9 @@ api = APIRouter(prefix="/api/health")
 @api.get("", tags=["System Health"])
 def health_check(health_svc: HealthService = Depends()) -> str:
     return health_svc.check()
+
+
+@api.get("/pool", tags=["System Health"])
+def pool_status(health_svc: HealthService = Depends()) -> PoolsStatus:
+    """Report the usage of the `sync` and `async` database connection pools, each null when PgBouncer pools connections."""
+    return health_svc.pool_status()
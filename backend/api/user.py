@@ -1,9 +1,9 @@
 """User operations open to registered users such as searching for fellow user profiles."""
 
 from fastapi import APIRouter, Depends
-from ..services import UserService
+from ..services import AsyncUserService
 from ..models import User
-from .authentication import registered_user
+from .authentication import async_registered_user
 
 api = APIRouter(prefix="/api/user")
 openapi_tags = {
@@ -13,8 +13,10 @@ openapi_tags = {
 
 
 @api.get("", response_model=list[User], tags=["Users"])
-def search(
-    q: str, subject: User = Depends(registered_user), user_svc: UserService = Depends()
+async def search(
+    q: str,
+    subject: User = Depends(async_registered_user),
+    user_svc: AsyncUserService = Depends(),
 ):
     """Search for users based on a query string which matches against name, onyen, and email address."""
-    return user_svc.search(subject, q)
+    return await user_svc.search(subject, q)
@@ -1,7 +1,38 @@
-"""SQLAlchemy DB Engine and Session niceties for FastAPI dependency injection."""
+"""SQLAlchemy DB Engine and Session niceties for FastAPI dependency injection.
+
+Routes are served by either a synchronous `Session` from `db_session`, which FastAPI runs on its
+threadpool, or an `AsyncSession` from `async_db_session`, which awaits the database on the event
+loop through asyncpg. Both engines keep their own pool, configured by the same settings.
+
+The engines and their connection pool are configured by optional environment variables:
+
+* `POSTGRES_ECHO`: log every SQL statement (default `false`).
+* `POSTGRES_POOL_SIZE`: connections kept open in the pool (default `5`).
+* `POSTGRES_MAX_OVERFLOW`: connections opened beyond the pool size under load (default `10`).
+* `POSTGRES_POOL_TIMEOUT`: seconds to wait for a connection before failing (default `30`).
+* `POSTGRES_POOL_RECYCLE`: seconds after which a connection is replaced, `-1` never (default `1800`).
+* `POSTGRES_POOL_PRE_PING`: test connections for liveness when checked out (default `true`).
+* `POSTGRES_STATEMENT_TIMEOUT`: milliseconds after which a statement is cancelled, `0` never
+  (default `0`).
+* `POSTGRES_PGBOUNCER`: connect through PgBouncer in transaction pooling mode (default `false`).
+  PgBouncer pools the connections itself, so the engine opens a connection per checkout instead of
+  keeping a pool, no startup options are sent and asyncpg does not prepare statements: set the
+  statement timeout on the database role.
+"""
+
+import threading
+import time
+from uuid import uuid4
 
 import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    QueuePool,
+)
 from .env import getenv
 
 __authors__ = ["Kris Jordan"]
@@ -9,9 +40,10 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
-def _engine_str(database: str = getenv("POSTGRES_DATABASE")) -> str:
+def _engine_str(
+    database: str = getenv("POSTGRES_DATABASE"), dialect: str = "postgresql+psycopg2"
+) -> str:
     """Helper function for reading settings from environment variables to produce connection string."""
-    dialect = "postgresql+psycopg2"
     user = getenv("POSTGRES_USER")
     password = getenv("POSTGRES_PASSWORD")
     host = getenv("POSTGRES_HOST")
@@ -19,9 +51,131 @@ def _engine_str(database: str = getenv("POSTGRES_DATABASE")) -> str:
     return f"{dialect}://{user}:{password}@{host}:{port}/{database}"
 
 
-engine = sqlalchemy.create_engine(_engine_str(), echo=True)
+def _getenv_bool(variable: str, default: str) -> bool:
+    return getenv(variable, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+class MeteredQueuePool(QueuePool):
+    """A QueuePool that also records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._checkouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            with self._metrics_lock:
+                self._checkouts += 1
+                self._wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def metrics(self) -> dict[str, int | float]:
+        """The pool's current usage and the wait time of its checkouts so far."""
+        with self._metrics_lock:
+            checkouts = self._checkouts
+            wait_seconds = self._wait_seconds
+            max_wait_seconds = self._max_wait_seconds
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": checkouts,
+            "wait_seconds_total": wait_seconds,
+            "wait_seconds_max": max_wait_seconds,
+        }
+
+
+class MeteredAsyncAdaptedQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """The asyncio-compatible counterpart of MeteredQueuePool used by AsyncEngines."""
+
+
+def _pgbouncer() -> bool:
+    return _getenv_bool("POSTGRES_PGBOUNCER", "false")
+
+
+def _pool_options() -> dict:
+    """Engine options shared by the synchronous and asynchronous engines."""
+    options = {"echo": _getenv_bool("POSTGRES_ECHO", "false")}
+    if _pgbouncer():
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=int(getenv("POSTGRES_POOL_SIZE", "5")),
+            max_overflow=int(getenv("POSTGRES_MAX_OVERFLOW", "10")),
+            pool_timeout=float(getenv("POSTGRES_POOL_TIMEOUT", "30")),
+            pool_recycle=int(getenv("POSTGRES_POOL_RECYCLE", "1800")),
+            pool_pre_ping=_getenv_bool("POSTGRES_POOL_PRE_PING", "true"),
+        )
+    return options
+
+
+def _statement_timeout() -> int:
+    """The statement timeout in milliseconds, or 0 if statements are never cancelled."""
+    return 0 if _pgbouncer() else int(getenv("POSTGRES_STATEMENT_TIMEOUT", "0"))
+
+
+def make_engine(database: str = getenv("POSTGRES_DATABASE")) -> sqlalchemy.Engine:
+    """Create an engine for database configured by the optional `POSTGRES_*` environment variables."""
+    options = _pool_options()
+    if not _pgbouncer():
+        options["poolclass"] = MeteredQueuePool
+    connect_args = {}
+    if _statement_timeout() > 0:
+        connect_args["options"] = f"-c statement_timeout={_statement_timeout()}"
+    return sqlalchemy.create_engine(
+        _engine_str(database), connect_args=connect_args, **options
+    )
+
+
+def make_async_engine(database: str = getenv("POSTGRES_DATABASE")) -> AsyncEngine:
+    """Create an asyncpg engine for database configured like the engine of `make_engine`."""
+    options = _pool_options()
+    connect_args = {}
+    if _pgbouncer():
+        # PgBouncer may run each statement on a different server connection than the one it was
+        # prepared on, so nothing is cached and names are never reused.
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    else:
+        options["poolclass"] = MeteredAsyncAdaptedQueuePool
+    if _statement_timeout() > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(_statement_timeout())
+        }
+    return create_async_engine(
+        _engine_str(database, "postgresql+asyncpg"),
+        connect_args=connect_args,
+        **options,
+    )
+
+
+def pool_metrics(
+    engine: sqlalchemy.Engine | AsyncEngine,
+) -> dict[str, int | float] | None:
+    """The metrics of engine's connection pool, or None if it does not keep a pool."""
+    if isinstance(engine.pool, MeteredQueuePool):
+        return engine.pool.metrics()
+    return None
+
+
+engine = make_engine()
 """Application-level SQLAlchemy database engine."""
 
+async_engine = make_async_engine()
+"""Application-level SQLAlchemy database engine for asynchronous sessions."""
+
 
 def db_session():
     """Generator function offering dependency injection of SQLAlchemy Sessions."""
@@ -30,3 +184,9 @@ def db_session():
         yield session
     finally:
         session.close()
+
+
+async def async_db_session():
+    """Generator function offering dependency injection of SQLAlchemy AsyncSessions."""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
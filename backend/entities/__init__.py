@@ -21,6 +21,8 @@ from .user_role_table import user_role_table
 from .organization_entity import OrganizationEntity
 from .event_entity import EventEntity
 from .friendship_entity import FriendshipEntity
+from .friend_adjacency_entity import FriendAdjacencyEntity
+from .friend_suggestion_entity import FriendSuggestionEntity
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -3,3 +3,8 @@ from .room_entity import RoomEntity
 from .seat_entity import SeatEntity
 from .reservation_entity import ReservationEntity
 from .reservation_seat_table import reservation_seat_table
+from .reservation_archive_table import (
+    reservation_archive_table,
+    reservation_user_archive_table,
+    reservation_seat_archive_table,
+)
@@ -0,0 +1,48 @@
+"""Archive tables holding reservations that ended in a terminal state long ago.
+
+Rows are moved here from `coworking__reservation` and its join tables by
+`ReservationService.archive_reservations` (see `script/archive_reservations.py`), keeping the
+tables queried on every coworking request small. Archived rows are kept for reporting only and
+are not read by the application."""
+
+from sqlalchemy import Table, Column, ForeignKey, Integer, String, Boolean, DateTime
+from ..entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+reservation_archive_table = Table(
+    "coworking__reservation_archive",
+    EntityBase.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("start", DateTime, nullable=False),
+    Column("end", DateTime, nullable=False),
+    Column("state", String, nullable=False),
+    Column("walkin", Boolean, nullable=False),
+    Column("room_id", String, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+reservation_user_archive_table = Table(
+    "coworking__reservation_user_archive",
+    EntityBase.metadata,
+    Column(
+        "reservation_id",
+        ForeignKey("coworking__reservation_archive.id"),
+        primary_key=True,
+    ),
+    Column("user_id", Integer, primary_key=True),
+)
+
+reservation_seat_archive_table = Table(
+    "coworking__reservation_seat_archive",
+    EntityBase.metadata,
+    Column(
+        "reservation_id",
+        ForeignKey("coworking__reservation_archive.id"),
+        primary_key=True,
+    ),
+    Column("seat_id", Integer, primary_key=True),
+)
@@ -1,7 +1,8 @@
 """Entity for Reservations."""
 
 from datetime import datetime
-from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Index
+from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Index, Computed
+from sqlalchemy.dialects.postgresql import TSRANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
 from ..entity_base import EntityBase
 from ...models.coworking import Reservation, ReservationState
@@ -21,12 +22,23 @@ class ReservationEntity(EntityBase):
     __tablename__ = "coworking__reservation"
     __table_args__ = (
         Index("coworking__reservation_time_idx", "start", "end", "state", unique=False),
+        Index(
+            "coworking__reservation_time_range_idx",
+            "time_range",
+            postgresql_using="gist",
+        ),
     )
 
     # Reservation Model Fields
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # [start, end) maintained by the database for GiST-indexed overlap (&&) queries
+    time_range: Mapped[Range[datetime]] = mapped_column(
+        TSRANGE,
+        Computed("tsrange(start, greatest(start, \"end\"), '[)')", persisted=True),
+        deferred=True,
+    )
     state: Mapped[ReservationState] = mapped_column(String, nullable=False)
     walkin: Mapped[bool] = mapped_column(Boolean, nullable=False)
     room_id: Mapped[str] = mapped_column(
@@ -0,0 +1,33 @@
+"""Definition of SQLAlchemy table-backed object mapping entity for the friend adjacency list.
+
+The `friend_adjacency` table is a denormalized, symmetric copy of the accepted rows of the
+`friendships` table: an accepted friendship between users A and B is stored as the two rows
+(A, B) and (B, A). This lets a user's friends be read with a single range scan over the
+primary key rather than an OR over both sides of `friendships`.
+
+Rows are maintained automatically by mapper event listeners on `FriendshipEntity`; there
+is no reason to write to this table directly."""
+
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from .entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class FriendAdjacencyEntity(EntityBase):
+    """Serves as the database model schema defining the shape of the `friend_adjacency` table"""
+
+    __tablename__ = "friend_adjacency"
+
+    # PID of the user whose friend list this row belongs to
+    user_pid: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user.pid"), primary_key=True
+    )
+
+    # PID of the friend
+    friend_pid: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user.pid"), primary_key=True
+    )
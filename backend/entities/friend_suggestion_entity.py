@@ -0,0 +1,36 @@
+"""Definition of SQLAlchemy table-backed object mapping entity for precomputed friend suggestions.
+
+The `friend_suggestion` table holds each user's top friend suggestions ranked by the number of
+mutual friends. It is rebuilt in bulk by `FriendshipService.refresh_friend_suggestions`, which
+is meant to run periodically (see `script/refresh_friend_suggestions.py`), so reading a user's
+suggestions is a range scan over at most `k` rows of the primary key."""
+
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from .entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class FriendSuggestionEntity(EntityBase):
+    """Serves as the database model schema defining the shape of the `friend_suggestion` table"""
+
+    __tablename__ = "friend_suggestion"
+
+    # PID of the user the suggestion is for
+    user_pid: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user.pid"), primary_key=True
+    )
+
+    # Position of the suggestion in the user's ranking, starting at 1
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # PID of the suggested user
+    candidate_pid: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user.pid"), nullable=False
+    )
+
+    # Number of friends the user and the suggested user have in common
+    mutual_friends: Mapped[int] = mapped_column(Integer, nullable=False)
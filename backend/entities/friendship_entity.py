@@ -1,16 +1,30 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Friendships."""
 
-from sqlalchemy import Integer, String, TIMESTAMP, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship, backref
+from sqlalchemy import Integer, String, TIMESTAMP, ForeignKey, Connection, Index, event
+from sqlalchemy import delete, inspect, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Mapped, mapped_column, relationship, backref, Mapper
 from typing import Self
 from .entity_base import EntityBase
 from .user_entity import UserEntity
+from .friend_adjacency_entity import FriendAdjacencyEntity
 
 
 class FriendshipEntity(EntityBase):
     """Serves as the database model schema defining the shape of the `friendships` table"""
 
     __tablename__ = "friendships"
+    __table_args__ = (
+        Index("friendships_receiver_status_idx", "receiver", "status"),
+        Index("friendships_sender_status_idx", "sender", "status"),
+        # At most one friendship row may exist per unordered pair of users.
+        Index(
+            "friendships_pair_idx",
+            text("least(sender, receiver)"),
+            text("greatest(sender, receiver)"),
+            unique=True,
+        ),
+    )
 
     # Unique ID for the friendship entry
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -37,3 +51,57 @@ class FriendshipEntity(EntityBase):
         backref=backref("received_friend_requests"),
         foreign_keys=[receiver],
     )
+
+
+def link_friends(connection: Connection, pairs: list[tuple[int, int]]) -> None:
+    """Insert both directions of each accepted (sender, receiver) pair into `friend_adjacency`."""
+    if not pairs:
+        return
+    rows = [{"user_pid": a, "friend_pid": b} for a, b in pairs] + [
+        {"user_pid": b, "friend_pid": a} for a, b in pairs
+    ]
+    connection.execute(
+        insert(FriendAdjacencyEntity).values(rows).on_conflict_do_nothing()
+    )
+
+
+def unlink_friends(connection: Connection, pairs: list[tuple[int, int]]) -> None:
+    """Remove both directions of each (sender, receiver) pair from `friend_adjacency`."""
+    if not pairs:
+        return
+    connection.execute(
+        delete(FriendAdjacencyEntity).where(
+            tuple_(
+                FriendAdjacencyEntity.user_pid, FriendAdjacencyEntity.friend_pid
+            ).in_(pairs + [(b, a) for a, b in pairs])
+        )
+    )
+
+
+@event.listens_for(FriendshipEntity, "after_insert")
+def _friendship_inserted(
+    mapper: Mapper, connection: Connection, target: FriendshipEntity
+) -> None:
+    if target.status == "accepted":
+        link_friends(connection, [(target.sender, target.receiver)])
+
+
+@event.listens_for(FriendshipEntity, "after_update")
+def _friendship_updated(
+    mapper: Mapper, connection: Connection, target: FriendshipEntity
+) -> None:
+    # The attribute history still holds pre-flush values at this point, so the pair the
+    # row used to describe can be unlinked before the current pair is (re)linked.
+    state = inspect(target)
+    old_sender = state.attrs.sender.history.deleted or [target.sender]
+    old_receiver = state.attrs.receiver.history.deleted or [target.receiver]
+    unlink_friends(connection, [(old_sender[0], old_receiver[0])])
+    if target.status == "accepted":
+        link_friends(connection, [(target.sender, target.receiver)])
+
+
+@event.listens_for(FriendshipEntity, "after_delete")
+def _friendship_deleted(
+    mapper: Mapper, connection: Connection, target: FriendshipEntity
+) -> None:
+    unlink_friends(connection, [(target.sender, target.receiver)])
@@ -1,7 +1,7 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Users."""
 
 
-from sqlalchemy import Boolean, Integer, String
+from sqlalchemy import DDL, Boolean, Index, Integer, String, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Self
 from .entity_base import EntityBase
@@ -18,6 +18,20 @@ class UserEntity(EntityBase):
 
     # Name for the user table in the PostgreSQL database
     __tablename__ = "user"
+    __table_args__ = (
+        # Sort key for keyset pagination of users by name
+        Index("user_name_pid_idx", "last_name", "first_name", "pid"),
+        # Trigram indexes serving the substring (ILIKE '%query%') matches of user search
+        *(
+            Index(
+                f"user_{column}_trgm_idx",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("first_name", "last_name", "onyen", "email")
+        ),
+    )
 
     # Unique ID for the user entry
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -120,3 +134,11 @@ class UserEntity(EntityBase):
         self.github_id = model.github_id or None
         self.github_avatar = model.github_avatar or ""
         self.is_coworking = model.is_coworking
+
+
+# The trigram operator classes of the search indexes are provided by the pg_trgm extension.
+event.listen(
+    UserEntity.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
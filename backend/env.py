@@ -11,14 +11,15 @@ __license__ = "MIT"
 dotenv.load_dotenv(f"{os.path.dirname(__file__)}/.env", verbose=True)
 
 
-def getenv(variable: str) -> str:
+def getenv(variable: str, default: str | None = None) -> str:
     """Get value of environment variable or raise an error if undefined.
 
     Unlike `os.getenv`, our application expects all environment variables it needs to be defined
     and we intentionally fast error out with a diagnostic message to avoid scenarios of running
-    the application when expected environment variables are not set.
+    the application when expected environment variables are not set. Optional settings pass a
+    `default` that is used when the variable is not set.
     """
-    value = os.getenv(variable)
+    value = os.getenv(variable, default)
     if value is not None:
         return value
     else:
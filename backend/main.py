@@ -1,6 +1,8 @@
 """Entrypoint of backend API exposing the FastAPI `app` to be served by an application server such as uvicorn."""
 
 
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -19,6 +21,10 @@ from .api.coworking import status, reservation, ambassador
 from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
 from .services.exceptions import UserPermissionException, ResourceNotFoundException
+from .services.coworking.reservation_sweeper import (
+    RESERVATION_SWEEP_SECONDS,
+    run_reservation_sweeper,
+)
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -28,8 +34,21 @@ description = """
 Welcome to the UNC Computer Science **Experience Labs** RESTful Application Programming Interface.
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background tasks for the lifetime of the application."""
+    sweeper = None
+    if RESERVATION_SWEEP_SECONDS > 0:
+        sweeper = asyncio.create_task(run_reservation_sweeper())
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+
+
 # Metadata to improve the usefulness of OpenAPI Docs /docs API Explorer
 app = FastAPI(
+    lifespan=lifespan,
     title="UNC CS Experience Labs API",
     version="0.0.1",
     description=description,
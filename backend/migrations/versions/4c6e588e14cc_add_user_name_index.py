@@ -0,0 +1,28 @@
+"""Add user name index for keyset pagination
+
+Revision ID: 4c6e588e14cc
+Revises: d23342b6e0a2
+Create Date: 2026-10-18 11:20:16.904731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "4c6e588e14cc"
+down_revision = "d23342b6e0a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "user_name_pid_idx",
+        "user",
+        ["last_name", "first_name", "pid"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("user_name_pid_idx", table_name="user")
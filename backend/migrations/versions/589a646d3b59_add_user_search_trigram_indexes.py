@@ -0,0 +1,35 @@
+"""Add trigram indexes for user search
+
+Revision ID: 589a646d3b59
+Revises: a6288714ab4b
+Create Date: 2026-10-18 12:14:05.381920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "589a646d3b59"
+down_revision = "a6288714ab4b"
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ("first_name", "last_name", "onyen", "email")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f"user_{column}_trgm_idx",
+            "user",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f"user_{column}_trgm_idx", table_name="user")
@@ -0,0 +1,57 @@
+"""Add friend adjacency table
+
+Revision ID: 7120d3e8ebb4
+Revises: 63fc48273e15
+Create Date: 2026-10-18 09:12:04.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = "7120d3e8ebb4"
+down_revision = "63fc48273e15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The friendships table predates migrations for this feature and may have been
+    # created directly from entity metadata; only create it when it is missing.
+    if not sa.inspect(op.get_bind()).has_table("friendships"):
+        op.create_table(
+            "friendships",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("sender", sa.Integer(), nullable=False),
+            sa.Column("receiver", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(length=10), nullable=False),
+            sa.ForeignKeyConstraint(["sender"], ["user.pid"]),
+            sa.ForeignKeyConstraint(["receiver"], ["user.pid"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    op.create_table(
+        "friend_adjacency",
+        sa.Column("user_pid", sa.Integer(), nullable=False),
+        sa.Column("friend_pid", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_pid"], ["user.pid"]),
+        sa.ForeignKeyConstraint(["friend_pid"], ["user.pid"]),
+        sa.PrimaryKeyConstraint("user_pid", "friend_pid"),
+    )
+
+    # Backfill both directions of every accepted friendship.
+    op.execute(
+        text(
+            """
+            INSERT INTO friend_adjacency (user_pid, friend_pid)
+            SELECT sender, receiver FROM friendships WHERE status = 'accepted'
+            UNION
+            SELECT receiver, sender FROM friendships WHERE status = 'accepted'
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("friend_adjacency")
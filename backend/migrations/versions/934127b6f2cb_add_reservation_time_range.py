@@ -0,0 +1,44 @@
+"""Add generated time range with GiST index to reservations
+
+Revision ID: 934127b6f2cb
+Revises: a4042cd395b7
+Create Date: 2026-10-18 11:02:17.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "934127b6f2cb"
+down_revision = "a4042cd395b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "coworking__reservation",
+        sa.Column(
+            "time_range",
+            postgresql.TSRANGE(),
+            sa.Computed(
+                "tsrange(start, greatest(start, \"end\"), '[)')", persisted=True
+            ),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "coworking__reservation_time_range_idx",
+        "coworking__reservation",
+        ["time_range"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_time_range_idx", table_name="coworking__reservation"
+    )
+    op.drop_column("coworking__reservation", "time_range")
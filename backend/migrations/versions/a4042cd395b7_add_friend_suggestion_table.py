@@ -0,0 +1,32 @@
+"""Add friend suggestion table
+
+Revision ID: a4042cd395b7
+Revises: 4c6e588e14cc
+Create Date: 2026-10-18 12:41:53.270648
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a4042cd395b7"
+down_revision = "4c6e588e14cc"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "friend_suggestion",
+        sa.Column("user_pid", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("candidate_pid", sa.Integer(), nullable=False),
+        sa.Column("mutual_friends", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_pid"], ["user.pid"]),
+        sa.ForeignKeyConstraint(["candidate_pid"], ["user.pid"]),
+        sa.PrimaryKeyConstraint("user_pid", "rank"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("friend_suggestion")
@@ -0,0 +1,56 @@
+"""Add reservation archive tables
+
+Revision ID: a6288714ab4b
+Revises: 934127b6f2cb
+Create Date: 2026-10-18 11:31:52.604117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a6288714ab4b"
+down_revision = "934127b6f2cb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__reservation_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("start", sa.DateTime(), nullable=False),
+        sa.Column("end", sa.DateTime(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("walkin", sa.Boolean(), nullable=False),
+        sa.Column("room_id", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "coworking__reservation_user_archive",
+        sa.Column("reservation_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["reservation_id"],
+            ["coworking__reservation_archive.id"],
+        ),
+        sa.PrimaryKeyConstraint("reservation_id", "user_id"),
+    )
+    op.create_table(
+        "coworking__reservation_seat_archive",
+        sa.Column("reservation_id", sa.Integer(), nullable=False),
+        sa.Column("seat_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["reservation_id"],
+            ["coworking__reservation_archive.id"],
+        ),
+        sa.PrimaryKeyConstraint("reservation_id", "seat_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("coworking__reservation_seat_archive")
+    op.drop_table("coworking__reservation_user_archive")
+    op.drop_table("coworking__reservation_archive")
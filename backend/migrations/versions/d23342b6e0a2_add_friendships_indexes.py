@@ -0,0 +1,63 @@
+"""Add friendships indexes and unordered pair uniqueness
+
+Revision ID: d23342b6e0a2
+Revises: 7120d3e8ebb4
+Create Date: 2026-10-18 10:03:41.552017
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = "d23342b6e0a2"
+down_revision = "7120d3e8ebb4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Collapse duplicate rows for the same unordered pair before enforcing uniqueness,
+    # preferring to keep an accepted friendship, then the oldest request.
+    op.execute(
+        text(
+            """
+            DELETE FROM friendships
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY LEAST(sender, receiver), GREATEST(sender, receiver)
+                        ORDER BY (status = 'accepted') DESC, id
+                    ) AS rank
+                    FROM friendships
+                ) AS ranked
+                WHERE rank > 1
+            )
+            """
+        )
+    )
+
+    op.create_index(
+        "friendships_receiver_status_idx",
+        "friendships",
+        ["receiver", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "friendships_sender_status_idx",
+        "friendships",
+        ["sender", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "friendships_pair_idx",
+        "friendships",
+        [text("least(sender, receiver)"), text("greatest(sender, receiver)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("friendships_pair_idx", table_name="friendships")
+    op.drop_index("friendships_sender_status_idx", table_name="friendships")
+    op.drop_index("friendships_receiver_status_idx", table_name="friendships")
@@ -1,6 +1,11 @@
 """Package for all models in the application."""
 
-from .pagination import Paginated, PaginationParams
+from .pagination import (
+    Paginated,
+    PaginationParams,
+    KeysetPaginated,
+    KeysetPaginationParams,
+)
 from .permission import Permission
 from .user import User, ProfileForm
 from .user_details import UserDetails
@@ -10,6 +15,9 @@ from .role_details import RoleDetails
 from .organization import Organization
 from .event import Event
 from .event_details import EventDetails
+from .friend_request_result import FriendRequestResult
+from .friend_suggestion import FriendSuggestion
+from .pool_status import PoolStatus, PoolsStatus
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
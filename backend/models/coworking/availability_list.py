@@ -3,9 +3,11 @@
 Handles logic for constraining availability within a bounds, removing availability, and so on.
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Sequence
 from pydantic import BaseModel, field_validator
 from .time_range import TimeRange
+from . import interval
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -42,58 +44,27 @@ class AvailabilityList(BaseModel):
 
         Returns:
             None"""
-        front = 0
-        while (
-            front < len(self.availability)
-            and self.availability[front].end <= bounds.start
-        ):
-            front += 1
-
-        self.availability = self.availability[front:]
-        if len(self.availability) > 0:
-            if self.availability[0].start < bounds.start:
-                self.availability[0].start = bounds.start
-        else:
-            return
-
-        back = len(self.availability) - 1
-        while back >= 0 and self.availability[back].start >= bounds.end:
-            back -= 1
-
-        self.availability = self.availability[: back + 1]
-        if len(self.availability) > 0:
-            if self.availability[-1].end > bounds.end:
-                self.availability[-1].end = bounds.end
+        self.availability = interval.constrain(self.availability, bounds, _time_range)
 
     def subtract(self, block: TimeRange) -> None:
         """Removes availability that overlaps a given block."""
+        interval.subtract(self.availability, block, _time_range)
 
-        if len(self.availability) == 0:
-            return
+    def subtract_many(self, blocks: Sequence[TimeRange]) -> None:
+        """Removes availability that overlaps any of the given blocks in a single merge pass.
 
-        if block.start >= self.availability[-1].end:
-            return
+        Equivalent to calling `subtract` once per block, but linear in the combined length
+        of the availability and blocks rather than rebuilding the list for every block.
 
-        if block.end <= self.availability[0].start:
-            return
-
-        # Find the first availability range that overalps the block.
-        front = 0
-        while front < len(self.availability) and not block.overlaps(
-            self.availability[front]
-        ):
-            front += 1
-
-        end = front + 1
-        while end < len(self.availability) and block.overlaps(self.availability[end]):
-            end += 1
-
-        availability: list[TimeRange] = self.availability[:front]
-        for i in range(front, end):
-            availability += self.availability[i].subtract(block)
-        availability += self.availability[end:]
+        Args:
+            blocks (Sequence[TimeRange]): The blocks to remove, sorted by start time. Blocks
+                may overlap one another.
 
-        self.availability = availability
+        Returns:
+            None"""
+        self.availability = interval.subtract_many(
+            self.availability, blocks, _time_range
+        )
 
     def filter_time_ranges_below(self, minimum: timedelta) -> None:
         """Remove all TimeRanges that are not at least the minimum timedelta.
@@ -114,12 +85,10 @@ class AvailabilityList(BaseModel):
 
         Returns:
             timedelta - Total amount of time available in this list."""
-        if len(self.availability) == 0:
-            return timedelta(0)
+        return sum(
+            (time_range.duration() for time_range in self.availability), timedelta(0)
+        )
 
-        durations = [time_range.duration() for time_range in self.availability]
-        total = durations[0]
-        for i in range(1, len(self.availability)):
-            total += durations[i]
 
-        return total
+def _time_range(start: datetime, end: datetime) -> TimeRange:
+    return TimeRange(start=start, end=end)
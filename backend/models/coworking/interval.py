@@ -0,0 +1,145 @@
+"""Lightweight interval type and range algorithms for internal availability computations.
+
+`TimeRange` is a pydantic model whose validators run every time one is constructed, which adds
+up inside the availability loops where thousands of ranges are split and discarded per request.
+`Interval` is a plain `__slots__` class for those hot paths; convert to `TimeRange` only once
+results cross the API boundary.
+
+The algorithms below are shared by `AvailabilityList` and the reservation engine. They accept
+any objects with `start` and `end` attributes (`TimeRange`, `Reservation`, `Interval`) and build
+new ranges with the `make` factory given, so each caller controls the type it gets back.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Protocol, Self, Sequence, TypeVar
+from .time_range import TimeRange
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class Span(Protocol):
+    """Anything with a start and an end, such as a TimeRange or a Reservation."""
+
+    start: datetime
+    end: datetime
+
+
+S = TypeVar("S", bound=Span)
+
+
+class Interval:
+    """A half-open span of time from start to end, without validation."""
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_time_range(cls, time_range: Span) -> Self:
+        return cls(time_range.start, time_range.end)
+
+    def to_time_range(self) -> TimeRange:
+        """Convert to a TimeRange for use in models returned by the API."""
+        # Validating construction is cheaper than pydantic's model_construct here.
+        return TimeRange(start=self.start, end=self.end)
+
+    def overlaps(self, other: Span) -> bool:
+        return self.start < other.end and other.start < self.end
+
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Interval):
+            return NotImplemented
+        return self.start == other.start and self.end == other.end
+
+    def __repr__(self) -> str:
+        return f"Interval(start={self.start!r}, end={self.end!r})"
+
+
+def constrain(
+    ranges: list[S], bounds: Span, make: Callable[[datetime, datetime], S]
+) -> list[S]:
+    """Clip sorted, disjoint ranges to bounds, dropping those entirely outside of it."""
+    # Ranges are sorted and disjoint, so both their starts and ends are ascending.
+    front = bisect_right(ranges, bounds.start, key=_end)
+    back = bisect_left(ranges, bounds.end, lo=front, key=_start)
+
+    constrained = ranges[front:back]
+    if len(constrained) > 0:
+        if constrained[0].start < bounds.start:
+            constrained[0] = make(bounds.start, constrained[0].end)
+        if constrained[-1].end > bounds.end:
+            constrained[-1] = make(constrained[-1].start, bounds.end)
+    return constrained
+
+
+def subtract(
+    ranges: list[S], block: Span, make: Callable[[datetime, datetime], S]
+) -> None:
+    """Remove the time overlapping block from sorted, disjoint ranges in place."""
+    # The overlapping ranges are those ending after the block starts and starting
+    # before it ends; locate both boundaries by binary search.
+    front = bisect_right(ranges, block.start, key=_end)
+    end = bisect_left(ranges, block.end, lo=front, key=_start)
+    if front == end:
+        return
+
+    # Only the first and last overlapping ranges can keep a remainder.
+    remainder: list[S] = []
+    if ranges[front].start < block.start:
+        remainder.append(make(ranges[front].start, block.start))
+    if ranges[end - 1].end > block.end:
+        remainder.append(make(block.end, ranges[end - 1].end))
+
+    ranges[front:end] = remainder
+
+
+def subtract_many(
+    ranges: list[S], blocks: Sequence[Span], make: Callable[[datetime, datetime], S]
+) -> list[S]:
+    """Remove the time overlapping any of blocks from sorted, disjoint ranges in one merge pass.
+
+    Blocks must be sorted by start time but may overlap one another. Ranges left untouched are
+    reused in the result rather than copied."""
+    if len(blocks) == 0 or len(ranges) == 0:
+        return ranges
+
+    result: list[S] = []
+    first_block = 0
+    for time_range in ranges:
+        # Skip blocks that finished before this range began; since ranges ascend,
+        # they cannot overlap any later range either.
+        while first_block < len(blocks) and blocks[first_block].end <= time_range.start:
+            first_block += 1
+
+        cursor = time_range.start
+        i = first_block
+        while i < len(blocks) and blocks[i].start < time_range.end:
+            if blocks[i].start > cursor:
+                result.append(make(cursor, blocks[i].start))
+            cursor = max(cursor, blocks[i].end)
+            if cursor >= time_range.end:
+                break
+            i += 1
+
+        if cursor == time_range.start:
+            result.append(time_range)
+        elif cursor < time_range.end:
+            result.append(make(cursor, time_range.end))
+
+    return result
+
+
+def _start(time_range: Span) -> datetime:
+    return time_range.start
+
+
+def _end(time_range: Span) -> datetime:
+    return time_range.end
@@ -0,0 +1,20 @@
+"""FriendRequestResult model reports the outcome of one item of a batch friend request operation."""
+
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class FriendRequestResult(BaseModel):
+    """
+    Pydantic model to represent the outcome of a batch operation for one other user.
+
+    `pid` is the other party of the friend request: the receiver when sending, or the
+    sender when accepting or rejecting.
+    """
+
+    pid: int
+    success: bool
+    message: str = ""
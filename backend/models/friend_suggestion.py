@@ -0,0 +1,20 @@
+"""FriendSuggestion model pairs a suggested user with the number of mutual friends."""
+
+from pydantic import BaseModel
+from .user import User
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class FriendSuggestion(BaseModel):
+    """
+    Pydantic model to represent a user suggested as a friend.
+
+    Suggestions are users who share friends with the current user but have no friend
+    request of any status with them.
+    """
+
+    user: User
+    mutual_friends: int
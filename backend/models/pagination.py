@@ -1,5 +1,8 @@
 """Models for paginating results via the API."""
 
+import base64
+import json
+from datetime import datetime
 from typing import Generic, TypeVar
 from pydantic import BaseModel
 
@@ -25,3 +28,58 @@ class Paginated(BaseModel, Generic[T]):
     items: list[T]
     length: int
     params: PaginationParams
+
+
+class KeysetPaginationParams(BaseModel):
+    """Parameters passed from the client to paginate results by seeking past a cursor.
+
+    Unlike `PaginationParams`, no offset or total count is computed, so the cost of fetching
+    a page does not grow with the number of rows before it."""
+
+    cursor: str = ""
+    page_size: int = 10
+    filter: str = ""
+
+
+class KeysetPaginated(BaseModel, Generic[T]):
+    """Generic class for returning keyset paginated results to the client.
+
+    `next_cursor` is passed back as `cursor` to fetch the following page and is `None` on the last page.
+    """
+
+    items: list[T]
+    next_cursor: str | None
+    params: KeysetPaginationParams
+
+
+def encode_cursor(*key: str | int | datetime) -> str:
+    """Encode the sort key of the last item on a page as an opaque `next_cursor`."""
+    values = [
+        value.isoformat() if isinstance(value, datetime) else value for value in key
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decode a cursor produced by `encode_cursor` back into its sort key.
+
+    Args:
+        cursor: The cursor passed by the client.
+        types: The type of each value of the sort key, among `str`, `int` and `datetime`.
+
+    Returns:
+        tuple: The sort key.
+
+    Raises:
+        ValueError: If cursor does not encode a sort key with values of types.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+        if len(values) != len(types):
+            raise ValueError("Invalid pagination cursor.")
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for type_, value in zip(types, values)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
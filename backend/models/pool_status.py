@@ -0,0 +1,39 @@
+"""PoolStatus model reports the usage of the database connection pools for health monitoring."""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class PoolStatus(BaseModel):
+    """
+    Pydantic model to represent the usage of the database connection pool.
+
+    `checked_out` connections are in use by requests, and `overflow` of them were opened beyond the
+    pool's `size`. `checkouts` counts the connections requested since the process started, which
+    waited `wait_seconds_total` for a connection altogether and at most `wait_seconds_max` each.
+    """
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class PoolsStatus(BaseModel):
+    """
+    Pydantic model to represent the usage of the pools of the synchronous and asynchronous engines.
+
+    Either is `None` when its engine does not keep a pool, such as behind PgBouncer.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    sync: PoolStatus | None
+    async_: PoolStatus | None = Field(alias="async")
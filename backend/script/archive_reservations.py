@@ -0,0 +1,39 @@
+"""Archive coworking reservations that ended in a terminal state long ago.
+
+Cancelled and checked out reservations that ended more than a number of days ago (90 by
+default) are moved to the `coworking__reservation_archive` tables. Run this periodically, e.g.
+nightly from cron, to keep the reservation tables queried on every coworking request small.
+
+Usage: python3 -m backend.script.archive_reservations [days]
+"""
+
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services import PermissionService
+from ..services.coworking import (
+    OperatingHoursService,
+    PolicyService,
+    ReservationService,
+    SeatService,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+days = int(sys.argv[1]) if len(sys.argv) > 1 else 90
+
+with Session(engine) as session:
+    reservation_svc = ReservationService(
+        session,
+        PermissionService(session),
+        PolicyService(),
+        OperatingHoursService(session),
+        SeatService(session),
+    )
+    archived = reservation_svc.archive_reservations(
+        datetime.now() - timedelta(days=days)
+    )
+    print(f"Archived {archived} reservations that ended over {days} days ago.")
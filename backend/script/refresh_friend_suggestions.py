@@ -0,0 +1,21 @@
+"""Recompute every user's precomputed friend suggestions.
+
+Suggestions are ranked by mutual friend count and stored in the `friend_suggestion` table,
+from which `GET /api/friendships/suggestions` is served. Run this periodically, e.g. from cron,
+to keep suggestions current as friendships change.
+
+Usage: python3 -m backend.script.refresh_friend_suggestions
+"""
+
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services.friendship import FriendshipService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+with Session(engine) as session:
+    stored = FriendshipService(session).refresh_friend_suggestions()
+    print(f"Stored {stored} friend suggestions.")
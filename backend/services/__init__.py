@@ -1,4 +1,4 @@
-from .user import UserService
+from .user import UserService, AsyncUserService
 from .permission import PermissionService
 from .role import RoleService
 from .github import GitHubService
@@ -0,0 +1,84 @@
+"""In-process caches shared by services across requests.
+
+`TTLCache` is a small thread-safe LRU cache whose entries also expire after a fixed time to live.
+Its methods intentionally mirror the subset of Redis commands the services rely on (`get`, `set`,
+`delete`, `incrby`, `flushall`), so a client for a local Redis-compatible server can be
+substituted wherever a `TTLCache` is used when several application processes must share state.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class TTLCache:
+    """Least-recently-used cache with a per-entry time to live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """Create an empty cache.
+
+        Args:
+            maxsize: The number of entries kept before the least recently used is evicted.
+            ttl: The number of seconds an entry may be served after it was set.
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the value cached for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value for key, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incrby(self, key: Hashable, amount: int) -> int | None:
+        """Add amount to the integer cached for key, keeping its expiry.
+
+        Unlike Redis' INCRBY, a missing or expired key is left missing rather than created,
+        since a counter that was never loaded from the database cannot be adjusted correctly.
+
+        Returns:
+            int | None: The new value, or None if key was not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            expires_at, value = entry
+            self._entries[key] = (expires_at, value + amount)
+            return value + amount
+
+    def flushall(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
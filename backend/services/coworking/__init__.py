@@ -1,6 +1,6 @@
 from .policy import PolicyService
-from .status import StatusService
+from .status import StatusService, AsyncStatusService
 from .operating_hours import OperatingHoursService
 from .room import RoomService
 from .seat import SeatService
-from .reservation import ReservationService
+from .reservation import ReservationService, AsyncReservationService
@@ -0,0 +1,279 @@
+"""Shared, in-memory snapshot of the reservations that block seats in the coming hours.
+
+Under the morning rush, many students refresh `GET /api/coworking/status` at once and each
+request would otherwise load the same reservations and recompute the same seat availability. The
+snapshot loads the reservations of every seat for a window of time once, is kept current by
+`ReservationService` as it commits drafts, state changes and check-ins, and coalesces concurrent
+identical availability computations into a single one (single-flight).
+
+Writes made by other application processes are only observed when the snapshot reloads, at most
+`ttl` seconds after it was loaded, so the snapshot is used for display only. Seat assignment in
+`ReservationService.draft_reservation` always reads reservations from the database.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, Hashable, Sequence, TypeVar
+
+from ...models.coworking import Reservation, ReservationState, Seat, TimeRange
+from .catalog import coworking_catalog
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """A computation in progress that other threads may wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.succeeded = False
+
+
+class AvailabilitySnapshot:
+    """Reservations per seat within a loaded window, plus recently computed results."""
+
+    def __init__(
+        self,
+        horizon: timedelta = timedelta(hours=12),
+        ttl: float = 30.0,
+        coalesce_seconds: float = 1.0,
+    ):
+        """Create an empty snapshot.
+
+        Args:
+            horizon: The minimum length of the window of reservations loaded at once.
+            ttl: The number of seconds a loaded window may be served before it is reloaded.
+            coalesce_seconds: How long a computed result is shared with identical requests.
+        """
+        self._horizon = horizon
+        self._ttl = ttl
+        self._coalesce_seconds = coalesce_seconds
+        self._lock = threading.Lock()
+        self._window: TimeRange | None = None
+        self._loaded_at = 0.0
+        self._catalog_version = -1
+        self._by_seat: dict[int, dict[int, Reservation]] = {}
+        self._version = 0
+        self._cleared = 0
+        # Reservations applied while windows are being loaded, replayed onto each loaded window
+        # since its query may have missed them.
+        self._loads = 0
+        self._applied_during_loads: list[Reservation] = []
+        self._results: dict[Hashable, tuple[tuple[int, int], float, list]] = {}
+        self._flights: dict[Hashable, _Flight] = {}
+        self._async_flights: dict[
+            tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future
+        ] = {}
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the reservations held by the snapshot change."""
+        return self._version
+
+    def reservations(
+        self,
+        seats: Sequence[Seat],
+        time_range: TimeRange,
+        load: Callable[[TimeRange], Sequence[Reservation]],
+    ) -> list[Reservation]:
+        """Reservations of seats overlapping time_range, loading a window around it if needed.
+
+        Args:
+            seats: The seats of interest.
+            time_range: The time range of interest.
+            load: Loads the reservations of all seats overlapping a window from the database.
+
+        Returns:
+            list[Reservation]: Each matching reservation once, in no particular order.
+        """
+        by_seat = self._ensure_loaded(time_range, load)
+        matches: dict[int, Reservation] = {}
+        with self._lock:
+            for seat in seats:
+                for reservation in by_seat.get(seat.id, {}).values():
+                    if (
+                        reservation.start < time_range.end
+                        and reservation.end > time_range.start
+                    ):
+                        matches[reservation.id] = reservation
+        return list(matches.values())
+
+    def apply(self, reservation: Reservation) -> None:
+        """Record a committed reservation's current state, such as a new draft or a check-in."""
+        with self._lock:
+            if self._loads > 0:
+                self._applied_during_loads.append(reservation)
+            if self._window is None:
+                return
+            _place(self._by_seat, self._window, reservation)
+            self._version += 1
+
+    def coalesce(self, key: Hashable, compute: Callable[[], list[T]]) -> list[T]:
+        """Share one computation of key among concurrent and recent identical requests.
+
+        A result is reused for `coalesce_seconds` unless the snapshot or the catalog changes in
+        the meantime. While it is being computed, other requests for the same key wait for it
+        rather than computing it again."""
+        with self._lock:
+            version, result = self._recent_result(key)
+            if result is not None:
+                return list(result)
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.succeeded:
+                return list(flight.value)
+            return compute()
+
+        try:
+            flight.value = compute()
+            flight.succeeded = True
+            with self._lock:
+                self._results[key] = (version, time.monotonic(), flight.value)
+            return list(flight.value)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def coalesce_async(
+        self, key: Hashable, compute: Callable[[], Awaitable[list[T]]]
+    ) -> list[T]:
+        """Counterpart of `coalesce` for coroutines, sharing its recent results.
+
+        While a result is being computed, other coroutines of the same event loop await it
+        rather than computing it again."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            version, result = self._recent_result(key)
+            if result is not None:
+                return list(result)
+            flight = self._async_flights.get((loop, key))
+            leader = flight is None
+            if leader:
+                flight = self._async_flights[(loop, key)] = loop.create_future()
+
+        if not leader:
+            # A leader that failed or was cancelled resolves its flight to None.
+            value = await asyncio.shield(flight)
+            if value is not None:
+                return list(value)
+            return await compute()
+
+        value = None
+        try:
+            value = await compute()
+            with self._lock:
+                self._results[key] = (version, time.monotonic(), value)
+            return list(value)
+        finally:
+            with self._lock:
+                del self._async_flights[(loop, key)]
+            flight.set_result(value)
+
+    def clear(self) -> None:
+        """Forget all reservations and results, forcing the next read to reload."""
+        with self._lock:
+            self._window = None
+            self._by_seat = {}
+            self._results = {}
+            self._version += 1
+            self._cleared += 1
+
+    def _ensure_loaded(
+        self, time_range: TimeRange, load: Callable[[TimeRange], Sequence[Reservation]]
+    ) -> dict[int, dict[int, Reservation]]:
+        """The reservations by seat of a window covering time_range, loading it if needed."""
+        with self._lock:
+            if (
+                self._window is not None
+                and self._window.start <= time_range.start
+                and time_range.end <= self._window.end
+                and time.monotonic() - self._loaded_at < self._ttl
+                and self._catalog_version == coworking_catalog.version
+            ):
+                return self._by_seat
+            self._loads += 1
+            applied_from = len(self._applied_during_loads)
+            cleared = self._cleared
+
+        window = TimeRange(
+            start=time_range.start,
+            end=max(time_range.end, time_range.start + self._horizon),
+        )
+        catalog_version = coworking_catalog.version
+        loaded_at = time.monotonic()
+        by_seat: dict[int, dict[int, Reservation]] = {}
+        try:
+            for reservation in load(window):
+                for seat in reservation.seats:
+                    by_seat.setdefault(seat.id, {})[reservation.id] = reservation
+        except BaseException:
+            with self._lock:
+                self._finish_load()
+            raise
+
+        with self._lock:
+            # Reservations applied since the load began were committed while it ran, so its
+            # query may predate them.
+            for reservation in self._applied_during_loads[applied_from:]:
+                _place(by_seat, window, reservation)
+            self._finish_load()
+            if cleared != self._cleared:
+                # Serve this read, but let the next one reload after the snapshot was cleared.
+                return by_seat
+            self._window = window
+            self._loaded_at = loaded_at
+            self._catalog_version = catalog_version
+            self._by_seat = by_seat
+            self._results = {}
+            self._version += 1
+            return by_seat
+
+    def _recent_result(self, key: Hashable) -> tuple[tuple[int, int], list | None]:
+        """The current version and the result of key computed at it, if still recent."""
+        version = (self._version, coworking_catalog.version)
+        result = self._results.get(key)
+        if (
+            result is not None
+            and result[0] == version
+            and time.monotonic() - result[1] < self._coalesce_seconds
+        ):
+            return version, result[2]
+        return version, None
+
+    def _finish_load(self) -> None:
+        self._loads -= 1
+        if self._loads == 0:
+            self._applied_during_loads = []
+
+
+def _place(
+    by_seat: dict[int, dict[int, Reservation]],
+    window: TimeRange,
+    reservation: Reservation,
+) -> None:
+    """Record reservation's current state in the reservations by seat of window."""
+    for reservations in by_seat.values():
+        reservations.pop(reservation.id, None)
+    if reservation.state not in (
+        ReservationState.CANCELLED,
+        ReservationState.CHECKED_OUT,
+    ) and reservation.overlaps(window):
+        for seat in reservation.seats:
+            by_seat.setdefault(seat.id, {})[reservation.id] = reservation
+
+
+availability_snapshot = AvailabilitySnapshot()
+"""Snapshot shared by every ReservationService in this process."""
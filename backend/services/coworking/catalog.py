@@ -0,0 +1,102 @@
+"""Process-wide, read-through cache of the coworking catalog: rooms, seats and operating hours.
+
+The catalog changes a few times per semester but is read on every coworking status request, so
+the services of those models load it once and serve it from memory until it changes. Any session
+that commits (or rolls back) a change to a catalog entity, whether flushed or written with an
+ORM-enabled INSERT, UPDATE or DELETE statement, invalidates the cache and bumps the catalog
+`version`. Writes made through a plain connection are not observed; call
+`coworking_catalog.invalidate()` after them. Other application processes keep their own catalog,
+so its time to live bounds how stale they may become.
+"""
+
+import threading
+from typing import Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ...entities.coworking import OperatingHoursEntity, RoomEntity, SeatEntity
+from ..cache import TTLCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+T = TypeVar("T")
+
+
+class CoworkingCatalog:
+    """A versioned read-through cache of catalog lists."""
+
+    def __init__(self, ttl: float = 300.0):
+        """Create an empty catalog.
+
+        Args:
+            ttl: The number of seconds a loaded list may be served before it is reloaded.
+        """
+        self._cache = TTLCache(maxsize=16, ttl=ttl)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Incremented every time the catalog is invalidated."""
+        return self._version
+
+    def get(self, key: str, load: Callable[[], list[T]]) -> list[T]:
+        """Return the list cached for key, calling load to fill it on a miss.
+
+        Entries are stored under the version current when loading began, so a list loaded
+        concurrently with an invalidation is never served afterwards."""
+        version = self._version
+        value = self._cache.get((key, version))
+        if value is None:
+            value = load()
+            self._cache.set((key, version), value)
+        return list(value)
+
+    def invalidate(self) -> None:
+        """Drop every cached list and advance the version."""
+        with self._lock:
+            self._version += 1
+        self._cache.flushall()
+
+
+coworking_catalog = CoworkingCatalog()
+"""Catalog shared by the room, seat and operating hours services."""
+
+_CATALOG_ENTITIES = (RoomEntity, SeatEntity, OperatingHoursEntity)
+_CHANGED = "coworking_catalog_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_changes(session: Session, _flush_context) -> None:
+    if any(
+        isinstance(instance, _CATALOG_ENTITIES)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_catalog_statements(orm_execute_state) -> None:
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    if any(
+        mapper.class_ in _CATALOG_ENTITIES for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info[_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_on_catalog_changes(session: Session) -> None:
+    # Invalidate once the transaction ends, so that no other session can refill the cache with
+    # data older than the change. Rollbacks invalidate too, since uncommitted changes may have
+    # been read into the cache through the flushing session.
+    if session.info.pop(_CHANGED, False):
+        coworking_catalog.invalidate()
@@ -1,10 +1,13 @@
 """Service that manages operating hours of the XL."""
 
+from bisect import bisect_right
+from datetime import datetime
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.coworking import OperatingHours, TimeRange
 from ...entities.coworking import OperatingHoursEntity
+from .catalog import coworking_catalog
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -21,6 +24,7 @@ class OperatingHoursService:
             session (Session, optional): The database session to use, typically injected by FastAPI.
         """
         self._session = session
+        self._catalog = coworking_catalog
 
     def schedule(self, time_range: TimeRange) -> list[OperatingHours]:
         """Returns all operating hours of the XL for a given date range.
@@ -31,13 +35,19 @@ class OperatingHoursService:
         Returns:
             list[OperatingHours]: All operating hours the XL within the given time_range, including overlaps.
         """
+        # The full schedule is cached in order of start, so only a prefix can match.
+        schedule = self._catalog.get("operating_hours", self._load)
+        candidates = schedule[: bisect_right(schedule, time_range.end, key=_start)]
+        return [hours for hours in candidates if hours.end >= time_range.start]
+
+    def _load(self) -> list[OperatingHours]:
         entities = (
             self._session.query(OperatingHoursEntity)
-            .filter(
-                OperatingHoursEntity.start <= time_range.end,
-                OperatingHoursEntity.end >= time_range.start,
-            )
             .order_by(OperatingHoursEntity.start)
             .all()
         )
         return [entity.to_model() for entity in entities]
+
+
+def _start(operating_hours: OperatingHours) -> datetime:
+    return operating_hours.start
@@ -1,12 +1,35 @@
 """Service that manages reservations in the coworking space."""
 
 from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from random import random
-from typing import Sequence
-from sqlalchemy.orm import Session, joinedload
-from ...database import db_session
+from typing import Iterator, Sequence
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    delete,
+    insert,
+    not_,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from ...database import async_db_session, db_session
+from ...env import getenv
 from ...models.user import User, UserIdentity
+from ...models.pagination import (
+    KeysetPaginated,
+    KeysetPaginationParams,
+    decode_cursor,
+    encode_cursor,
+)
 from ..exceptions import UserPermissionException, ResourceNotFoundException
 from ...models.coworking import (
     Seat,
@@ -16,20 +39,34 @@ from ...models.coworking import (
     TimeRange,
     SeatAvailability,
     ReservationState,
-    AvailabilityList,
     OperatingHours,
 )
-from ...entities import UserEntity
-from ...entities.coworking import ReservationEntity, SeatEntity
+from ...models.coworking.interval import Interval, constrain, subtract_many
+from ...entities import UserEntity, FriendAdjacencyEntity
+from ...entities.coworking import (
+    ReservationEntity,
+    SeatEntity,
+    reservation_seat_table,
+    reservation_archive_table,
+    reservation_user_archive_table,
+    reservation_seat_archive_table,
+)
+from ...entities.coworking.reservation_user_table import reservation_user_table
 from .seat import SeatService
+from .availability_snapshot import availability_snapshot
 from .policy import PolicyService
 from .operating_hours import OperatingHoursService
 from ..permission import PermissionService
+from ..presence import presence_hub
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+AVAILABILITY_ENGINE = getenv("COWORKING_AVAILABILITY_ENGINE", "interval")
+"""Which engine computes seat availability: "interval" (default) or "numpy", a vectorized engine
+that requires NumPy and produces identical results."""
+
 
 class ReservationException(Exception):
     def __init__(self, message: str):
@@ -57,6 +94,7 @@ class ReservationService:
         self._policy_svc = policy_svc
         self._operating_hours_svc = operating_hours_svc
         self._seat_svc = seats_svc
+        self._snapshot = availability_snapshot
 
     def get_reservation(self, subject: User, id: int) -> Reservation:
         """Lookup a reservation by ID.
@@ -114,41 +152,46 @@ class ReservationService:
                 "coworking.reservation.read",
                 f"user/{focus.id}",
             )
-        #
+        return self._get_active_reservations_for_user(
+            focus, self._current_time_range(focus)
+        )
+
+    def _current_time_range(self, focus: User) -> TimeRange:
+        """The time range of a user's current and upcoming reservations."""
         now = datetime.now()
-        time_range = TimeRange(
+        return TimeRange(
             start=now - timedelta(days=1),
             end=now + self._policy_svc.reservation_window(focus),
         )
-        return self._get_active_reservations_for_user(focus, time_range)
 
     def _get_active_reservations_for_user(
         self, focus: UserIdentity, time_range: TimeRange
     ) -> Sequence[Reservation]:
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
-            .filter(
-                ReservationEntity.start < time_range.end,
-                ReservationEntity.end > time_range.start,
+        reservations = self._session.scalars(
+            self._active_reservations_for_user(focus, time_range)
+        )
+        return [reservation.to_model() for reservation in reservations]
+
+    def _active_reservations_for_user(
+        self, focus: UserIdentity, time_range: TimeRange
+    ) -> Select:
+        """Statement selecting a user's active reservations overlapping time_range."""
+        return (
+            select(ReservationEntity)
+            .where(
+                ReservationEntity.time_range.overlaps(
+                    Range(time_range.start, time_range.end, bounds="[)")
+                ),
                 ReservationEntity.state.not_in(
                     [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
                 ),
-                UserEntity.id == focus.id,
-            )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
+                ReservationEntity.users.any(UserEntity.id == focus.id),
+                not_(self._due_time_based_transition(datetime.now())),
             )
+            .options(*self._reservation_load_options())
             .order_by(ReservationEntity.start)
-            .all()
-        )
-
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
         )
 
-        return [reservation.to_model() for reservation in reservations]
-
     def get_seat_reservations(
         self, seats: Sequence[Seat], time_range: TimeRange
     ) -> Sequence[Reservation]:
@@ -163,32 +206,28 @@ class ReservationService:
         """
         reservations = (
             self._session.query(ReservationEntity)
-            .join(ReservationEntity.seats)
             .filter(
-                ReservationEntity.start < time_range.end,
-                ReservationEntity.end > time_range.start,
+                ReservationEntity.time_range.overlaps(
+                    Range(time_range.start, time_range.end, bounds="[)")
+                ),
                 ReservationEntity.state.not_in(
                     [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
                 ),
-                SeatEntity.id.in_([seat.id for seat in seats]),
-            )
-            .options(
-                joinedload(ReservationEntity.seats), joinedload(ReservationEntity.users)
+                ReservationEntity.seats.any(
+                    SeatEntity.id.in_([seat.id for seat in seats])
+                ),
+                not_(self._due_time_based_transition(datetime.now())),
             )
+            .options(*self._reservation_load_options())
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
-        )
-
         return [reservation.to_model() for reservation in reservations]
 
-    def _state_transition_reservation_entities_by_time(
-        self, cutoff: datetime, reservations: Sequence[ReservationEntity]
-    ) -> Sequence[ReservationEntity]:
-        """Private, internal helper method for transitioning reservation entities
-        based on time. Three transitions are time-based:
+    def sweep_state_transitions(self, moment: datetime | None = None) -> int:
+        """Persist the time-based state transitions of all reservations due one at moment.
+
+        Three transitions are time-based:
 
         1. Draft -> Cancelled following PolicyService#reservation_draft_timeout() after
            the reservation's created at.
@@ -196,131 +235,305 @@ class ReservationService:
             the reservation's start.
         3. Checked In -> Checked Out following the reservation's end.
 
+        Each transition is applied to every matching reservation with a single UPDATE. Read
+        paths do not wait for the sweep: they exclude reservations that are due a transition,
+        so this only needs to run periodically (see `reservation_sweeper`).
+
         Args:
-            moment (datetime): The time in which checks of expiration are made against. In
-                production, this is the current time.
-            reservations (Sequence[ReservationEntity]): The list of entities to state transition.
+            moment (datetime | None): The time in which checks of expiration are made against.
+                Defaults to the current time.
 
         Returns:
-            Sequence[ReservationEntity] - All ReservationEntities that were not state transitioned.
+            int: The number of reservations transitioned.
         """
-        valid: list[ReservationEntity] = []
-        dirty = False
-        for reservation in reservations:
-            if (
-                reservation.state == ReservationState.DRAFT
-                and reservation.created_at
-                + self._policy_svc.reservation_draft_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CONFIRMED
-                and reservation.start + self._policy_svc.reservation_checkin_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CHECKED_IN
-                and reservation.end <= cutoff
-            ):
-                reservation.state = ReservationState.CHECKED_OUT
-                dirty = True
-            else:
-                valid.append(reservation)
+        moment = moment or datetime.now()
+        transitioned = 0
+        for from_state, to_state, expired in self._time_based_transitions(moment):
+            result = self._session.execute(
+                update(ReservationEntity)
+                .where(ReservationEntity.state == from_state, expired)
+                .values(state=to_state)
+            )
+            transitioned += result.rowcount
+        self._session.commit()
+        return transitioned
+
+    def _time_based_transitions(
+        self, moment: datetime
+    ) -> list[tuple[ReservationState, ReservationState, ColumnElement[bool]]]:
+        """The time-based transitions as (from state, to state, expiration criterion) at moment."""
+        return [
+            (
+                ReservationState.DRAFT,
+                ReservationState.CANCELLED,
+                ReservationEntity.created_at
+                < moment - self._policy_svc.reservation_draft_timeout(),
+            ),
+            (
+                ReservationState.CONFIRMED,
+                ReservationState.CANCELLED,
+                ReservationEntity.start
+                < moment - self._policy_svc.reservation_checkin_timeout(),
+            ),
+            (
+                ReservationState.CHECKED_IN,
+                ReservationState.CHECKED_OUT,
+                ReservationEntity.end <= moment,
+            ),
+        ]
+
+    def _due_time_based_transition(self, moment: datetime) -> ColumnElement[bool]:
+        """Criterion matching reservations that a sweep at moment would transition."""
+        return or_(
+            *(
+                and_(ReservationEntity.state == from_state, expired)
+                for from_state, _, expired in self._time_based_transitions(moment)
+            )
+        )
 
-        if dirty:
-            self._session.commit()
+    def _is_due_time_based_transition(
+        self, reservation: Reservation, moment: datetime
+    ) -> bool:
+        """In-memory counterpart of `_due_time_based_transition` for a loaded reservation."""
+        match reservation.state:
+            case ReservationState.DRAFT:
+                return (
+                    reservation.created_at
+                    < moment - self._policy_svc.reservation_draft_timeout()
+                )
+            case ReservationState.CONFIRMED:
+                return (
+                    reservation.start
+                    < moment - self._policy_svc.reservation_checkin_timeout()
+                )
+            case ReservationState.CHECKED_IN:
+                return reservation.end <= moment
+        return False
+
+    def archive_reservations(self, before: datetime, batch_size: int = 1000) -> int:
+        """Move reservations that were cancelled or checked out and ended before a moment to the
+        archive tables, along with their users and seats.
 
-        return valid
+        Terminal states are final, so archived reservations are never needed by the application
+        again and the tables queried on every coworking request stay as small as the recent
+        working set. Reservations are moved in batches, each in a transaction of its own.
+
+        Args:
+            before (datetime): Only reservations ending before this moment are archived.
+            batch_size (int): The maximum number of reservations moved per transaction.
+
+        Returns:
+            int: The number of reservations archived.
+        """
+        archived = 0
+        while True:
+            ids = list(
+                self._session.scalars(
+                    select(ReservationEntity.id)
+                    .where(
+                        ReservationEntity.state.in_(
+                            [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+                        ),
+                        ReservationEntity.end < before,
+                    )
+                    .order_by(ReservationEntity.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            )
+            if len(ids) == 0:
+                return archived
+            self._archive_reservation_batch(ids)
+            self._session.commit()
+            archived += len(ids)
+
+    def _archive_reservation_batch(self, ids: list[int]) -> None:
+        reservation_table = ReservationEntity.__table__
+        columns = [column.name for column in reservation_archive_table.columns]
+        self._session.execute(
+            insert(reservation_archive_table).from_select(
+                columns,
+                select(*(reservation_table.c[column] for column in columns)).where(
+                    reservation_table.c.id.in_(ids)
+                ),
+            )
+        )
+        for table, archive_table in (
+            (reservation_user_table, reservation_user_archive_table),
+            (reservation_seat_table, reservation_seat_archive_table),
+        ):
+            self._session.execute(
+                insert(archive_table).from_select(
+                    list(archive_table.columns.keys()),
+                    select(table).where(table.c.reservation_id.in_(ids)),
+                )
+            )
+            self._session.execute(delete(table).where(table.c.reservation_id.in_(ids)))
+        self._session.execute(
+            delete(reservation_table).where(reservation_table.c.id.in_(ids))
+        )
 
     def seat_availability(
-        self, seats: Sequence[Seat], bounds: TimeRange
+        self, seats: Sequence[Seat], bounds: TimeRange, shared: bool = False
     ) -> Sequence[SeatAvailability]:
         """Returns a list of all seat availability for specific seats within a given timerange.
 
         Args:
             bounds (TimeRange): The time range of interest.
             seats (list[Seat]): The seats to check the availability of.
+            shared (bool): Serve from the process-wide availability snapshot, sharing the result
+                with concurrent requests for the same seats and window length starting now. The
+                snapshot may briefly lag writes made by other processes, so shared results are
+                for display only and never used to assign seats.
 
         Returns:
             Sequence[SeatAvailability]: All seat availability ordered by nearest and longest available.
         """
-        # No seats are available in the past
         now = datetime.now()
-        if bounds.end <= now:
+        threshold = self._availability_threshold(bounds, now)
+        if threshold is None:
             return []
 
+        if shared and bounds.start == now:
+            return self._snapshot.coalesce(
+                _availability_key(seats, bounds),
+                lambda: self._compute_seat_availability(
+                    seats, bounds, threshold, now, shared
+                ),
+            )
+        return self._compute_seat_availability(seats, bounds, threshold, now, shared)
+
+    def _availability_threshold(
+        self, bounds: TimeRange, now: datetime
+    ) -> timedelta | None:
+        """Moves the start of bounds up to now and returns the shortest availability worth
+        reporting, or None if bounds is too short for any seat to be available."""
+        # No seats are available in the past
+        if bounds.end <= now:
+            return None
+
         # Ensure the start of the bounds is at least right now
         if bounds.start < now:
             bounds.start = now
 
         # Ensure the bounds is at least as long as a minimum reservation length, with a fudge factor
         MINUMUM_RESERVATION_EPSILON = timedelta(minutes=1)
-        if (
-            bounds.duration()
-            < self._policy_svc.minimum_reservation_duration()
+        threshold = (
+            self._policy_svc.minimum_reservation_duration()
             - MINUMUM_RESERVATION_EPSILON
-        ):
+        )
+        if bounds.duration() < threshold:
+            return None
+        return threshold
+
+    def _compute_seat_availability(
+        self,
+        seats: Sequence[Seat],
+        bounds: TimeRange,
+        threshold: timedelta,
+        now: datetime,
+        shared: bool,
+    ) -> list[SeatAvailability]:
+        inputs = self._availability_inputs(seats, bounds, now, shared)
+        if inputs is None:
             return []
+        open_availability, reservations = inputs
+        return self._rank_seat_availability(
+            seats, open_availability, reservations, threshold
+        )
 
+    def _availability_inputs(
+        self, seats: Sequence[Seat], bounds: TimeRange, now: datetime, shared: bool
+    ) -> tuple[list[Interval], Sequence[Reservation]] | None:
+        """The open intervals within bounds and the reservations of seats during them, or None
+        if the XL is closed throughout bounds."""
         # Find operating hours schedule during the requested bounds
         open_hours = self._operating_hours_svc.schedule(bounds)
         if len(open_hours) == 0:
-            return []
+            return None
 
-        # Convert the operating hours during the bounds into an availability list
-        # and constrain the availability list within the bounds.
-        open_availability_list = self._operating_hours_to_bounded_availability_list(
+        # Convert the operating hours during the bounds into intervals of availability
+        # constrained within the bounds. The engine works on lightweight intervals and only
+        # converts the results to models on the way out.
+        open_availability = self._operating_hours_to_bounded_availability(
             open_hours, bounds
         )
-        if len(open_availability_list.availability) == 0:
-            return []
+        if len(open_availability) == 0:
+            return None
+
+        # Get all active reservations during the availability bounds for the seats.
+        reservation_range = TimeRange(
+            start=open_availability[0].start,
+            end=open_availability[-1].end,
+        )
+        if shared:
+            reservations = [
+                reservation
+                for reservation in self._snapshot.reservations(
+                    seats, reservation_range, self._load_snapshot_reservations
+                )
+                if not self._is_due_time_based_transition(reservation, now)
+            ]
+        else:
+            reservations = self.get_seat_reservations(seats, reservation_range)
+        return open_availability, reservations
+
+    def _rank_seat_availability(
+        self,
+        seats: Sequence[Seat],
+        open_availability: list[Interval],
+        reservations: Sequence[Reservation],
+        threshold: timedelta,
+    ) -> list[SeatAvailability]:
+        """Orders the seats by their availability left open by reservations, without reading
+        the database."""
+        if AVAILABILITY_ENGINE == "numpy":
+            return self._matrix_seat_availability(
+                seats, open_availability, reservations, threshold
+            )
 
         # Start from a position where all seats begin with same availability as
-        # open_availability_list. From there, reservations will subtract availability
+        # open_availability. From there, reservations will subtract availability
         # from the given seat.
         seat_availability_dict = self._initialize_seat_availability_dict(
-            seats, open_availability_list
+            seats, open_availability
         )
 
-        # Get all active reservations during the availability bounds for the seats.
-        reservation_range = TimeRange(
-            start=open_availability_list.availability[0].start,
-            end=open_availability_list.availability[-1].end,
-        )
-        reservations = self.get_seat_reservations(seats, reservation_range)
-
         # Subtract all seat reservations from their availability
         self._remove_reservations_from_availability(
             seat_availability_dict, reservations
         )
 
         # Remove seats with availability below threshold
-        available_seats: list[SeatAvailability] = list(
-            self._prune_seats_below_availability_threshold(
-                list(seat_availability_dict.values()),
-                self._policy_svc.minimum_reservation_duration()
-                - MINUMUM_RESERVATION_EPSILON,
-            )
+        self._prune_seats_below_availability_threshold(
+            seat_availability_dict, threshold
         )
 
         # Sort by nearest available ASC, duration DESC, reservable (False before True), with entropy
         # The rationale for entropy is when XL is wide open for walkins, within the given seat search
         # we'd like to mix up the order in which seats are assigned rather than always giving away
         # the same sequence of seats (and causing more consisten wear and tear to it).
-        available_seats.sort(
-            key=lambda sa: (
-                sa.availability[0].start,
-                -1 * sa.availability[0].duration(),
-                sa.reservable,
+        seats_by_id = {seat.id: seat for seat in seats}
+        ordered_seat_ids = sorted(
+            seat_availability_dict,
+            key=lambda seat_id: (
+                seat_availability_dict[seat_id][0].start,
+                -1 * seat_availability_dict[seat_id][0].duration(),
+                seats_by_id[seat_id].reservable,
                 random(),
-            )
+            ),
         )
 
-        return available_seats
+        return [
+            SeatAvailability(
+                availability=[
+                    interval.to_time_range()
+                    for interval in seat_availability_dict[seat_id]
+                ],
+                **seats_by_id[seat_id].model_dump(),
+            )
+            for seat_id in ordered_seat_ids
+        ]
 
     def draft_reservation(
         self, subject: User, request: ReservationRequest
@@ -421,20 +634,22 @@ class ReservationService:
         seats: list[Seat] = SeatEntity.get_models_from_identities(
             self._session, request.seats
         )
-        seat_availability = self.seat_availability(seats, bounds)
-
         if not is_walkin:
-            seat_availability = [seat for seat in seat_availability if seat.reservable]
+            seats = [seat for seat in seats if seat.reservable]
 
-        if len(seat_availability) == 0:
+        # Lock the assigned seat until the draft commits so that concurrent drafts are never
+        # assigned the same seat.
+        seat_availability = self._claim_seat(seats, bounds)
+
+        if seat_availability is None:
             raise ReservationException("The requested seat(s) are no longer available.")
 
         # TODO (limit to # of users on request if multiple users)
         # Here we constrain the reservation start/end to that of the best available seat requested.
         # This matters as walk-in availability becomes scarce (may start in the near future even though request
         # start is for right now), alternatively may end early due to reserved seat on backend.
-        seat_entities = [self._session.get(SeatEntity, seat_availability[0].id)]
-        bounds = seat_availability[0].availability[0]
+        seat_entities = [self._session.get(SeatEntity, seat_availability.id)]
+        bounds = seat_availability.availability[0]
 
         draft = ReservationEntity(
             state=ReservationState.DRAFT,
@@ -448,7 +663,9 @@ class ReservationService:
 
         self._session.add(draft)
         self._session.commit()
-        return draft.to_model()
+        reservation = draft.to_model()
+        self._snapshot.apply(reservation)
+        return reservation
 
     def change_reservation(
         self, subject: User, delta: ReservationPartial
@@ -510,6 +727,9 @@ class ReservationService:
 
         if dirty:  # and valid():
             self._session.commit()
+            reservation = entity.to_model()
+            self._snapshot.apply(reservation)
+            return reservation
 
         return entity.to_model()
 
@@ -538,8 +758,9 @@ class ReservationService:
     def list_all_active_and_upcoming(self, subject: User) -> Sequence[Reservation]:
         """Ambassadors need to see all active and upcoming reservations.
 
-        This method queries all future events. When pre-reservations are added, this method
-        will need redesign to support date/time based pagination.
+        This method queries all future events. Busy days are better served one page at a time
+        by `list_all_active_and_upcoming_page` or incrementally by
+        `stream_all_active_and_upcoming`.
 
         Args:
             subject (User): The user initiating the reservation change request.
@@ -549,34 +770,110 @@ class ReservationService:
 
         Raises:
             UserPermissionException when user does not have permission to read reservations
-
-        Future work:
-            Pagination based on timespans in the future.
         """
         self._permission_svc.enforce(subject, "coworking.reservation.read", f"user/*")
-        now = datetime.now()
         reservations = (
             self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
-            .filter(
-                ReservationEntity.start <= now + timedelta(minutes=5),
-                ReservationEntity.end > now,
-                ReservationEntity.state.in_(
-                    (
-                        ReservationState.CONFIRMED,
-                        ReservationState.CHECKED_IN,
-                        ReservationState.CHECKED_OUT,
-                    )
-                ),
-            )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
-            )
-            .order_by(ReservationEntity.start.desc())
+            .filter(*self._active_and_upcoming_criteria(datetime.now()))
+            .options(*self._reservation_load_options())
+            .order_by(ReservationEntity.start.desc(), ReservationEntity.id.desc())
             .all()
         )
         return [reservation.to_model() for reservation in reservations]
 
+    def list_all_active_and_upcoming_page(
+        self, subject: User, pagination_params: KeysetPaginationParams
+    ) -> KeysetPaginated[Reservation]:
+        """One page of `list_all_active_and_upcoming`.
+
+        Reservations are ordered by start and id, latest first, and each page seeks past the
+        cursor of the previous one, so the cost of a page is bounded by its size.
+
+        Args:
+            subject (User): The user initiating the request.
+            pagination_params (KeysetPaginationParams): The cursor and page size.
+
+        Returns:
+            KeysetPaginated[Reservation]: A page of reservations and the cursor of the next page.
+
+        Raises:
+            UserPermissionException when user does not have permission to read reservations
+            ValueError: If the cursor is malformed.
+        """
+        self._permission_svc.enforce(subject, "coworking.reservation.read", f"user/*")
+        return self._active_and_upcoming_page(datetime.now(), pagination_params)
+
+    def stream_all_active_and_upcoming(
+        self, subject: User, page_size: int = 100
+    ) -> Iterator[Reservation]:
+        """The reservations of `list_all_active_and_upcoming`, read page_size at a time.
+
+        Permission is enforced when this method is called, before the first page is read.
+
+        Raises:
+            UserPermissionException when user does not have permission to read reservations
+        """
+        self._permission_svc.enforce(subject, "coworking.reservation.read", f"user/*")
+        now = datetime.now()
+
+        def pages() -> Iterator[Reservation]:
+            pagination_params = KeysetPaginationParams(page_size=page_size)
+            while True:
+                page = self._active_and_upcoming_page(now, pagination_params)
+                yield from page.items
+                if page.next_cursor is None:
+                    return
+                pagination_params = KeysetPaginationParams(
+                    cursor=page.next_cursor, page_size=page_size
+                )
+
+        return pages()
+
+    def _active_and_upcoming_page(
+        self, now: datetime, pagination_params: KeysetPaginationParams
+    ) -> KeysetPaginated[Reservation]:
+        order = (ReservationEntity.start, ReservationEntity.id)
+        statement = select(ReservationEntity).where(
+            *self._active_and_upcoming_criteria(now)
+        )
+        if pagination_params.cursor != "":
+            statement = statement.where(
+                tuple_(*order)
+                < tuple_(*decode_cursor(pagination_params.cursor, datetime, int))
+            )
+
+        # Fetch one extra row to learn whether another page follows without counting.
+        statement = (
+            statement.options(*self._reservation_load_options())
+            .order_by(*(column.desc() for column in order))
+            .limit(pagination_params.page_size + 1)
+        )
+        entities = self._session.execute(statement).scalars().all()
+
+        next_cursor = None
+        if len(entities) > pagination_params.page_size:
+            entities = entities[: pagination_params.page_size]
+            next_cursor = encode_cursor(entities[-1].start, entities[-1].id)
+
+        return KeysetPaginated(
+            items=[entity.to_model() for entity in entities],
+            next_cursor=next_cursor,
+            params=pagination_params,
+        )
+
+    def _active_and_upcoming_criteria(self, now: datetime) -> list[ColumnElement[bool]]:
+        return [
+            ReservationEntity.start <= now + timedelta(minutes=5),
+            ReservationEntity.end > now,
+            ReservationEntity.state.in_(
+                (
+                    ReservationState.CONFIRMED,
+                    ReservationState.CHECKED_IN,
+                    ReservationState.CHECKED_OUT,
+                )
+            ),
+        ]
+
     def staff_checkin_reservation(
         self, subject: User, reservation: Reservation
     ) -> Reservation:
@@ -610,6 +907,7 @@ class ReservationService:
         if entity.state == ReservationState.CONFIRMED:
             entity.state = ReservationState.CHECKED_IN
             self._session.commit()
+            self._snapshot.apply(entity.to_model())
         elif entity.state in (
             ReservationState.CANCELLED,
             ReservationState.CHECKED_OUT,
@@ -625,50 +923,141 @@ class ReservationService:
 
     # Private helper methods
 
-    def _operating_hours_to_bounded_availability_list(
+    def _reservation_load_options(self) -> tuple[ORMOption, ...]:
+        """Loader options for reading reservations into models.
+
+        Collections are loaded with one extra SELECT each (selectinload) rather than joined to
+        the reservation rows, which would multiply each reservation by its users times its seats.
+        The room of room reservations is loaded up front as well, since asynchronous sessions
+        cannot load it lazily."""
+        return (
+            selectinload(ReservationEntity.users),
+            selectinload(ReservationEntity.seats).joinedload(SeatEntity.room),
+            selectinload(ReservationEntity.room),
+        )
+
+    def _matrix_seat_availability(
+        self,
+        seats: Sequence[Seat],
+        open_availability: list[Interval],
+        reservations: Sequence[Reservation],
+        threshold: timedelta,
+    ) -> list[SeatAvailability]:
+        # NumPy is only required when the matrix engine is selected.
+        from .availability_matrix import matrix_seat_availability
+
+        return matrix_seat_availability(
+            seats, open_availability, reservations, threshold
+        )
+
+    def _claim_seat(
+        self, seats: Sequence[Seat], bounds: TimeRange
+    ) -> SeatAvailability | None:
+        """Lock the best available of seats for the current transaction, returning its availability.
+
+        Seats are tried in order of availability, each locked on its own with SKIP LOCKED and
+        checked again once locked, since the draft that held it before may have taken it. Parallel
+        drafts thus each lock a different seat rather than queueing behind each other. Only when
+        every available seat is locked by another draft does this wait, for one seat at a time and
+        holding no other seat lock, so waiting drafts cannot deadlock."""
+        seats_by_id = {seat.id: seat for seat in seats}
+        busy: list[Seat] = []
+        for candidate in self.seat_availability(seats, bounds):
+            seat = seats_by_id[candidate.id]
+            savepoint = self._session.begin_nested()
+            if self._lock_seat(seat, skip_locked=True):
+                claimed = self._availability_once_locked(seat, bounds, savepoint)
+                if claimed is not None:
+                    return claimed
+            else:
+                savepoint.rollback()
+                busy.append(seat)
+
+        for seat in busy:
+            savepoint = self._session.begin_nested()
+            self._lock_seat(seat, skip_locked=False)
+            claimed = self._availability_once_locked(seat, bounds, savepoint)
+            if claimed is not None:
+                return claimed
+        return None
+
+    def _lock_seat(self, seat: Seat, skip_locked: bool) -> bool:
+        """Lock the row of seat for the current transaction, returning False if it was skipped."""
+        query = (
+            select(SeatEntity.id)
+            .where(SeatEntity.id == seat.id)
+            .with_for_update(skip_locked=skip_locked)
+        )
+        return self._session.scalar(query) is not None
+
+    def _availability_once_locked(
+        self, seat: Seat, bounds: TimeRange, savepoint: SessionTransaction
+    ) -> SeatAvailability | None:
+        """The availability of a seat locked since savepoint, releasing the lock if it has none."""
+        availability = self.seat_availability([seat], bounds)
+        if len(availability) == 0:
+            savepoint.rollback()
+            return None
+        savepoint.commit()
+        return availability[0]
+
+    def _load_snapshot_reservations(self, window: TimeRange) -> Sequence[Reservation]:
+        return self.get_seat_reservations(self._seat_svc.list(), window)
+
+    def _operating_hours_to_bounded_availability(
         self, operating_hours: Sequence[OperatingHours], bounds: TimeRange
-    ) -> AvailabilityList:
-        availability = AvailabilityList(
-            availability=[
-                TimeRange(start=operating_hour.start, end=operating_hour.end)
+    ) -> list[Interval]:
+        return constrain(
+            [
+                Interval.from_time_range(operating_hour)
                 for operating_hour in operating_hours
-            ]
+            ],
+            bounds,
+            Interval,
         )
-        availability.constrain(bounds)
-        return availability
 
     def _initialize_seat_availability_dict(
-        self, seats: Sequence[Seat], availability: AvailabilityList
-    ) -> dict[int, SeatAvailability]:
+        self, seats: Sequence[Seat], availability: list[Interval]
+    ) -> dict[int, list[Interval]]:
         return {
-            seat.id: SeatAvailability(
-                availability=availability.model_copy(deep=True).availability,
-                **seat.model_dump(),
-            )
+            seat.id: [
+                Interval(interval.start, interval.end) for interval in availability
+            ]
             for seat in seats
             if seat.id is not None
         }
 
     def _remove_reservations_from_availability(
         self,
-        seat_availability_dict: dict[int, SeatAvailability],
+        seat_availability_dict: dict[int, list[Interval]],
         reservations: Sequence[Reservation],
     ):
+        # Group each seat's reservations so its availability is subtracted in one merge pass.
+        blocks_by_seat: dict[int, list[Reservation]] = {}
         for reservation in reservations:
-            if len(reservation.seats) > 0:
-                for seat in reservation.seats:
-                    if seat.id in seat_availability_dict:
-                        seat_availability_dict[seat.id].subtract(reservation)
+            for seat in reservation.seats:
+                if seat.id in seat_availability_dict:
+                    blocks_by_seat.setdefault(seat.id, []).append(reservation)
+
+        for seat_id, blocks in blocks_by_seat.items():
+            blocks.sort(key=lambda block: block.start)
+            seat_availability_dict[seat_id] = subtract_many(
+                seat_availability_dict[seat_id], blocks, Interval
+            )
 
     def _prune_seats_below_availability_threshold(
-        self, seats: Sequence[SeatAvailability], threshold: timedelta
-    ) -> Sequence[SeatAvailability]:
-        available_seats: list[SeatAvailability] = []
-        for seat in seats:
-            seat.filter_time_ranges_below(threshold)
-            if len(seat.availability) > 0:
-                available_seats.append(seat)
-        return available_seats
+        self, seat_availability_dict: dict[int, list[Interval]], threshold: timedelta
+    ) -> None:
+        for seat_id in list(seat_availability_dict):
+            availability = [
+                interval
+                for interval in seat_availability_dict[seat_id]
+                if interval.duration() >= threshold
+            ]
+            if len(availability) > 0:
+                seat_availability_dict[seat_id] = availability
+            else:
+                del seat_availability_dict[seat_id]
 
     def update_coworking_status(self, user_pid: int, status: bool) -> User:
         # get the user_entity using new_user_info.id
@@ -682,8 +1071,118 @@ class ReservationService:
                 f"Updating coworking status for user {user_pid}: {user.is_coworking} -> {status}"
             )
 
+            changed = user.is_coworking != status
             user.is_coworking = status
             self._session.commit()
 
             print(f"Updated coworking status for user {user_pid}: {user.is_coworking}")
+
+            # Push the change to friends with an open presence stream
+            if changed and presence_hub.has_subscribers():
+                friend_pids = self._session.scalars(
+                    select(FriendAdjacencyEntity.friend_pid).where(
+                        FriendAdjacencyEntity.user_pid == user_pid
+                    )
+                )
+                presence_hub.publish(
+                    friend_pids,
+                    {
+                        "friend_pid": user.pid,
+                        "first_name": user.first_name,
+                        "last_name": user.last_name,
+                        "is_coworking": user.is_coworking,
+                    },
+                )
         return user.to_model()
+
+
+class AsyncReservationService:
+    """Asynchronous counterpart of the ReservationService reads made on every status request.
+
+    A ReservationService runs on the Session of the AsyncSession through `run_sync`, so reads
+    served from the process-wide caches complete directly on the event loop and those that reach
+    the database are awaited through asyncpg. No synchronous connection is used.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession = Depends(async_db_session),
+        policy_svc: PolicyService = Depends(),
+    ):
+        """Initializes a new AsyncReservationService.
+
+        Args:
+            session (AsyncSession): The database session to use, typically injected by FastAPI.
+        """
+        self._session = session
+        self._reservation_svc = _reservation_service_on(session, policy_svc)
+
+    async def get_current_reservations_for_user(
+        self, subject: User, focus: User
+    ) -> Sequence[Reservation]:
+        """See `ReservationService.get_current_reservations_for_user`."""
+        return await self._session.run_sync(
+            lambda _: self._reservation_svc.get_current_reservations_for_user(
+                subject, focus
+            )
+        )
+
+    async def seat_availability(
+        self, seats: Sequence[Seat], bounds: TimeRange
+    ) -> Sequence[SeatAvailability]:
+        """See `ReservationService.seat_availability` with `shared`.
+
+        Coroutines requesting the same availability await a single computation. Its inputs are
+        read from the snapshot and catalog, awaiting the database only when they reload, and
+        the seats are ranked in a worker thread so that the event loop is not blocked.
+        """
+        reservation_svc = self._reservation_svc
+        now = datetime.now()
+        threshold = reservation_svc._availability_threshold(bounds, now)
+        if threshold is None:
+            return []
+
+        async def compute() -> list[SeatAvailability]:
+            inputs = await self._session.run_sync(
+                lambda _: reservation_svc._availability_inputs(
+                    seats, bounds, now, shared=True
+                )
+            )
+            if inputs is None:
+                return []
+            open_availability, reservations = inputs
+            return await run_in_threadpool(
+                reservation_svc._rank_seat_availability,
+                seats,
+                open_availability,
+                reservations,
+                threshold,
+            )
+
+        if bounds.start == now:
+            return await reservation_svc._snapshot.coalesce_async(
+                _availability_key(seats, bounds), compute
+            )
+        return await compute()
+
+
+def _reservation_service_on(
+    session: AsyncSession, policy_svc: PolicyService
+) -> ReservationService:
+    """A ReservationService on the Session of session, for use within `session.run_sync`."""
+    sync_session = session.sync_session
+    return ReservationService(
+        sync_session,
+        PermissionService(sync_session),
+        policy_svc,
+        OperatingHoursService(sync_session),
+        SeatService(sync_session),
+    )
+
+
+def _availability_key(seats: Sequence[Seat], bounds: TimeRange) -> tuple:
+    """The key under which availability of seats within bounds starting now is coalesced."""
+    return (
+        tuple(seat.id for seat in seats),
+        round(bounds.duration().total_seconds()),
+    )
@@ -0,0 +1,54 @@
+"""Background task persisting the time-based state transitions of reservations.
+
+Read paths exclude reservations that are due a transition without writing to the database, so
+this sweep only needs to run on a fixed cadence to bring stored states up to date. It is started
+with the application (see `backend/main.py`); because each sweep is a handful of idempotent
+UPDATE statements, it is safe for every application process to run its own.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ...database import engine
+from ...env import getenv
+from ..permission import PermissionService
+from .operating_hours import OperatingHoursService
+from .policy import PolicyService
+from .reservation import ReservationService
+from .seat import SeatService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+RESERVATION_SWEEP_SECONDS = float(getenv("RESERVATION_SWEEP_SECONDS", "30"))
+"""Seconds between sweeps. Zero or less disables the sweeper."""
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_reservations() -> int:
+    """Run one sweep in a session of its own, returning the number of reservations transitioned."""
+    with Session(engine) as session:
+        reservation_svc = ReservationService(
+            session,
+            PermissionService(session),
+            PolicyService(),
+            OperatingHoursService(session),
+            SeatService(session),
+        )
+        return reservation_svc.sweep_state_transitions()
+
+
+async def run_reservation_sweeper(interval: float = RESERVATION_SWEEP_SECONDS) -> None:
+    """Sweep every interval seconds until cancelled."""
+    while True:
+        try:
+            await run_in_threadpool(sweep_reservations)
+        except Exception:
+            # A failed sweep (e.g. the database restarting) is retried on the next tick.
+            logger.exception("Reservation sweep failed")
+        await asyncio.sleep(interval)
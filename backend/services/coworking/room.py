@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.coworking import RoomDetails
 from ...entities.coworking import RoomEntity
+from .catalog import coworking_catalog
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -21,6 +22,11 @@ class RoomService:
             session (Session): The database session to use, typically injected by FastAPI.
         """
         self._session = session
+        self._catalog = coworking_catalog
+
+    def _load(self) -> list[RoomDetails]:
+        entities = self._session.query(RoomEntity).order_by(RoomEntity.capacity).all()
+        return [entity.to_details_model() for entity in entities]
 
     def list(self) -> list[RoomDetails]:
         """Returns all rooms in the coworking space.
@@ -28,5 +34,4 @@ class RoomService:
         Returns:
             list[RoomDetails]: All rooms in the coworking space ordered by increasing capacity.
         """
-        entities = self._session.query(RoomEntity).order_by(RoomEntity.capacity).all()
-        return [entity.to_details_model() for entity in entities]
+        return self._catalog.get("rooms", self._load)
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.coworking import Seat, SeatDetails
 from ...entities.coworking import SeatEntity
+from .catalog import coworking_catalog
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -21,6 +22,11 @@ class SeatService:
             session (Session): The database session to use, typically injected by FastAPI.
         """
         self._session = session
+        self._catalog = coworking_catalog
+
+    def _load(self) -> list[SeatDetails]:
+        entities = self._session.query(SeatEntity).all()
+        return [entity.to_model() for entity in entities]
 
     def list(self) -> list[SeatDetails]:
         """Returns all seats in the coworking space.
@@ -28,5 +34,4 @@ class SeatService:
         Returns:
             list[SeatDetails]: All rooms in the coworking space orderd by increasing capacity.
         """
-        entities = self._session.query(SeatEntity).all()
-        return [entity.to_model() for entity in entities]
+        return self._catalog.get("seats", self._load)
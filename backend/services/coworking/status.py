@@ -2,12 +2,14 @@
 
 from fastapi import Depends
 from datetime import datetime
+from typing import Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ...database import db_session
-from .reservation import ReservationService
+from ...database import async_db_session, db_session
+from .reservation import AsyncReservationService, ReservationService
 from .operating_hours import OperatingHoursService
 from .seat import SeatService
-from ...models.coworking import Status, TimeRange
+from ...models.coworking import OperatingHours, SeatAvailability, Status, TimeRange
 from ...models import User
 from .policy import PolicyService
 
@@ -36,30 +38,93 @@ class StatusService:
         my_reservations = self._reservation_svc.get_current_reservations_for_user(
             subject, subject
         )
+        seat_availability, operating_hours = self.get_xl_status(subject)
+        return Status(
+            my_reservations=my_reservations,
+            seat_availability=seat_availability,
+            operating_hours=operating_hours,
+        )
 
+    def get_xl_status(
+        self, subject: User
+    ) -> tuple[Sequence[SeatAvailability], Sequence[OperatingHours]]:
+        """The current seat availability of the XL and its upcoming operating hours."""
         now = datetime.now()
-        walkin_window = TimeRange(
-            start=now,
-            end=now
-            + self._policies_svc.walkin_window(subject)
-            + 3 * self._policies_svc.walkin_initial_duration(subject),
-            # We triple walkin duration for end bounds to find seats not pre-reserved later. If XL stays
-            # relatively open, the walkin could then more likely be extended while it is not busy.
-            # This also prioritizes _not_ placing walkins in reservable seats.
-        )
         seats = self._seat_svc.list()  # All Seats are fair game for walkin purposes
         seat_availability = self._reservation_svc.seat_availability(
-            seats, walkin_window
+            seats, _walkin_window(self._policies_svc, subject, now), shared=True
         )
 
         operating_hours = self._operating_hours_svc.schedule(
-            TimeRange(
-                start=now, end=now + self._policies_svc.reservation_window(subject)
+            _upcoming_window(self._policies_svc, subject, now)
+        )
+
+        return seat_availability, operating_hours
+
+
+class AsyncStatusService:
+    """Serves the coworking status from an async route.
+
+    The seats and operating hours are read on the Session of the AsyncSession through
+    `run_sync`, so those served from the process-wide catalog complete directly on the event
+    loop and only the reads that reach the database are awaited, through asyncpg. Seat
+    availability is shared among concurrent requests by `AsyncReservationService`."""
+
+    def __init__(
+        self,
+        session: AsyncSession = Depends(async_db_session),
+        policies_svc: PolicyService = Depends(),
+    ):
+        sync_session = session.sync_session
+        self._session = session
+        self._policies_svc = policies_svc
+        self._operating_hours_svc = OperatingHoursService(sync_session)
+        self._seat_svc = SeatService(sync_session)
+        self._reservation_svc = AsyncReservationService(session, policies_svc)
+
+    async def get_coworking_status(self, subject: User) -> Status:
+        """See `StatusService.get_coworking_status`."""
+        my_reservations = await self._reservation_svc.get_current_reservations_for_user(
+            subject, subject
+        )
+
+        now = datetime.now()
+        seats, operating_hours = await self._session.run_sync(
+            lambda _: (
+                self._seat_svc.list(),
+                self._operating_hours_svc.schedule(
+                    _upcoming_window(self._policies_svc, subject, now)
+                ),
             )
         )
+        seat_availability = await self._reservation_svc.seat_availability(
+            seats, _walkin_window(self._policies_svc, subject, now)
+        )
 
         return Status(
             my_reservations=my_reservations,
             seat_availability=seat_availability,
             operating_hours=operating_hours,
         )
+
+
+def _walkin_window(
+    policies_svc: PolicyService, subject: User, now: datetime
+) -> TimeRange:
+    """The window in which seats are searched for a walk-in starting now."""
+    return TimeRange(
+        start=now,
+        end=now
+        + policies_svc.walkin_window(subject)
+        + 3 * policies_svc.walkin_initial_duration(subject),
+        # We triple walkin duration for end bounds to find seats not pre-reserved later. If XL stays
+        # relatively open, the walkin could then more likely be extended while it is not busy.
+        # This also prioritizes _not_ placing walkins in reservable seats.
+    )
+
+
+def _upcoming_window(
+    policies_svc: PolicyService, subject: User, now: datetime
+) -> TimeRange:
+    """The window of upcoming operating hours shown to subject."""
+    return TimeRange(start=now, end=now + policies_svc.reservation_window(subject))
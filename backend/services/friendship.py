@@ -1,9 +1,14 @@
+from typing import Iterable, Sequence
+
 from fastapi import Depends
 
-from sqlalchemy import AliasedReturnsRows, and_, exists, func, or_
+from sqlalchemy import AliasedReturnsRows, ColumnElement, and_, exists, func, or_
+from sqlalchemy import Select, delete, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload
 from yaml import AliasEvent
 
 from backend.entities import friendship_entity
@@ -13,15 +18,39 @@ from backend.services.exceptions import (
     ResourceNotFoundException,
     UserPermissionException,
 )
-from ..database import db_session
+from ..database import async_db_session, db_session
+from .cache import TTLCache
 from ..models.user import User
+from ..models.pagination import (
+    KeysetPaginated,
+    KeysetPaginationParams,
+    decode_cursor,
+    encode_cursor,
+)
+from ..models.friend_request_result import FriendRequestResult
+from ..models.friend_suggestion import FriendSuggestion
 from ..entities.user_entity import UserEntity
-from ..entities.friendship_entity import FriendshipEntity
+from ..entities.friendship_entity import FriendshipEntity, link_friends
+from ..entities.friend_adjacency_entity import FriendAdjacencyEntity
+from ..entities.friend_suggestion_entity import FriendSuggestionEntity
+
+
+received_request_counts = TTLCache(maxsize=10_000, ttl=300)
+"""Process-wide cache of each user's pending received friend request count, keyed by PID.
+
+The count is loaded from the database on a miss and then adjusted in place by the methods of
+`FriendshipService` that create, accept or reject requests. The time to live bounds how stale a
+count can become when another process changes it; replace this with a client for a shared
+Redis-compatible server to keep several processes exactly in sync."""
+
+SUGGESTIONS_PER_USER = 25
+"""Number of friend suggestions precomputed for each user by `refresh_friend_suggestions`."""
 
 
 class FriendshipService:
     def __init__(self, session: Session = Depends(db_session)):
         self._session = session
+        self._request_counts = received_request_counts
 
     def list_all_users(self) -> list[User]:
         """List all registered users."""
@@ -36,31 +65,25 @@ class FriendshipService:
             sender_id (int): The ID of the user sending the friend request.
             receiver_id (int): The ID of the user receiving the friend request.
         """
-        # Check for an existing friend request in both directions
-        existing_request = (
-            self._session.query(FriendshipEntity)
-            .filter(
-                (
-                    (FriendshipEntity.sender == sender_id)
-                    & (FriendshipEntity.receiver == receiver_id)
-                )
-                | (
-                    (FriendshipEntity.sender == receiver_id)
-                    & (FriendshipEntity.receiver == sender_id)
-                )
+        # The unordered-pair unique index on friendships rejects a second request in
+        # either direction, so the insert doubles as the existence check.
+        created = self._session.execute(
+            insert(FriendshipEntity)
+            .values(sender=sender_id, receiver=receiver_id, status="requested")
+            .on_conflict_do_nothing(
+                index_elements=[
+                    func.least(FriendshipEntity.sender, FriendshipEntity.receiver),
+                    func.greatest(FriendshipEntity.sender, FriendshipEntity.receiver),
+                ]
             )
-            .first()
-        )
+            .returning(FriendshipEntity.id)
+        ).scalar_one_or_none()
 
-        if existing_request:
+        if created is None:
             raise Exception("A friend request already exists between these users.")
 
-        # Create new friend request
-        new_request = FriendshipEntity(
-            sender=sender_id, receiver=receiver_id, status="requested"
-        )
-        self._session.add(new_request)
         self._session.commit()
+        self._request_counts.incrby(receiver_id, 1)
 
     def get_received_requests(self, curr_user_id: int) -> list[User]:
         """
@@ -72,20 +95,8 @@ class FriendshipService:
         Returns:
             list[User]: A list of users who have sent friend requests.
         """
-        # Query the friendships table for received friend requests
-        requests = (
-            self._session.query(FriendshipEntity)
-            .filter(
-                FriendshipEntity.receiver == curr_user_id,
-                FriendshipEntity.status == "requested",
-            )
-            .options(joinedload(FriendshipEntity.sender_user))
-            .all()
-        )
-
-        # Convert the results to User models
-        users = [request.sender_user.to_model() for request in requests]
-        return users
+        requests = self._session.scalars(_received_requests(curr_user_id))
+        return [request.sender_user.to_model() for request in requests]
 
     def get_received_requests_count(self, curr_user_id: int) -> int:
         """
@@ -97,15 +108,13 @@ class FriendshipService:
         Returns:
             int: The number of received friend requests.
         """
-        # Query the friendships table for the count of received friend requests
-        count = (
-            self._session.query(func.count())
-            .filter(
-                FriendshipEntity.receiver == curr_user_id,
-                FriendshipEntity.status == "requested",
-            )
-            .scalar()
-        )
+        # Serve from the counter cache, which the request methods below keep current
+        count = self._request_counts.get(curr_user_id)
+        if count is not None:
+            return count
+
+        count = self._session.scalar(_received_requests_count(curr_user_id))
+        self._request_counts.set(curr_user_id, count)
         return count
 
     def accept_request(self, request_id: int, curr_user_id: int):
@@ -133,8 +142,11 @@ class FriendshipService:
             raise UserPermissionException("accept request", "this friend request")
 
         # Update the status of the friend request
+        was_pending = request.status == "requested"
         request.status = "accepted"
         self._session.commit()
+        if was_pending:
+            self._request_counts.incrby(curr_user_id, -1)
 
     def reject_request(self, request_id: int, curr_user_id: int):
         """
@@ -161,8 +173,161 @@ class FriendshipService:
             raise UserPermissionException("reject request", "this friend request")
 
         # Update the status of the friend request
+        was_pending = request.status == "requested"
         request.status = "rejected"
         self._session.commit()
+        if was_pending:
+            self._request_counts.incrby(curr_user_id, -1)
+
+    def create_friend_requests(
+        self, sender_id: int, receiver_ids: list[int]
+    ) -> list[FriendRequestResult]:
+        """
+        Create friend requests from one user to many users in a single statement.
+
+        Receivers who do not exist, who already share a friend request with the sender in
+        either direction, or who are the sender themselves are skipped.
+
+        Args:
+            sender_id (int): The PID of the user sending the friend requests.
+            receiver_ids (list[int]): The PIDs of the users receiving the friend requests.
+
+        Returns:
+            list[FriendRequestResult]: The outcome for each distinct receiver, in request order.
+        """
+        receiver_ids = list(dict.fromkeys(receiver_ids))
+        if not receiver_ids:
+            return []
+
+        # INSERT ... SELECT from the user table drops unknown PIDs instead of failing the
+        # whole batch on a foreign key violation.
+        created = set(
+            self._session.scalars(
+                insert(FriendshipEntity)
+                .from_select(
+                    ["sender", "receiver", "status"],
+                    select(
+                        literal(sender_id), UserEntity.pid, literal("requested")
+                    ).where(
+                        UserEntity.pid.in_(receiver_ids), UserEntity.pid != sender_id
+                    ),
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[
+                        func.least(FriendshipEntity.sender, FriendshipEntity.receiver),
+                        func.greatest(
+                            FriendshipEntity.sender, FriendshipEntity.receiver
+                        ),
+                    ]
+                )
+                .returning(FriendshipEntity.receiver)
+            )
+        )
+        self._session.commit()
+
+        for receiver_id in created:
+            self._request_counts.incrby(receiver_id, 1)
+
+        results = []
+        for receiver_id in receiver_ids:
+            if receiver_id in created:
+                results.append(FriendRequestResult(pid=receiver_id, success=True))
+            elif receiver_id == sender_id:
+                results.append(
+                    FriendRequestResult(
+                        pid=receiver_id,
+                        success=False,
+                        message="Cannot send friend request to yourself.",
+                    )
+                )
+            else:
+                results.append(
+                    FriendRequestResult(
+                        pid=receiver_id,
+                        success=False,
+                        message="User not found or a friend request already exists.",
+                    )
+                )
+        return results
+
+    def accept_requests(
+        self, curr_user_id: int, sender_ids: list[int] | None = None
+    ) -> list[FriendRequestResult]:
+        """
+        Accept many pending friend requests in a single statement.
+
+        Args:
+            curr_user_id (int): The PID of the user accepting the requests.
+            sender_ids (list[int] | None): The PIDs of the senders whose requests to accept,
+                or None to accept every pending request.
+
+        Returns:
+            list[FriendRequestResult]: The outcome for each sender.
+        """
+        return self._resolve_requests(curr_user_id, sender_ids, "accepted")
+
+    def reject_requests(
+        self, curr_user_id: int, sender_ids: list[int] | None = None
+    ) -> list[FriendRequestResult]:
+        """
+        Reject many pending friend requests in a single statement.
+
+        Args:
+            curr_user_id (int): The PID of the user rejecting the requests.
+            sender_ids (list[int] | None): The PIDs of the senders whose requests to reject,
+                or None to reject every pending request.
+
+        Returns:
+            list[FriendRequestResult]: The outcome for each sender.
+        """
+        return self._resolve_requests(curr_user_id, sender_ids, "rejected")
+
+    def _resolve_requests(
+        self, curr_user_id: int, sender_ids: list[int] | None, status: str
+    ) -> list[FriendRequestResult]:
+        """Move pending requests received by a user to status with one UPDATE ... RETURNING."""
+        if sender_ids is not None:
+            sender_ids = list(dict.fromkeys(sender_ids))
+            if not sender_ids:
+                return []
+
+        statement = (
+            update(FriendshipEntity)
+            .where(
+                FriendshipEntity.receiver == curr_user_id,
+                FriendshipEntity.status == "requested",
+            )
+            .values(status=status)
+            .returning(FriendshipEntity.sender)
+            .execution_options(synchronize_session=False)
+        )
+        if sender_ids is not None:
+            statement = statement.where(FriendshipEntity.sender.in_(sender_ids))
+        resolved = list(self._session.scalars(statement))
+
+        # Bulk UPDATE bypasses the mapper events that maintain the adjacency list.
+        if status == "accepted":
+            link_friends(
+                self._session.connection(),
+                [(sender_id, curr_user_id) for sender_id in resolved],
+            )
+        self._session.commit()
+        self._request_counts.incrby(curr_user_id, -len(resolved))
+
+        if sender_ids is None:
+            return [
+                FriendRequestResult(pid=sender_id, success=True)
+                for sender_id in resolved
+            ]
+        resolved = set(resolved)
+        return [
+            FriendRequestResult(pid=sender_id, success=True)
+            if sender_id in resolved
+            else FriendRequestResult(
+                pid=sender_id, success=False, message="Friend request not found."
+            )
+            for sender_id in sender_ids
+        ]
 
     def list_eligible_users(self, current_user_id: int) -> list[User]:
         """
@@ -179,25 +344,37 @@ class FriendshipService:
         # and are not the current user.
         eligible_users = (
             self._session.query(UserEntity)
-            .filter(UserEntity.pid != current_user_id)
-            .filter(
-                ~exists().where(
-                    or_(
-                        and_(
-                            FriendshipEntity.sender == current_user_id,
-                            FriendshipEntity.receiver == UserEntity.pid,
-                        ),
-                        and_(
-                            FriendshipEntity.sender == UserEntity.pid,
-                            FriendshipEntity.receiver == current_user_id,
-                        ),
-                    )
-                )
-            )
+            .filter(*_eligible_user_criteria(current_user_id))
             .all()
         )
         return [user.to_model() for user in eligible_users]
 
+    def list_eligible_users_page(
+        self, current_user_id: int, pagination_params: KeysetPaginationParams
+    ) -> KeysetPaginated[User]:
+        """
+        List one page of the users eligible for a friend request from the current user.
+
+        Users are ordered by last name, first name and PID, and each page seeks past the
+        cursor of the previous one, so the cost of a page is bounded by its size rather
+        than by the number of users. The `filter` parameter, when given, restricts results
+        to users whose first name, last name or onyen starts with it.
+
+        Args:
+            current_user_id (int): The PID of the current user.
+            pagination_params (KeysetPaginationParams): The cursor, page size and search prefix.
+
+        Returns:
+            KeysetPaginated[User]: A page of eligible users and the cursor of the next page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        entities = self._session.scalars(
+            _eligible_users_page(current_user_id, pagination_params)
+        ).all()
+        return _keyset_page(entities, pagination_params)
+
     def get_friends(self, curr_user_id: int) -> list[User]:
         """
         Get all friends for a user.
@@ -208,84 +385,301 @@ class FriendshipService:
         Returns:
             list[User]: A list of friends for the specified user.
         """
-        # Query the friendships table for accepted friend requests
-        friends_query = (
-            self._session.query(FriendshipEntity)
-            .filter(
-                or_(
-                    and_(
-                        FriendshipEntity.sender == curr_user_id,
-                        FriendshipEntity.status == "accepted",
-                    ),
-                    and_(
-                        FriendshipEntity.receiver == curr_user_id,
-                        FriendshipEntity.status == "accepted",
-                    ),
-                )
+        friends = self._session.scalars(_friends(curr_user_id))
+        return [friend.to_model() for friend in friends]
+
+    def suggest_friends(self, pid: int, k: int = 10) -> list[FriendSuggestion]:
+        """
+        Suggest users for a user to befriend, ranked by the number of mutual friends.
+
+        Suggestions are served from the rankings precomputed by `refresh_friend_suggestions`,
+        skipping any user who has since exchanged a friend request with this user. Users with
+        no precomputed rankings, such as those whose first friends were made after the last
+        refresh, have their suggestions computed on demand.
+
+        Args:
+            pid (int): The PID of the user to suggest friends for.
+            k (int): The maximum number of suggestions to return.
+
+        Returns:
+            list[FriendSuggestion]: Up to k suggestions, most mutual friends first.
+        """
+        rows = self._session.execute(_precomputed_suggestions(pid, k)).all()
+        if not rows:
+            rows = self._session.execute(_computed_suggestions(pid, k)).all()
+        return _suggestions(rows)
+
+    def refresh_friend_suggestions(self, k: int = SUGGESTIONS_PER_USER) -> int:
+        """
+        Recompute every user's top k friend suggestions in a single set-based statement.
+
+        Intended to run periodically in the background; see `script/refresh_friend_suggestions.py`.
+
+        Args:
+            k (int): The number of suggestions to keep per user.
+
+        Returns:
+            int: The number of suggestions stored.
+        """
+        counts = _mutual_friend_counts()
+        candidate_pid = counts.selected_columns.candidate_pid
+        mutual_friends = counts.selected_columns.mutual_friends
+        ranked = counts.add_columns(
+            func.row_number()
+            .over(
+                partition_by=FriendAdjacencyEntity.user_pid,
+                order_by=(func.count().desc(), candidate_pid),
             )
-            .options(
-                joinedload(FriendshipEntity.sender_user),
-                joinedload(FriendshipEntity.receiver_user),
+            .label("rank")
+        ).subquery()
+
+        self._session.execute(delete(FriendSuggestionEntity))
+        stored = self._session.execute(
+            insert(FriendSuggestionEntity).from_select(
+                ["user_pid", "rank", "candidate_pid", "mutual_friends"],
+                select(
+                    ranked.c.user_pid,
+                    ranked.c.rank,
+                    ranked.c.candidate_pid,
+                    ranked.c.mutual_friends,
+                ).where(ranked.c.rank <= k),
             )
-        )
+        ).rowcount
+        self._session.commit()
+        return stored
 
-        friends = []
-        for friend_rel in friends_query:
-            # Determine which user is the friend
-            if friend_rel.sender == curr_user_id:
-                # Current user is the sender, so the friend is the receiver
-                friend = (
-                    friend_rel.receiver_user.to_model()
-                    if friend_rel.receiver_user.id != curr_user_id
-                    else None
-                )
-            else:
-                # Current user is the receiver, so the friend is the sender
-                friend = (
-                    friend_rel.sender_user.to_model()
-                    if friend_rel.sender_user.id != curr_user_id
-                    else None
-                )
+    def get_friends_coworking_status(self, user_pid: int) -> list[dict]:
+        friends = self._session.scalars(_friends(user_pid))
+        return _coworking_statuses(friends, user_pid)
 
-            if friend:
-                friends.append(friend)
 
-        return friends
+class AsyncFriendshipService:
+    """Asynchronous counterpart of the hottest FriendshipService reads.
 
-    def get_friends_coworking_status(self, user_pid: int) -> list[dict]:
-        # Join the UserEntity with FriendshipEntity where the user is either the sender or receiver
-        # and the friendship status is accepted. Also, join with ReservationEntity to check the check-in status.
-        friends_query = (
-            self._session.query(UserEntity)
-            .join(
-                FriendshipEntity,
-                or_(
-                    and_(
-                        UserEntity.pid == FriendshipEntity.sender,
-                        FriendshipEntity.receiver == user_pid,
-                    ),
-                    and_(
-                        UserEntity.pid == FriendshipEntity.receiver,
-                        FriendshipEntity.sender == user_pid,
-                    ),
-                ),
+    Its methods run the same statements as FriendshipService through an AsyncSession, so the
+    routes that use it await the database on the event loop instead of occupying a thread.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(async_db_session)):
+        self._session = session
+        self._request_counts = received_request_counts
+
+    async def get_received_requests(self, curr_user_id: int) -> list[User]:
+        """See `FriendshipService.get_received_requests`."""
+        requests = await self._session.scalars(_received_requests(curr_user_id))
+        return [request.sender_user.to_model() for request in requests]
+
+    async def get_received_requests_count(self, curr_user_id: int) -> int:
+        """See `FriendshipService.get_received_requests_count`."""
+        count = self._request_counts.get(curr_user_id)
+        if count is not None:
+            return count
+
+        count = await self._session.scalar(_received_requests_count(curr_user_id))
+        self._request_counts.set(curr_user_id, count)
+        return count
+
+    async def list_eligible_users_page(
+        self, current_user_id: int, pagination_params: KeysetPaginationParams
+    ) -> KeysetPaginated[User]:
+        """See `FriendshipService.list_eligible_users_page`."""
+        entities = (
+            await self._session.scalars(
+                _eligible_users_page(current_user_id, pagination_params)
+            )
+        ).all()
+        return _keyset_page(entities, pagination_params)
+
+    async def get_friends(self, curr_user_id: int) -> list[User]:
+        """See `FriendshipService.get_friends`."""
+        friends = await self._session.scalars(_friends(curr_user_id))
+        return [friend.to_model() for friend in friends]
+
+    async def suggest_friends(self, pid: int, k: int = 10) -> list[FriendSuggestion]:
+        """See `FriendshipService.suggest_friends`."""
+        rows = (await self._session.execute(_precomputed_suggestions(pid, k))).all()
+        if not rows:
+            rows = (await self._session.execute(_computed_suggestions(pid, k))).all()
+        return _suggestions(rows)
+
+    async def get_friends_coworking_status(self, user_pid: int) -> list[dict]:
+        """See `FriendshipService.get_friends_coworking_status`."""
+        friends = await self._session.scalars(_friends(user_pid))
+        return _coworking_statuses(friends, user_pid)
+
+
+def _received_requests(curr_user_id: int) -> Select:
+    """Pending friend requests received by a user, with their senders."""
+    return (
+        select(FriendshipEntity)
+        .where(
+            FriendshipEntity.receiver == curr_user_id,
+            FriendshipEntity.status == "requested",
+        )
+        .options(joinedload(FriendshipEntity.sender_user))
+    )
+
+
+def _received_requests_count(curr_user_id: int) -> Select:
+    """The number of pending friend requests received by a user."""
+    return select(func.count()).where(
+        FriendshipEntity.receiver == curr_user_id,
+        FriendshipEntity.status == "requested",
+    )
+
+
+def _friends(curr_user_id: int) -> Select:
+    """The users who are friends of a user."""
+    # Accepted friendships are mirrored into the symmetric adjacency table, so the
+    # friend list is a single range scan on its primary key.
+    return (
+        select(UserEntity)
+        .join(
+            FriendAdjacencyEntity,
+            FriendAdjacencyEntity.friend_pid == UserEntity.pid,
+        )
+        .where(FriendAdjacencyEntity.user_pid == curr_user_id)
+    )
+
+
+def _coworking_statuses(friends: Iterable[UserEntity], user_pid: int) -> list[dict]:
+    """The coworking status of each friend of a user."""
+    return [
+        {
+            "friend_pid": friend.pid,
+            "first_name": friend.first_name,
+            "last_name": friend.last_name,
+            "is_coworking": friend.is_coworking,
+        }
+        for friend in friends
+        if friend.pid != user_pid  # Exclude the current user's own record
+    ]
+
+
+def _eligible_users_page(
+    current_user_id: int, pagination_params: KeysetPaginationParams
+) -> Select:
+    """One page of the users eligible for a friend request, plus the first of the next page."""
+    order = (UserEntity.last_name, UserEntity.first_name, UserEntity.pid)
+    statement = select(UserEntity).where(*_eligible_user_criteria(current_user_id))
+
+    if pagination_params.filter != "":
+        prefix = pagination_params.filter
+        statement = statement.where(
+            or_(
+                UserEntity.first_name.istartswith(prefix, autoescape=True),
+                UserEntity.last_name.istartswith(prefix, autoescape=True),
+                UserEntity.onyen.istartswith(prefix, autoescape=True),
             )
-            .filter(FriendshipEntity.status == "accepted")
         )
 
-        # Execute the query and fetch the results
-        friends = friends_query.all()
-
-        # Convert the results into a list of dictionaries
-        friends_coworking_status = [
-            {
-                "friend_pid": friend.pid,
-                "first_name": friend.first_name,
-                "last_name": friend.last_name,
-                "is_coworking": friend.is_coworking,
-            }
-            for friend in friends
-            if friend.pid != user_pid  # Exclude the current user's own record
-        ]
+    if pagination_params.cursor != "":
+        statement = statement.where(
+            tuple_(*order)
+            > tuple_(*decode_cursor(pagination_params.cursor, str, str, int))
+        )
 
-        return friends_coworking_status
+    # Fetch one extra row to learn whether another page follows without counting.
+    return statement.order_by(*order).limit(pagination_params.page_size + 1)
+
+
+def _keyset_page(
+    entities: Sequence[UserEntity], pagination_params: KeysetPaginationParams
+) -> KeysetPaginated[User]:
+    """The page of users read by `_eligible_users_page`, and the cursor of the next page."""
+    next_cursor = None
+    if len(entities) > pagination_params.page_size:
+        entities = entities[: pagination_params.page_size]
+        last = entities[-1]
+        next_cursor = encode_cursor(last.last_name, last.first_name, last.pid)
+
+    return KeysetPaginated(
+        items=[entity.to_model() for entity in entities],
+        next_cursor=next_cursor,
+        params=pagination_params,
+    )
+
+
+def _eligible_user_criteria(current_user_id: int) -> list[ColumnElement[bool]]:
+    """Criteria selecting users with no friendship row of any status with the current user."""
+    return [
+        UserEntity.pid != current_user_id,
+        _no_friendship_between(UserEntity.pid, current_user_id),
+    ]
+
+
+def _no_friendship_between(first_pid, second_pid) -> ColumnElement[bool]:
+    """Criterion that no friendship row of any status exists between two PID expressions."""
+    # Written against least/greatest so the lookup is served by the pair index.
+    return ~exists().where(
+        func.least(FriendshipEntity.sender, FriendshipEntity.receiver)
+        == func.least(first_pid, second_pid),
+        func.greatest(FriendshipEntity.sender, FriendshipEntity.receiver)
+        == func.greatest(first_pid, second_pid),
+    )
+
+
+def _precomputed_suggestions(pid: int, k: int) -> Select:
+    """The top k suggestions precomputed for a user, with their mutual friend counts.
+
+    Candidates befriended or requested since the rankings were stored are skipped before the
+    limit, so they do not take the place of the suggestions ranked after them."""
+    return (
+        select(UserEntity, FriendSuggestionEntity.mutual_friends)
+        .join(
+            FriendSuggestionEntity,
+            FriendSuggestionEntity.candidate_pid == UserEntity.pid,
+        )
+        .where(
+            FriendSuggestionEntity.user_pid == pid,
+            _no_friendship_between(FriendSuggestionEntity.candidate_pid, pid),
+        )
+        .order_by(FriendSuggestionEntity.rank)
+        .limit(k)
+    )
+
+
+def _computed_suggestions(pid: int, k: int) -> Select:
+    """The top k suggestions for a user computed on demand, with their mutual friend counts."""
+    counts = (
+        _mutual_friend_counts().where(FriendAdjacencyEntity.user_pid == pid).subquery()
+    )
+    return (
+        select(UserEntity, counts.c.mutual_friends)
+        .join(counts, counts.c.candidate_pid == UserEntity.pid)
+        .order_by(counts.c.mutual_friends.desc(), counts.c.candidate_pid)
+        .limit(k)
+    )
+
+
+def _suggestions(rows: Iterable[tuple[UserEntity, int]]) -> list[FriendSuggestion]:
+    return [
+        FriendSuggestion(user=user.to_model(), mutual_friends=mutual_friends)
+        for user, mutual_friends in rows
+    ]
+
+
+def _mutual_friend_counts() -> Select:
+    """
+    Count the mutual friends of each user and each friend-of-a-friend with one self-join
+    of the adjacency list, excluding pairs that already share a friend request.
+    """
+    friend_of_friend = aliased(FriendAdjacencyEntity)
+    return (
+        select(
+            FriendAdjacencyEntity.user_pid,
+            friend_of_friend.friend_pid.label("candidate_pid"),
+            func.count().label("mutual_friends"),
+        )
+        .join(
+            friend_of_friend,
+            friend_of_friend.user_pid == FriendAdjacencyEntity.friend_pid,
+        )
+        .where(
+            friend_of_friend.friend_pid != FriendAdjacencyEntity.user_pid,
+            _no_friendship_between(
+                FriendAdjacencyEntity.user_pid, friend_of_friend.friend_pid
+            ),
+        )
+        .group_by(FriendAdjacencyEntity.user_pid, friend_of_friend.friend_pid)
+    )
@@ -10,8 +10,10 @@ In this context health does not refer to correctness as much as running, connect
 """
 
 from fastapi import Depends
-from sqlalchemy import text
-from ..database import Session, db_session
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from ..database import Session, async_db_session, db_session, pool_metrics
+from ..models import PoolStatus, PoolsStatus
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -20,12 +22,31 @@ __license__ = "MIT"
 
 class HealthService:
     _session: Session
+    _async_session: AsyncSession
 
-    def __init__(self, session: Session = Depends(db_session)):
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        async_session: AsyncSession = Depends(async_db_session),
+    ):
         self._session = session
+        self._async_session = async_session
 
     def check(self):
         stmt = text("SELECT 'OK', NOW()")
         result = self._session.execute(stmt)
         row = result.all()[0]
         return str(f"{row[0]} @ {row[1]}")
+
+    def pool_status(self) -> PoolsStatus:
+        """The usage of the connection pools of the synchronous and asynchronous engines."""
+        return PoolsStatus(
+            sync=_pool_status(self._session.get_bind()),
+            async_=_pool_status(self._async_session.bind),
+        )
+
+
+def _pool_status(engine: Engine | AsyncEngine) -> PoolStatus | None:
+    """The usage of engine's connection pool, or None when it does not keep a pool."""
+    metrics = pool_metrics(engine)
+    return None if metrics is None else PoolStatus(**metrics)
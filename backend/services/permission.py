@@ -6,14 +6,17 @@ exposed via the API.
 """
 
 import re
+import threading
 from fastapi import Depends
-from functools import lru_cache
-from sqlalchemy import select
+from sqlalchemy import CompoundSelect, event, null, select, union_all
 from sqlalchemy.orm import Session
 from ..database import db_session
 from ..models import User, Permission, Role, RoleDetails
-from ..entities import UserEntity, PermissionEntity, RoleEntity
+from ..entities import UserEntity, PermissionEntity, RoleEntity, user_role_table
 from ..services.exceptions import UserPermissionException
+from .cache import TTLCache
+from .permission_set import PermissionSet, compile_pattern
+from .user_cache import registered_users
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -39,11 +42,14 @@ class PermissionService:
             subject (User): The user to get permissions for.
 
         Returns:
-            list[Permission]: The permissions for the user."""
-        user_permissions = self._get_user_permissions(subject)
-        roles_permissions = self._get_user_roles_permissions(subject)
-        permissions = user_permissions + roles_permissions
-        return [permission.to_model() for permission in permissions]
+            list[Permission]: The user's own permissions, followed by its roles'."""
+        return [
+            Permission(id=id, action=action, resource=resource)
+            for id, _role_id, action, resource in self._session.execute(
+                _permissions_of(subject)
+            )
+            if id is not None
+        ]
 
     def grant(
         self, grantor: User, grantee: User | Role | RoleDetails, permission: Permission
@@ -83,6 +89,10 @@ class PermissionService:
 
         self._session.add(permission_entity)
         self._session.commit()
+        if type(grantee) is User:
+            self.invalidate_user(grantee.id)
+        else:
+            self.invalidate_role(grantee.id)
         return True
 
     def revoke(self, revoker: User, permission: Permission) -> bool:
@@ -108,8 +118,13 @@ class PermissionService:
         self.enforce(revoker, "permission.revoke", f"permission/{permission_entity.id}")
         self.enforce(revoker, permission_entity.action, permission_entity.resource)
 
+        user_id, role_id = permission_entity.user_id, permission_entity.role_id
         self._session.delete(permission_entity)
         self._session.commit()
+        if user_id is not None:
+            self.invalidate_user(user_id)
+        if role_id is not None:
+            self.invalidate_role(role_id)
         return True
 
     def enforce(self, subject: User, action: str, resource: str) -> None:
@@ -132,71 +147,89 @@ class PermissionService:
     def check(self, subject: User, action: str, resource: str) -> bool:
         """Check if a user has permission to carry out an action on a resource.
 
+        The compiled permission sets of users and roles are cached across requests (see
+        `permission_sets`), and the sets of a subject are memoized for the current transaction
+        of the session, so repeated checks are answered from memory.
+
         Args:
             subject (User): The user to check permissions for.
 
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        # Check user permissions
-        user_perms = self._get_user_permissions(subject)
-        if self._has_permission(user_perms, action, resource):
-            return True
-
-        # Check role permissions
-        role_permissions = self._get_user_roles_permissions(subject)
-        return self._has_permission(role_permissions, action, resource)
+        return any(
+            permission_set.allows(action, resource)
+            for permission_set in self._get_permission_sets(subject)
+        )
 
-    def _get_user_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user.
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget the cached permissions and roles of a user, e.g. after their role membership changed.
 
         Args:
-            subject (User): The user to get permissions for.
+            user_id (int): The id of the user."""
+        _invalidate(("user", user_id), ("roles", user_id))
+        registered_users.invalidate_user(user_id)
 
-        Returns:
-            list[PermissionEntity]: The permissions for the user."""
-        user_query = select(PermissionEntity).where(
-            PermissionEntity.user_id == subject.id
-        )
-        user_perms = [p for p in self._session.execute(user_query).scalars()]
-        return user_perms
+    def invalidate_role(self, role_id: int) -> None:
+        """Forget the cached permissions of a role.
+
+        Args:
+            role_id (int): The id of the role."""
+        _invalidate(("role", role_id))
+        # The permissions of every member of the role are part of their cached user.
+        registered_users.clear()
 
-    def _get_user_roles_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user's roles.
+    def _get_permission_sets(self, subject: User) -> list[PermissionSet]:
+        """Get the compiled permission sets of a user and of each of its roles.
 
         Args:
-            subject (User): The user to get permissions for.
+            subject (User): The user to get permission sets for.
 
         Returns:
-            list[PermissionEntity]: The permissions for the user's roles."""
-        user_entity = self._session.get(UserEntity, subject.id)
-        if user_entity == None:
-            return []
-        role_ids = [role.id for role in user_entity.roles]
-        if len(role_ids) == 0:
-            return []
-        role_query = select(PermissionEntity).where(
-            PermissionEntity.role_id.in_(role_ids)
-        )
-        return [p for p in self._session.execute(role_query).scalars()]
+            list[PermissionSet]: The user's own permissions, followed by its roles'."""
+        sets_by_subject = self._session.info.setdefault(_PERMISSION_SETS, {})
+        sets = sets_by_subject.get(subject.id)
+        if sets is None:
+            sets = _cached_permission_sets(subject.id)
+            if sets is None:
+                sets = self._load_permission_sets(subject)
+            sets_by_subject[subject.id] = sets
+        return sets
 
-    def _has_permission(
-        self, permissions: list[PermissionEntity], action: str, resource: str
-    ) -> bool:
-        """Check if a user has permission to carry out an action on a resource in a list of permissions.
+    def _load_permission_sets(self, subject: User) -> list[PermissionSet]:
+        """Load and cache the permission sets of a user and its roles in a single query.
+
+        See `_permissions_of` for the query.
 
         Args:
-            permissions (list[PermissionEntity]): The permissions to check.
-            action (str): The action in question.
-            resource (str): The resource in question.
+            subject (User): The user to load permission sets for.
 
         Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
-        """
-        for permission in permissions:
-            if self._check_permission(permission, action, resource):
-                return True
-        return False
+            list[PermissionSet]: The user's own permissions, followed by its roles'."""
+        generation = _generation
+        user_permissions: list[tuple[str, str]] = []
+        role_permissions: dict[int, list[tuple[str, str]]] = {}
+        for _id, role_id, action, resource in self._session.execute(
+            _permissions_of(subject)
+        ):
+            if role_id is None:
+                user_permissions.append((action, resource))
+            else:
+                permissions = role_permissions.setdefault(role_id, [])
+                if action is not None:
+                    permissions.append((action, resource))
+
+        role_ids = tuple(sorted(role_permissions))
+        entries = {
+            ("user", subject.id): PermissionSet(user_permissions),
+            ("roles", subject.id): role_ids,
+        }
+        for role_id in role_ids:
+            entries[("role", role_id)] = PermissionSet(role_permissions[role_id])
+        _cache_if_current(generation, entries)
+        return [entries[("user", subject.id)]] + [
+            entries[("role", role_id)] for role_id in role_ids
+        ]
 
     def _check_permission(
         self, permission: PermissionEntity, action: str, resource: str
@@ -218,16 +251,96 @@ class PermissionService:
         else:
             return False
 
-    @lru_cache()
     def _expand_pattern(self, pattern: str) -> re.Pattern:
         """Expand a permission pattern into a regular expression.
 
-        This function is memoized to avoid recompiling the same regular expression multiple times.
+        Compiled expressions are shared through the process-wide LRU cache of `compile_pattern`.
 
         Args:
             pattern (str): The pattern to expand.
 
         Returns:
             re.Pattern: The compiled regular expression."""
-        search = pattern.replace("*", ".*")
-        return re.compile(f"^{search}$")
+        return compile_pattern(pattern)
+
+
+permission_sets = TTLCache(maxsize=4096, ttl=30.0)
+"""Compiled permission sets of users and roles, and the role ids of users, shared by requests.
+
+Grants, revocations and role membership changes made through the services invalidate the affected
+entries. Other application processes keep their own cache, so its time to live bounds how long a
+change made elsewhere may take to apply."""
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _invalidate(*keys: tuple[str, int]) -> None:
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        for key in keys:
+            permission_sets.delete(key)
+
+
+def _cached_permission_sets(user_id: int) -> list[PermissionSet] | None:
+    """The cached permission sets of a user and its roles, or None if any is missing."""
+    user_set = permission_sets.get(("user", user_id))
+    role_ids = permission_sets.get(("roles", user_id))
+    if user_set is None or role_ids is None:
+        return None
+    sets = [user_set]
+    for role_id in role_ids:
+        role_set = permission_sets.get(("role", role_id))
+        if role_set is None:
+            return None
+        sets.append(role_set)
+    return sets
+
+
+def _cache_if_current(generation: int, entries: dict[tuple[str, int], object]) -> None:
+    """Cache entries loaded since generation, unless an invalidation happened meanwhile and
+    they may predate the change."""
+    with _generation_lock:
+        if generation == _generation:
+            for key, value in entries.items():
+                permission_sets.set(key, value)
+
+
+def _permissions_of(subject: User) -> CompoundSelect:
+    """The permissions of a user and of each of its roles, as (id, role_id, action, resource).
+
+    The query is the UNION of the user's direct permissions, whose role id is NULL, and the
+    permissions of each of its roles. Roles are outer joined so that a role without any
+    permission is still known to be one of the user's roles, with a NULL permission."""
+    direct = select(
+        PermissionEntity.id,
+        null().label("role_id"),
+        PermissionEntity.action,
+        PermissionEntity.resource,
+    ).where(PermissionEntity.user_id == subject.id)
+    derived = (
+        select(
+            PermissionEntity.id,
+            user_role_table.c.role_id,
+            PermissionEntity.action,
+            PermissionEntity.resource,
+        )
+        .select_from(user_role_table)
+        .outerjoin(
+            PermissionEntity, PermissionEntity.role_id == user_role_table.c.role_id
+        )
+        .where(user_role_table.c.user_id == subject.id)
+    )
+    return union_all(direct, derived)
+
+
+_PERMISSION_SETS = "permission_sets"
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_permission_sets(session: Session) -> None:
+    # Grants, revocations and role membership changes take effect once committed, so the
+    # permissions memoized for a session never outlive the transaction they were read in.
+    session.info.pop(_PERMISSION_SETS, None)
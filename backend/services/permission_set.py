@@ -0,0 +1,89 @@
+"""Compiled sets of permissions that answer checks without scanning every grant.
+
+A permission pairs an action pattern with a resource pattern, in which `*` matches any sequence
+of characters. A `PermissionSet` indexes the action patterns of many permissions by their literal
+prefix, so a check only tests the permissions whose prefix the action starts with: its cost
+depends on the length of the action rather than the number of grants.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a permission pattern into a regular expression matching what it grants.
+
+    Compiled patterns are kept in a bounded, process-wide LRU cache."""
+    search = ".*".join(re.escape(part) for part in pattern.split("*"))
+    return re.compile(f"^{search}$")
+
+
+class _Resources:
+    """The resource patterns granted for one action pattern."""
+
+    __slots__ = ("exact", "patterns")
+
+    def __init__(self):
+        self.exact: set[str] = set()
+        self.patterns: dict[str, re.Pattern] = {}
+
+    def add(self, pattern: str) -> None:
+        if "*" in pattern:
+            self.patterns[pattern] = compile_pattern(pattern)
+        else:
+            self.exact.add(pattern)
+
+    def matches(self, resource: str) -> bool:
+        if resource in self.exact:
+            return True
+        return any(
+            pattern.fullmatch(resource) is not None
+            for pattern in self.patterns.values()
+        )
+
+
+class PermissionSet:
+    """An immutable, indexed set of (action, resource) permission patterns."""
+
+    def __init__(self, permissions: Iterable[tuple[str, str]] = ()):
+        """Compile a set of permissions.
+
+        Args:
+            permissions: The (action pattern, resource pattern) pairs granted.
+        """
+        # Actions without a wildcard are looked up directly.
+        self._exact: dict[str, _Resources] = {}
+        # Actions with a wildcard are indexed by the literal prefix before it.
+        self._by_prefix: dict[str, dict[str, tuple[re.Pattern, _Resources]]] = {}
+        self._prefix_lengths: set[int] = set()
+
+        for action, resource in permissions:
+            if "*" in action:
+                prefix = action[: action.index("*")]
+                patterns = self._by_prefix.setdefault(prefix, {})
+                if action not in patterns:
+                    patterns[action] = (compile_pattern(action), _Resources())
+                patterns[action][1].add(resource)
+                self._prefix_lengths.add(len(prefix))
+            else:
+                self._exact.setdefault(action, _Resources()).add(resource)
+
+    def allows(self, action: str, resource: str) -> bool:
+        """Whether any permission in the set grants action on resource."""
+        resources = self._exact.get(action)
+        if resources is not None and resources.matches(resource):
+            return True
+        for length in self._prefix_lengths:
+            patterns = self._by_prefix.get(action[:length])
+            if patterns is None or length > len(action):
+                continue
+            for action_re, resources in patterns.values():
+                if action_re.fullmatch(action) and resources.matches(resource):
+                    return True
+        return False
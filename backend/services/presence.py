@@ -0,0 +1,89 @@
+"""In-process publish/subscribe hub for friends' coworking presence changes.
+
+Streaming endpoints subscribe on behalf of a user and await messages on the event loop, while
+synchronous services (which FastAPI runs on its threadpool) publish to a set of recipient PIDs.
+Delivery is handed to each subscriber's event loop with `call_soon_threadsafe`, so publishing
+never blocks on slow clients."""
+
+import asyncio
+import threading
+from typing import Any, Iterable
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class PresenceSubscription:
+    """A single client's queue of presence messages."""
+
+    def __init__(self, pid: int, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.pid = pid
+        self._loop = loop
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+
+    async def get(self) -> dict[str, Any]:
+        """Wait for the next message."""
+        return await self._queue.get()
+
+    def _deliver(self, message: dict[str, Any]) -> None:
+        # Runs on the subscriber's event loop. A client too slow to drain its queue
+        # misses deltas rather than growing memory without bound.
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            ...
+
+    def put_threadsafe(self, message: dict[str, Any]) -> None:
+        """Queue a message from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, message)
+        except RuntimeError:
+            # The subscriber's loop has closed; it will be unsubscribed on its way out.
+            ...
+
+
+class PresenceHub:
+    """Routes presence messages to the subscriptions of their recipients."""
+
+    def __init__(self, queue_size: int = 100):
+        self._queue_size = queue_size
+        self._subscriptions: dict[int, set[PresenceSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, pid: int) -> PresenceSubscription:
+        """Subscribe to messages addressed to pid. Must be called from a running event loop."""
+        subscription = PresenceSubscription(
+            pid, asyncio.get_running_loop(), self._queue_size
+        )
+        with self._lock:
+            self._subscriptions.setdefault(pid, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PresenceSubscription) -> None:
+        """Stop delivering messages to subscription."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.pid)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.pid]
+
+    def has_subscribers(self) -> bool:
+        """Whether any client is subscribed, letting publishers skip work when none are."""
+        return bool(self._subscriptions)
+
+    def publish(self, recipient_pids: Iterable[int], message: dict[str, Any]) -> None:
+        """Deliver message to every subscription of each recipient PID."""
+        with self._lock:
+            targets = [
+                subscription
+                for pid in recipient_pids
+                for subscription in self._subscriptions.get(pid, ())
+            ]
+        for subscription in targets:
+            subscription.put_threadsafe(message)
+
+
+presence_hub = PresenceHub()
+"""Process-wide hub shared by the coworking status publisher and the friendship stream endpoint."""
@@ -3,13 +3,16 @@
 The User Service provides access to the User model and its associated database operations.
 """
 
+from typing import Sequence
 from fastapi import Depends
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import Session
-from ..database import db_session
+from sqlalchemy import Select, select, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from ..database import async_db_session, db_session
 from ..models import User, UserDetails, Paginated, PaginationParams
 from ..entities import UserEntity
 from .permission import PermissionService
+from .user_cache import registered_users
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -49,9 +52,31 @@ class UserService:
             user_details = UserDetails(**user_fields)
             return user_details
 
+    def get_registered(self, pid: int) -> UserDetails | None:
+        """Get a User by PID for authenticating a request.
+
+        Users are served from the process-wide `registered_users` cache when present, so a
+        cache hit does not query the database.
+
+        Args:
+            pid: The PID of the user.
+
+        Returns:
+            UserDetails | None: The user or None if not found.
+        """
+        user = registered_users.get(pid)
+        if user is None:
+            generation = registered_users.generation
+            user = self.get(pid)
+            if user is not None:
+                registered_users.set(user, generation)
+        return user
+
     def search(self, _subject: User, query: str) -> list[User]:
         """Search for users by their name, onyen, email.
 
+        Matches are ranked by how similar their closest field is to the query.
+
         Args:
             subject: The user performing the action.
             query: The search query.
@@ -59,15 +84,7 @@ class UserService:
         Returns:
             list[User]: The list of users matching the query.
         """
-        statement = select(UserEntity)
-        criteria = or_(
-            UserEntity.first_name.ilike(f"%{query}%"),
-            UserEntity.last_name.ilike(f"%{query}%"),
-            UserEntity.onyen.ilike(f"%{query}%"),
-            UserEntity.email.ilike(f"%{query}%"),
-        )
-        statement = statement.where(criteria).limit(10)
-        entities = self._session.execute(statement).scalars()
+        entities = self._session.execute(_search(query)).scalars()
         return [entity.to_model() for entity in entities]
 
     def list(
@@ -93,13 +110,14 @@ class UserService:
         length_statement = select(func.count()).select_from(UserEntity)
         if pagination_params.filter != "":
             query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
-            )
+            columns = (UserEntity.first_name, UserEntity.last_name, UserEntity.onyen)
+            criteria = _contains(query, columns)
             statement = statement.where(criteria)
             length_statement = length_statement.where(criteria)
+            if pagination_params.order_by == "":
+                statement = statement.order_by(
+                    _similarity(query, columns).desc(), UserEntity.id
+                )
 
         offset = pagination_params.page * pagination_params.page_size
         limit = pagination_params.page_size
@@ -163,3 +181,73 @@ class UserService:
         entity.update(user)
         self._session.commit()
         return entity.to_model()
+
+
+class AsyncUserService:
+    """Asynchronous counterpart of the UserService reads made by async routes, such as search."""
+
+    _session: AsyncSession
+
+    def __init__(self, session: AsyncSession = Depends(async_db_session)):
+        """Initialize the Async User Service."""
+        self._session = session
+
+    async def get_registered(self, pid: int) -> UserDetails | None:
+        """See `UserService.get_registered`.
+
+        A cache hit completes on the event loop, and a miss is awaited through asyncpg.
+        """
+        user = registered_users.get(pid)
+        if user is None:
+            generation = registered_users.generation
+            user = await self._session.run_sync(
+                lambda session: UserService(session, PermissionService(session)).get(
+                    pid
+                )
+            )
+            if user is not None:
+                registered_users.set(user, generation)
+        return user
+
+    async def search(self, _subject: User, query: str) -> list[User]:
+        """Search for users by their name, onyen, email.
+
+        Args:
+            subject: The user performing the action.
+            query: The search query.
+
+        Returns:
+            list[User]: The list of users matching the query.
+        """
+        entities = (await self._session.execute(_search(query))).scalars()
+        return [entity.to_model() for entity in entities]
+
+
+_SEARCH_COLUMNS = (
+    UserEntity.first_name,
+    UserEntity.last_name,
+    UserEntity.onyen,
+    UserEntity.email,
+)
+
+
+def _search(query: str) -> Select:
+    """The 10 users whose name, onyen or email contains query, most similar first."""
+    return (
+        select(UserEntity)
+        .where(_contains(query, _SEARCH_COLUMNS))
+        .order_by(_similarity(query, _SEARCH_COLUMNS).desc(), UserEntity.id)
+        .limit(10)
+    )
+
+
+def _contains(query: str, columns: Sequence[InstrumentedAttribute[str]]):
+    """Criterion that any of columns contains query, ignoring case.
+
+    Each column has a trigram index that serves its `ILIKE '%query%'` match."""
+    return or_(*(column.ilike(f"%{query}%") for column in columns))
+
+
+def _similarity(query: str, columns: Sequence[InstrumentedAttribute[str]]):
+    """The trigram word similarity of query to the most similar of columns, from 0 to 1."""
+    return func.greatest(*(func.word_similarity(query, column) for column in columns))
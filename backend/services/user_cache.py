@@ -0,0 +1,103 @@
+"""Process-wide cache of registered users, keyed by PID, for authenticating API requests.
+
+Every authenticated request resolves the PID in its token to the registered user and their
+permissions before the endpoint does any work, so the users resolved recently are served from
+memory. Any session that commits a change to a `UserEntity` invalidates the cached user with that
+PID, and the permission service invalidates users whose grants or roles change. Other application
+processes keep their own cache, so its time to live bounds how stale they may become.
+"""
+
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..entities import UserEntity
+from ..models import UserDetails
+from .cache import TTLCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class RegisteredUserCache:
+    """A size-capped, expiring cache of the details of registered users by PID."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 60.0):
+        """Create an empty cache.
+
+        Args:
+            maxsize: The number of users kept before the least recently used is evicted.
+            ttl: The number of seconds a user may be served after it was loaded.
+        """
+        self._users = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pids = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Incremented every time a user is invalidated."""
+        return self._generation
+
+    def get(self, pid: int) -> UserDetails | None:
+        """Return a copy of the user cached for pid, or None on a miss."""
+        user: UserDetails | None = self._users.get(pid)
+        return None if user is None else user.model_copy(deep=True)
+
+    def set(self, user: UserDetails, generation: int) -> None:
+        """Cache a user loaded since generation, unless an invalidation happened meanwhile and
+        the user may predate the change."""
+        with self._lock:
+            if generation == self._generation:
+                self._users.set(user.pid, user.model_copy(deep=True))
+                self._pids.set(user.id, user.pid)
+
+    def invalidate(self, pid: int) -> None:
+        """Forget the user with pid."""
+        with self._lock:
+            self._generation += 1
+            self._users.delete(pid)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget the user with id user_id."""
+        with self._lock:
+            self._generation += 1
+            pid = self._pids.get(user_id)
+            if pid is not None:
+                self._users.delete(pid)
+
+    def clear(self) -> None:
+        """Forget every user."""
+        with self._lock:
+            self._generation += 1
+            self._users.flushall()
+            self._pids.flushall()
+
+
+registered_users = RegisteredUserCache()
+"""Users resolved by `registered_user`, shared by requests."""
+
+_CHANGED = "registered_users_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_changes(session: Session, _flush_context) -> None:
+    users = session.info.setdefault(_CHANGED, set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, UserEntity):
+            users.add((instance.id, instance.pid))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id, pid in session.info.pop(_CHANGED, ()):
+        # The PID itself may have changed, so the user is also forgotten by id.
+        registered_users.invalidate_user(user_id)
+        registered_users.invalidate(pid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED, None)
@@ -1,5 +1,6 @@
 """Unit tests for AvailabilityList model."""
 
+import random
 import pytest
 from pydantic import ValidationError
 from ....models.coworking import AvailabilityList, TimeRange
@@ -263,3 +264,69 @@ def test_total_duration_multiple(time: dict[str, datetime]):
         ]
     )
     assert availability_list.total_duration() == timedelta(minutes=30)
+
+
+def test_subtract_many_empty_blocks(time: dict[str, datetime]):
+    availability_list = AvailabilityList(
+        availability=[TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])]
+    )
+    availability_list.subtract_many([])
+    assert len(availability_list.availability) == 1
+
+
+def test_subtract_many_overlapping_blocks(time: dict[str, datetime]):
+    availability_list = AvailabilityList(
+        availability=[
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_THREE_HOURS]),
+        ]
+    )
+    availability_list.subtract_many(
+        [
+            TimeRange(start=time[NOW] - FIVE_MINUTES, end=time[NOW] + FIVE_MINUTES),
+            TimeRange(
+                start=time[IN_THIRTY_MINUTES] - FIVE_MINUTES,
+                end=time[IN_ONE_HOUR] + FIVE_MINUTES,
+            ),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_ONE_HOUR] + ONE_MINUTE),
+            TimeRange(start=time[IN_TWO_HOURS], end=time[IN_TWO_HOURS] + FIVE_MINUTES),
+        ]
+    )
+    assert [(r.start, r.end) for r in availability_list.availability] == [
+        (time[NOW] + FIVE_MINUTES, time[IN_THIRTY_MINUTES] - FIVE_MINUTES),
+        (time[IN_ONE_HOUR] + FIVE_MINUTES, time[IN_TWO_HOURS]),
+        (time[IN_TWO_HOURS] + FIVE_MINUTES, time[IN_THREE_HOURS]),
+    ]
+
+
+def test_subtract_many_matches_subtract(time: dict[str, datetime]):
+    rng = random.Random(1561)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(0, 24 * 60, 5), 12))
+        ranges = [
+            TimeRange(
+                start=time[NOW] + cuts[i] * ONE_MINUTE,
+                end=time[NOW] + cuts[i + 1] * ONE_MINUTE,
+            )
+            for i in range(0, len(cuts), 2)
+        ]
+        blocks = []
+        for _ in range(rng.randint(0, 15)):
+            start = rng.randrange(-60, 24 * 60)
+            blocks.append(
+                TimeRange(
+                    start=time[NOW] + start * ONE_MINUTE,
+                    end=time[NOW] + (start + rng.randint(1, 180)) * ONE_MINUTE,
+                )
+            )
+        blocks.sort(key=lambda block: block.start)
+
+        one_at_a_time = AvailabilityList(availability=ranges)
+        for block in blocks:
+            one_at_a_time.subtract(block)
+        merged = AvailabilityList(availability=ranges)
+        merged.subtract_many(blocks)
+
+        assert [(r.start, r.end) for r in merged.availability] == [
+            (r.start, r.end) for r in one_at_a_time.availability
+        ]
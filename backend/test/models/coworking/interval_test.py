@@ -0,0 +1,67 @@
+"""Unit tests for the internal Interval type and range algorithms."""
+
+from ....models.coworking import TimeRange
+from ....models.coworking.interval import (
+    Interval,
+    constrain,
+    subtract,
+    subtract_many,
+)
+from ...services.coworking.time import *
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def test_interval_has_no_instance_dict(time: dict[str, datetime]):
+    interval = Interval(time[NOW], time[IN_ONE_HOUR])
+    assert not hasattr(interval, "__dict__")
+    assert interval.duration() == ONE_HOUR
+
+
+def test_interval_round_trips_time_range(time: dict[str, datetime]):
+    time_range = TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    interval = Interval.from_time_range(time_range)
+    assert interval == Interval(time[NOW], time[IN_ONE_HOUR])
+    assert interval.to_time_range() == time_range
+
+
+def test_interval_overlaps(time: dict[str, datetime]):
+    interval = Interval(time[NOW], time[IN_ONE_HOUR])
+    assert interval.overlaps(Interval(time[IN_THIRTY_MINUTES], time[IN_TWO_HOURS]))
+    assert not interval.overlaps(Interval(time[IN_ONE_HOUR], time[IN_TWO_HOURS]))
+
+
+def test_constrain_does_not_mutate_input(time: dict[str, datetime]):
+    first = Interval(time[AN_HOUR_AGO], time[NOW])
+    ranges = [first, Interval(time[IN_ONE_HOUR], time[IN_THREE_HOURS])]
+    constrained = constrain(
+        ranges, Interval(time[THIRTY_MINUTES_AGO], time[IN_TWO_HOURS]), Interval
+    )
+    assert constrained == [
+        Interval(time[THIRTY_MINUTES_AGO], time[NOW]),
+        Interval(time[IN_ONE_HOUR], time[IN_TWO_HOURS]),
+    ]
+    assert first == Interval(time[AN_HOUR_AGO], time[NOW])
+
+
+def test_subtract_splits_interval(time: dict[str, datetime]):
+    ranges = [Interval(time[NOW], time[IN_THREE_HOURS])]
+    subtract(ranges, Interval(time[IN_ONE_HOUR], time[IN_TWO_HOURS]), Interval)
+    assert ranges == [
+        Interval(time[NOW], time[IN_ONE_HOUR]),
+        Interval(time[IN_TWO_HOURS], time[IN_THREE_HOURS]),
+    ]
+
+
+def test_subtract_many_accepts_time_range_blocks(time: dict[str, datetime]):
+    ranges = [Interval(time[NOW], time[IN_THREE_HOURS])]
+    blocks = [
+        TimeRange(start=time[IN_THIRTY_MINUTES], end=time[IN_ONE_HOUR]),
+        TimeRange(start=time[IN_TWO_HOURS], end=time[IN_THREE_HOURS]),
+    ]
+    assert subtract_many(ranges, blocks, Interval) == [
+        Interval(time[NOW], time[IN_THIRTY_MINUTES]),
+        Interval(time[IN_ONE_HOUR], time[IN_TWO_HOURS]),
+    ]
@@ -0,0 +1,79 @@
+"""Tests for the in-process TTLCache."""
+
+import pytest
+
+from ...services import cache
+from ...services.cache import TTLCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Replace the cache's monotonic clock with one the test advances by hand."""
+    now = [0.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_set(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    assert ttl_cache.get("a") is None
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") == 1
+
+
+def test_entries_expire(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    clock[0] = 9.9
+    assert ttl_cache.get("a") == 1
+    clock[0] = 10
+    assert ttl_cache.get("a") is None
+    assert len(ttl_cache) == 0
+
+
+def test_least_recently_used_is_evicted(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("c") == 3
+
+
+def test_incrby_adjusts_cached_value(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.incrby("a", 2) == 3
+    assert ttl_cache.incrby("a", -1) == 2
+    assert ttl_cache.get("a") == 2
+
+
+def test_incrby_keeps_expiry(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    clock[0] = 5
+    ttl_cache.incrby("a", 1)
+    clock[0] = 10
+    assert ttl_cache.get("a") is None
+
+
+def test_incrby_missing_key_is_not_created(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    assert ttl_cache.incrby("a", 1) is None
+    assert ttl_cache.get("a") is None
+
+
+def test_delete_and_flushall(clock: list[float]):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.delete("a")
+    assert ttl_cache.get("a") is None
+    ttl_cache.flushall()
+    assert ttl_cache.get("b") is None
@@ -3,12 +3,18 @@
 import pytest
 
 from sqlalchemy import create_engine, text, Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
 from ...database import _engine_str
 from ...env import getenv
 from ... import entities
+from ...services.coworking.catalog import coworking_catalog
+from ...services.coworking.availability_snapshot import availability_snapshot
+from ...services.permission import permission_sets
+from ...services.user_cache import registered_users
 
 POSTGRES_DATABASE = f'{getenv("POSTGRES_DATABASE")}_test'
 POSTGRES_USER = getenv("POSTGRES_USER")
@@ -51,8 +57,25 @@ def test_engine() -> Engine:
 def session(test_engine: Engine):
     entities.EntityBase.metadata.drop_all(test_engine)
     entities.EntityBase.metadata.create_all(test_engine)
+    # Process-wide caches must not outlive the tables they were filled from.
+    coworking_catalog.invalidate()
+    availability_snapshot.clear()
+    permission_sets.flushall()
+    registered_users.clear()
     session = Session(test_engine)
     try:
         yield session
     finally:
         session.close()
+
+
+@pytest.fixture(scope="function")
+def async_session(session: Session) -> async_sessionmaker:
+    """Factory of AsyncSessions on the test database, for tests driven with `asyncio.run`.
+
+    Connections are not pooled, since each call to `asyncio.run` starts a new event loop.
+    """
+    engine = create_async_engine(
+        _engine_str(POSTGRES_DATABASE, "postgresql+asyncpg"), poolclass=NullPool
+    )
+    return async_sessionmaker(engine, expire_on_commit=False)
@@ -0,0 +1,220 @@
+"""Tests for the shared availability snapshot and the seat availability served from it."""
+
+import asyncio
+import threading
+import pytest
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ....models.coworking import (
+    Reservation,
+    ReservationPartial,
+    ReservationState,
+    TimeRange,
+)
+from ....services.coworking import ReservationService
+from ....services.coworking import reservation as reservation_module
+from ....services.coworking.availability_snapshot import AvailabilitySnapshot
+
+from .fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from .time import *
+
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from .room_data import fake_data_fixture as insert_order_2
+from .seat_data import fake_data_fixture as insert_order_3
+from .reservation.reservation_data import fake_data_fixture as insert_order_4
+
+from ..core_data import user_data
+from . import seat_data
+from .reservation import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@pytest.fixture(autouse=True)
+def no_entropy(monkeypatch: pytest.MonkeyPatch):
+    """Shared and direct results are comparable once the random tie-breaker is constant."""
+    monkeypatch.setattr(reservation_module, "random", lambda: 0.0)
+
+
+def test_coalesce_shares_concurrent_computation():
+    snapshot = AvailabilitySnapshot()
+    release = threading.Event()
+    computations: list[int] = []
+
+    def compute() -> list[int]:
+        computations.append(1)
+        release.wait(5)
+        return [42]
+
+    results: list[list[int]] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(snapshot.coalesce("k", compute)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [[42]] * 8
+    assert len(computations) == 1
+
+
+def test_coalesced_result_expires_when_snapshot_changes():
+    snapshot = AvailabilitySnapshot()
+    assert snapshot.coalesce("k", lambda: [1]) == [1]
+    assert snapshot.coalesce("k", lambda: [2]) == [1]
+    snapshot.clear()
+    assert snapshot.coalesce("k", lambda: [3]) == [3]
+
+
+def test_coalesce_retries_after_failure():
+    snapshot = AvailabilitySnapshot()
+
+    def fail() -> list[int]:
+        raise ConnectionError("database unavailable")
+
+    with pytest.raises(ConnectionError):
+        snapshot.coalesce("k", fail)
+    assert snapshot.coalesce("k", lambda: [1]) == [1]
+
+
+def test_coalesce_async_shares_concurrent_computation():
+    snapshot = AvailabilitySnapshot()
+    computations: list[int] = []
+
+    async def compute() -> list[int]:
+        computations.append(1)
+        await asyncio.sleep(0.01)
+        return [42]
+
+    async def requests():
+        return await asyncio.gather(
+            *(snapshot.coalesce_async("k", compute) for _ in range(8))
+        )
+
+    assert asyncio.run(requests()) == [[42]] * 8
+    assert len(computations) == 1
+    assert snapshot.coalesce("k", lambda: [0]) == [42]
+
+
+def test_coalesce_async_waiters_retry_after_failure():
+    snapshot = AvailabilitySnapshot()
+    computations: list[int] = []
+
+    async def compute() -> list[int]:
+        computations.append(1)
+        await asyncio.sleep(0.01)
+        if len(computations) == 1:
+            raise ConnectionError("database unavailable")
+        return [1]
+
+    async def requests():
+        return await asyncio.gather(
+            snapshot.coalesce_async("k", compute),
+            snapshot.coalesce_async("k", compute),
+            return_exceptions=True,
+        )
+
+    leader, waiter = asyncio.run(requests())
+    assert isinstance(leader, ConnectionError)
+    assert waiter == [1]
+
+
+def test_reservation_applied_during_load_is_kept(time: dict[str, datetime]):
+    snapshot = AvailabilitySnapshot()
+    reservation = reservation_data.reservation_1
+    window = TimeRange(start=time[NOW], end=time[NOW] + ONE_HOUR)
+
+    def load(_: TimeRange) -> list[Reservation]:
+        # The reservation is committed and applied after the load's query ran.
+        snapshot.apply(reservation)
+        return []
+
+    assert snapshot.reservations(reservation.seats, window, load) == [reservation]
+    assert snapshot.reservations(reservation.seats, window, load) == [reservation]
+
+
+def _later_today(time: dict[str, datetime]) -> TimeRange:
+    # Bounds start in the future so that both calls see the same bounds.
+    return TimeRange(start=time[NOW] + ONE_MINUTE, end=time[NOW] + 3 * ONE_HOUR)
+
+
+def test_shared_seat_availability_matches_database(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    bounds = _later_today(time)
+    expected = reservation_svc.seat_availability(seat_data.seats, bounds.model_copy())
+    actual = reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy(), shared=True
+    )
+    assert actual == expected
+
+
+def test_draft_updates_snapshot_in_place(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    bounds = _later_today(time)
+    before = reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy(), shared=True
+    )
+
+    draft = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        reservation_data.test_request(
+            {"start": bounds.start, "end": bounds.start + THIRTY_MINUTES}
+        ),
+    )
+    assert draft.state == ReservationState.DRAFT
+
+    statements = []
+    event.listen(
+        session, "do_orm_execute", lambda state: statements.append(state.statement)
+    )
+    after = reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy(), shared=True
+    )
+    assert statements == []
+    assert after != before
+    assert after == reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy()
+    )
+
+
+def test_cancel_releases_seat_in_snapshot(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    bounds = _later_today(time)
+    draft = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        reservation_data.test_request(
+            {"start": bounds.start, "end": bounds.start + THIRTY_MINUTES}
+        ),
+    )
+    with_draft = reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy(), shared=True
+    )
+
+    reservation_svc.change_reservation(
+        user_data.ambassador,
+        ReservationPartial(id=draft.id, state=ReservationState.CANCELLED),
+    )
+    released = reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy(), shared=True
+    )
+    assert released != with_draft
+    assert released == reservation_svc.seat_availability(
+        seat_data.seats, bounds.model_copy()
+    )
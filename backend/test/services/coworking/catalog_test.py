@@ -0,0 +1,98 @@
+"""Tests for the process-wide coworking catalog cache."""
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from ....entities.coworking import OperatingHoursEntity, SeatEntity
+from ....models.coworking import TimeRange
+from ....services.coworking import OperatingHoursService, SeatService
+from ....services.coworking.catalog import CoworkingCatalog, coworking_catalog
+
+from .fixtures import seat_svc, operating_hours_svc
+from .time import *
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from .room_data import fake_data_fixture as insert_order_2
+from .seat_data import fake_data_fixture as insert_order_3
+from . import operating_hours_data, seat_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def test_get_loads_once_per_version():
+    catalog = CoworkingCatalog()
+    loads: list[int] = []
+
+    def load() -> list[int]:
+        loads.append(1)
+        return [catalog.version]
+
+    assert catalog.get("key", load) == [0]
+    assert catalog.get("key", load) == [0]
+    assert len(loads) == 1
+
+    catalog.invalidate()
+    assert catalog.version == 1
+    assert catalog.get("key", load) == [1]
+    assert len(loads) == 2
+
+
+def test_get_returns_a_copy():
+    catalog = CoworkingCatalog()
+    catalog.get("key", lambda: [1, 2]).append(3)
+    assert catalog.get("key", lambda: []) == [1, 2]
+
+
+def test_seats_served_from_cache(session: Session, seat_svc: SeatService):
+    seat_svc.list()
+
+    statements = []
+    event.listen(
+        session, "do_orm_execute", lambda state: statements.append(state.statement)
+    )
+    assert len(seat_svc.list()) == len(seat_data.seats)
+    assert statements == []
+
+
+def test_commit_invalidates_seats(session: Session, seat_svc: SeatService):
+    version = coworking_catalog.version
+    seat_svc.list()
+
+    seat = session.get(SeatEntity, seat_data.monitor_seat_00.id)
+    seat.title = "Renamed"
+    session.commit()
+
+    assert coworking_catalog.version > version
+    assert "Renamed" in [seat.title for seat in seat_svc.list()]
+
+
+def test_rollback_of_flushed_change_invalidates(
+    session: Session, seat_svc: SeatService
+):
+    seat = session.get(SeatEntity, seat_data.monitor_seat_00.id)
+    seat.title = "Uncommitted"
+    session.flush()
+    assert "Uncommitted" in [seat.title for seat in seat_svc.list()]
+
+    session.rollback()
+    assert "Uncommitted" not in [seat.title for seat in seat_svc.list()]
+
+
+def test_bulk_update_invalidates_operating_hours(
+    session: Session,
+    operating_hours_svc: OperatingHoursService,
+    time: dict[str, datetime],
+):
+    week = TimeRange(start=time[NOW], end=time[NOW] + 7 * ONE_DAY)
+    assert len(operating_hours_svc.schedule(week)) == len(operating_hours_data.all)
+
+    session.execute(
+        update(OperatingHoursEntity)
+        .where(OperatingHoursEntity.id == operating_hours_data.future.id)
+        .values(start=time[NOW] + 10 * ONE_DAY, end=time[NOW] + 11 * ONE_DAY)
+    )
+    session.commit()
+
+    assert len(operating_hours_svc.schedule(week)) == len(operating_hours_data.all) - 1
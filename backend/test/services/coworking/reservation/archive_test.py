@@ -0,0 +1,96 @@
+"""ReservationService#archive_reservations tests"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .....entities.coworking import (
+    ReservationEntity,
+    reservation_archive_table,
+    reservation_seat_archive_table,
+    reservation_user_archive_table,
+)
+from .....services.coworking import ReservationService
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _live_ids(session: Session) -> set[int]:
+    return set(session.scalars(select(ReservationEntity.id)))
+
+
+def test_archive_reservations_before_end(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Nothing has ended before thirty minutes ago."""
+    assert reservation_svc.archive_reservations(time[THIRTY_MINUTES_AGO]) == 0
+    assert len(_live_ids(session)) == len(reservation_data.reservations)
+
+
+def test_archive_reservations_terminal_states(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Only cancelled and checked out reservations are archived, with their users and seats."""
+    archived = reservation_svc.archive_reservations(
+        time[IN_THIRTY_MINUTES] + ONE_MINUTE
+    )
+    terminal = {reservation_data.reservation_2.id, reservation_data.reservation_3.id}
+    assert archived == len(terminal)
+
+    session.expire_all()
+    assert _live_ids(session).isdisjoint(terminal)
+    assert reservation_data.reservation_1.id in _live_ids(session)
+
+    assert set(session.scalars(select(reservation_archive_table.c.id))) == terminal
+    users = session.execute(select(reservation_user_archive_table)).all()
+    assert {(row.reservation_id, row.user_id) for row in users} == {
+        (reservation.id, user.id)
+        for reservation in (
+            reservation_data.reservation_2,
+            reservation_data.reservation_3,
+        )
+        for user in reservation.users
+    }
+    seats = session.execute(select(reservation_seat_archive_table)).all()
+    assert {(row.reservation_id, row.seat_id) for row in seats} == {
+        (reservation.id, seat.id)
+        for reservation in (
+            reservation_data.reservation_2,
+            reservation_data.reservation_3,
+        )
+        for seat in reservation.seats
+    }
+
+
+def test_archive_reservations_in_batches(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    archived = reservation_svc.archive_reservations(
+        time[IN_THIRTY_MINUTES] + ONE_MINUTE, batch_size=1
+    )
+    assert archived == 2
+    assert len(_live_ids(session)) == len(reservation_data.reservations) - 2
@@ -0,0 +1,152 @@
+"""Load test of concurrent ReservationService#draft_reservation calls."""
+
+import threading
+from typing import Callable
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from .....entities import UserEntity
+from .....models import User
+from .....models.coworking import Reservation
+from .....models.user import UserIdentity
+from .....models.coworking.seat import SeatIdentity
+from .....services import PermissionService
+from .....services.coworking import (
+    OperatingHoursService,
+    PolicyService,
+    ReservationService,
+    SeatService,
+)
+from .....services.coworking.reservation import ReservationException
+
+from ..time import *
+
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+from .. import seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+STUDENTS = 12
+
+
+def _students(session: Session) -> list[User]:
+    students = [
+        User(
+            id=100 + i,
+            pid=700000000 + i,
+            onyen=f"walkin{i}",
+            email=f"walkin{i}@unc.edu",
+            first_name="Walk",
+            last_name=f"In {i}",
+            pronouns="They / Them",
+        )
+        for i in range(STUDENTS)
+    ]
+    session.add_all(UserEntity.from_model(student) for student in students)
+    session.commit()
+    return students
+
+
+def _draft(
+    test_engine: Engine,
+    student: User,
+    prepare: Callable[[ReservationService], None] = lambda _: None,
+) -> Reservation | ReservationException:
+    with Session(test_engine) as session:
+        reservation_svc = ReservationService(
+            session,
+            PermissionService(session),
+            PolicyService(),
+            OperatingHoursService(session),
+            SeatService(session),
+        )
+        prepare(reservation_svc)
+        request = reservation_data.test_request(
+            {
+                "start": datetime.now(),
+                "end": datetime.now() + 2 * ONE_HOUR,
+                "users": [UserIdentity(id=student.id)],
+                "seats": [SeatIdentity(id=seat.id) for seat in seat_data.seats],
+            }
+        )
+        try:
+            return reservation_svc.draft_reservation(student, request)
+        except ReservationException as e:
+            return e
+
+
+def test_concurrent_walkins_are_never_double_booked(
+    session: Session, test_engine: Engine
+):
+    students = _students(session)
+    barrier = threading.Barrier(STUDENTS)
+    results: list[Reservation | ReservationException] = []
+
+    def walk_in(student: User):
+        barrier.wait()
+        results.append(_draft(test_engine, student))
+
+    threads = [
+        threading.Thread(target=walk_in, args=(student,)) for student in students
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    drafts = [result for result in results if isinstance(result, Reservation)]
+    assert len(results) == STUDENTS
+    assert len(drafts) == len(seat_data.seats)
+
+    by_seat: dict[int, list[Reservation]] = {}
+    for draft in drafts:
+        by_seat.setdefault(draft.seats[0].id, []).append(draft)
+    for seat_drafts in by_seat.values():
+        seat_drafts.sort(key=lambda draft: draft.start)
+        for earlier, later in zip(seat_drafts, seat_drafts[1:]):
+            assert earlier.end <= later.start
+
+
+def test_concurrent_drafts_proceed_in_parallel(session: Session, test_engine: Engine):
+    """A draft holding the lock of its seat does not hold up drafts for other seats."""
+    first, second = _students(session)[:2]
+    claimed = threading.Event()
+    release = threading.Event()
+
+    def hold_seat_lock(reservation_svc: ReservationService):
+        claim_seat = reservation_svc._claim_seat
+
+        def claim_and_hold(*args):
+            seat_availability = claim_seat(*args)
+            claimed.set()
+            release.wait(10)
+            return seat_availability
+
+        reservation_svc._claim_seat = claim_and_hold
+
+    held: list[Reservation | ReservationException] = []
+    holder = threading.Thread(
+        target=lambda: held.append(_draft(test_engine, first, hold_seat_lock))
+    )
+    holder.start()
+    try:
+        assert claimed.wait(10)
+        draft = _draft(test_engine, second)
+        # The second draft completed while the first was still holding its seat lock.
+        assert len(held) == 0
+    finally:
+        release.set()
+        holder.join(30)
+
+    assert isinstance(draft, Reservation)
+    assert isinstance(held[0], Reservation)
+    assert draft.seats[0].id != held[0].seats[0].id
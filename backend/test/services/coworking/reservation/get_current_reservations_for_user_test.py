@@ -1,8 +1,19 @@
 """ReservationService#get_current_reservations_for_user tests."""
 
+import asyncio
 from unittest.mock import create_autospec
 
-from .....services.coworking import ReservationService
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from .....entities import UserEntity
+from .....entities.coworking import ReservationEntity
+from .....models.coworking import ReservationState
+from .....services.coworking import (
+    AsyncReservationService,
+    PolicyService,
+    ReservationService,
+)
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -26,6 +37,7 @@ from .reservation_data import fake_data_fixture as insert_order_4
 
 # Import the fake model data in a namespace for test assertions
 from ...core_data import user_data
+from .. import room_data
 from .. import seat_data
 from . import reservation_data
 
@@ -66,3 +78,78 @@ def test_get_current_reservations_for_user_permissions(
         "coworking.reservation.read",
         f"user/{user_data.user.id}",
     )
+
+
+def test_get_current_reservations_for_user_async(
+    reservation_svc: ReservationService, async_session: async_sessionmaker
+):
+    """The asynchronous read finds the same reservations as the synchronous one."""
+
+    async def read(focus):
+        async with async_session() as session:
+            async_reservation_svc = AsyncReservationService(session, PolicyService())
+            return await async_reservation_svc.get_current_reservations_for_user(
+                focus, focus
+            )
+
+    for focus in (user_data.user, user_data.ambassador, user_data.root):
+        assert asyncio.run(
+            read(focus)
+        ) == reservation_svc.get_current_reservations_for_user(focus, focus)
+
+
+def test_get_current_reservations_for_user_async_permissions(
+    reservation_svc: ReservationService, async_session: async_sessionmaker
+):
+    permission_svc = create_autospec(reservation_svc._permission_svc)
+
+    async def read():
+        async with async_session() as session:
+            async_reservation_svc = AsyncReservationService(session, PolicyService())
+            async_reservation_svc._reservation_svc._permission_svc = permission_svc
+            return await async_reservation_svc.get_current_reservations_for_user(
+                user_data.root, user_data.user
+            )
+
+    assert len(asyncio.run(read())) == 2
+    permission_svc.enforce.assert_called_with(
+        user_data.root,
+        "coworking.reservation.read",
+        f"user/{user_data.user.id}",
+    )
+
+
+def test_get_current_reservations_for_user_async_room(
+    session: Session,
+    reservation_svc: ReservationService,
+    async_session: async_sessionmaker,
+    time: dict[str, datetime],
+):
+    """Rooms of room reservations are loaded eagerly, as the asynchronous read cannot lazily."""
+    session.add(
+        ReservationEntity(
+            start=time[NOW] + ONE_HOUR,
+            end=time[NOW] + 2 * ONE_HOUR,
+            state=ReservationState.CONFIRMED,
+            walkin=False,
+            room_id=room_data.group_a.id,
+            users=[session.get(UserEntity, user_data.root.id)],
+            seats=[],
+        )
+    )
+    session.commit()
+
+    async def read():
+        async with async_session() as session:
+            async_reservation_svc = AsyncReservationService(session, PolicyService())
+            return await async_reservation_svc.get_current_reservations_for_user(
+                user_data.root, user_data.root
+            )
+
+    reservations = asyncio.run(read())
+    assert room_data.group_a.id in [
+        reservation.room.id for reservation in reservations if reservation.room
+    ]
+    assert reservations == reservation_svc.get_current_reservations_for_user(
+        user_data.root, user_data.root
+    )
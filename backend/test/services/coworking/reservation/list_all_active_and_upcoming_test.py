@@ -1,8 +1,10 @@
 """ReservationService#list_all_active_and_upcoming tests."""
 
+import pytest
 from unittest.mock import create_autospec
 
-from .....services import PermissionService
+from .....models.pagination import KeysetPaginationParams
+from .....services import PermissionService, UserPermissionException
 from .....services.coworking import ReservationService
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
@@ -52,3 +54,47 @@ def test_list_all_active_and_upcoming_permission(reservation_svc: ReservationSer
         "coworking.reservation.read",
         f"user/*",
     )
+
+
+def test_list_all_active_and_upcoming_page_walks_all(
+    reservation_svc: ReservationService,
+):
+    expected = reservation_svc.list_all_active_and_upcoming(user_data.ambassador)
+    seen = []
+    params = KeysetPaginationParams(page_size=1)
+    while True:
+        page = reservation_svc.list_all_active_and_upcoming_page(
+            user_data.ambassador, params
+        )
+        assert len(page.items) <= 1
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        params = KeysetPaginationParams(cursor=page.next_cursor, page_size=1)
+    assert [reservation.id for reservation in seen] == [
+        reservation.id for reservation in expected
+    ]
+
+
+def test_list_all_active_and_upcoming_page_invalid_cursor(
+    reservation_svc: ReservationService,
+):
+    with pytest.raises(ValueError):
+        reservation_svc.list_all_active_and_upcoming_page(
+            user_data.ambassador, KeysetPaginationParams(cursor="not-a-cursor")
+        )
+
+
+def test_stream_all_active_and_upcoming(reservation_svc: ReservationService):
+    expected = reservation_svc.list_all_active_and_upcoming(user_data.ambassador)
+    streamed = reservation_svc.stream_all_active_and_upcoming(
+        user_data.ambassador, page_size=1
+    )
+    assert list(streamed) == expected
+
+
+def test_stream_all_active_and_upcoming_enforces_before_reading(
+    reservation_svc: ReservationService,
+):
+    with pytest.raises(UserPermissionException):
+        reservation_svc.stream_all_active_and_upcoming(user_data.user)
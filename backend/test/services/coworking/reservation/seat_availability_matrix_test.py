@@ -0,0 +1,124 @@
+"""Tests that the NumPy seat availability engine matches the interval engine."""
+
+import random
+import pytest
+
+from .....services.coworking import ReservationService
+from .....services.coworking import reservation as reservation_module
+from .....services.coworking import availability_matrix
+from .....models.coworking import (
+    OperatingHours,
+    Reservation,
+    ReservationState,
+    SeatAvailability,
+    TimeRange,
+)
+
+from ..fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from ..time import *
+
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+from .. import seat_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@pytest.fixture(autouse=True)
+def no_entropy(monkeypatch: pytest.MonkeyPatch):
+    """Both engines break ties stably in seat order once the random tie-breaker is constant."""
+    monkeypatch.setattr(reservation_module, "random", lambda: 0.0)
+    monkeypatch.setattr(availability_matrix, "random", lambda: 0.0)
+
+
+def _both_engines(
+    monkeypatch: pytest.MonkeyPatch,
+    reservation_svc: ReservationService,
+    bounds: TimeRange,
+) -> tuple[list[SeatAvailability], list[SeatAvailability]]:
+    results = []
+    for engine in ("interval", "numpy"):
+        monkeypatch.setattr(reservation_module, "AVAILABILITY_ENGINE", engine)
+        results.append(
+            reservation_svc.seat_availability(seat_data.seats, bounds.model_copy())
+        )
+    return results[0], results[1]
+
+
+@pytest.mark.parametrize(
+    "offset, length",
+    [
+        (ONE_MINUTE, THIRTY_MINUTES),
+        (ONE_MINUTE, 3 * ONE_HOUR),
+        (ONE_HOUR, ONE_HOUR),
+        (ONE_MINUTE, 3 * ONE_DAY),
+    ],
+)
+def test_matrix_engine_matches_fixture_data(
+    reservation_svc: ReservationService,
+    monkeypatch: pytest.MonkeyPatch,
+    time: dict[str, datetime],
+    offset: timedelta,
+    length: timedelta,
+):
+    # Bounds start in the future so that neither engine moves the start up to its own now.
+    bounds = TimeRange(start=time[NOW] + offset, end=time[NOW] + offset + length)
+    expected, actual = _both_engines(monkeypatch, reservation_svc, bounds)
+    assert actual == expected
+
+
+def test_matrix_engine_matches_random_reservations(
+    reservation_svc: ReservationService,
+    monkeypatch: pytest.MonkeyPatch,
+    time: dict[str, datetime],
+):
+    rng = random.Random(1)
+    open_from = time[NOW] + ONE_MINUTE
+    # Abutting operating hours are kept as separate ranges by both engines.
+    open_hours = [
+        OperatingHours(id=1, start=open_from, end=open_from + 2 * ONE_HOUR),
+        OperatingHours(
+            id=2, start=open_from + 2 * ONE_HOUR, end=open_from + 4 * ONE_HOUR
+        ),
+        OperatingHours(
+            id=3, start=open_from + 5 * ONE_HOUR, end=open_from + 8 * ONE_HOUR
+        ),
+    ]
+    monkeypatch.setattr(
+        reservation_svc._operating_hours_svc, "schedule", lambda _: open_hours
+    )
+
+    for _ in range(25):
+        reservations = []
+        for id in range(rng.randrange(0, 30)):
+            start = open_from + timedelta(seconds=rng.randrange(-3600, 9 * 3600))
+            reservations.append(
+                Reservation(
+                    id=id,
+                    start=start,
+                    end=start + timedelta(seconds=rng.randrange(60, 3 * 3600)),
+                    state=ReservationState.CONFIRMED,
+                    seats=rng.sample(seat_data.seats, rng.randrange(1, 3)),
+                    created_at=time[NOW],
+                    updated_at=time[NOW],
+                )
+            )
+        monkeypatch.setattr(
+            reservation_svc, "get_seat_reservations", lambda *_: reservations
+        )
+
+        bounds = TimeRange(start=open_from, end=open_from + 10 * ONE_HOUR)
+        expected, actual = _both_engines(monkeypatch, reservation_svc, bounds)
+        assert actual == expected
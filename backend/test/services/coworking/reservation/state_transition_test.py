@@ -1,4 +1,4 @@
-"""ReservationService#_state_transition tests"""
+"""ReservationService#sweep_state_transitions tests"""
 
 import pytest
 from unittest.mock import create_autospec
@@ -50,105 +50,105 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
-def test_state_transition_reservation_entities_by_time_noop(
+def _state(session: Session, reservation: Reservation) -> ReservationState:
+    return session.get(ReservationEntity, reservation.id, populate_existing=True).state
+
+
+def test_sweep_state_transitions_noop(
     session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.active_reservations
-    ]
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        time[NOW], entities
-    )
-    assert collected is not entities
-    assert collected == entities
+    assert reservation_svc.sweep_state_transitions(time[NOW]) == 0
+    for reservation in reservation_data.reservations:
+        assert _state(session, reservation) == reservation.state
 
 
-def test_state_transition_reservation_entities_by_time_expired_active(
+def test_sweep_state_transitions_expired_active(
     session: Session, reservation_svc: ReservationService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.active_reservations
-    ]
-    cutoff = entities[0].end
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
+    cutoff = reservation_data.reservation_1.end
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert (
+        _state(session, reservation_data.reservation_1) == ReservationState.CHECKED_OUT
     )
 
-    assert len(collected) == len(entities) - 1
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CHECKED_OUT
 
-
-def test_state_transition_reservation_entities_by_time_active_draft(
+def test_sweep_state_transitions_active_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.draft_reservations
-    ]
-    cutoff = entities[0].created_at + policy_svc.reservation_draft_timeout()
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
+    cutoff = (
+        reservation_data.reservation_5.created_at
+        + policy_svc.reservation_draft_timeout()
     )
-    assert len(collected) == len(entities)
-    assert collected[0].state == ReservationState.DRAFT
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, reservation_data.reservation_5) == ReservationState.DRAFT
 
 
-def test_state_transition_reservation_entities_by_time_expired_draft(
+def test_sweep_state_transitions_expired_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
     policy_mock.reservation_draft_timeout.return_value = (
         policy_svc.reservation_draft_timeout()
     )
+    policy_mock.reservation_checkin_timeout.return_value = (
+        policy_svc.reservation_checkin_timeout()
+    )
     reservation_svc._policy_svc = policy_mock
 
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.draft_reservations
-    ]
     cutoff = (
-        entities[0].created_at
+        reservation_data.reservation_5.created_at
         + policy_svc.reservation_draft_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-    assert len(collected) == len(entities) - 1
-
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, reservation_data.reservation_5) == ReservationState.CANCELLED
 
     policy_mock.reservation_draft_timeout.assert_called_once()
 
 
-def test_state_transition_reservation_entities_by_time_checkin_timeout(
+def test_sweep_state_transitions_checkin_timeout(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
+    policy_mock.reservation_draft_timeout.return_value = (
+        policy_svc.reservation_draft_timeout()
+    )
     policy_mock.reservation_checkin_timeout.return_value = (
         policy_svc.reservation_checkin_timeout()
     )
     reservation_svc._policy_svc = policy_mock
 
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.confirmed_reservations
-    ]
     cutoff = (
-        entities[0].start
+        reservation_data.reservation_4.start
         + policy_svc.reservation_checkin_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-    assert len(collected) == len(entities) - 1
-
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
+    reservation_svc.sweep_state_transitions(cutoff)
+    assert _state(session, reservation_data.reservation_4) == ReservationState.CANCELLED
 
     policy_mock.reservation_checkin_timeout.assert_called_once()
+
+
+def test_reads_exclude_reservations_due_a_transition_without_writing(
+    session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
+):
+    entity = session.get(ReservationEntity, reservation_data.reservation_5.id)
+    entity.created_at -= policy_svc.reservation_draft_timeout() + timedelta(seconds=1)
+    session.commit()
+
+    reservations = reservation_svc.get_seat_reservations(
+        [seat_data.reservable_seats[0]],
+        TimeRange(
+            start=operating_hours_data.tomorrow.start,
+            end=operating_hours_data.tomorrow.end,
+        ),
+    )
+    assert reservation_data.reservation_5.id not in [r.id for r in reservations]
+    assert reservation_svc.get_current_reservations_for_user(
+        user_data.user, user_data.user
+    ) == [reservation_data.reservation_1]
+
+    # The draft is only cancelled once the sweeper runs.
+    assert _state(session, reservation_data.reservation_5) == ReservationState.DRAFT
+    assert reservation_svc.sweep_state_transitions() == 1
+    assert _state(session, reservation_data.reservation_5) == ReservationState.CANCELLED
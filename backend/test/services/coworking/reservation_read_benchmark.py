@@ -0,0 +1,148 @@
+"""Benchmark for reading a day of reservations into models.
+
+This module is not collected with the rest of the suite; run it explicitly with:
+
+    pytest backend/test/services/coworking/reservation_read_benchmark.py
+
+A day is seeded with team reservations of two users at two seats each. The reservations are read
+both with the service's loader options and with the joined eager loading they replaced, reporting
+the rows fetched from the database and the latency of each.
+"""
+
+import random
+import time as timer
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.orm import Session, joinedload
+
+from ....entities.coworking import OperatingHoursEntity, ReservationEntity, SeatEntity
+from ....entities import UserEntity
+from ....models.coworking import ReservationState, TimeRange
+from ....services.coworking import ReservationService
+
+from .fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from .time import *
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .room_data import fake_data_fixture as insert_order_1
+from ..core_data import user_data
+from . import room_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+SEATS = 60
+RESERVATIONS = 500
+ROUNDS = 10
+
+
+@pytest.fixture(autouse=True)
+def insert_order_2(session: Session, time: dict[str, datetime]):
+    """Seed a day of reservations, each for two users at two seats."""
+    rng = random.Random(2023)
+    session.add(OperatingHoursEntity(id=1, start=time[AN_HOUR_AGO], end=time[TOMORROW]))
+    users = [session.get(UserEntity, user.id) for user in user_data.users]
+    seats = [
+        SeatEntity(
+            id=i + 1,
+            title=f"Seat {i:03}",
+            shorthand=f"S{i:03}",
+            reservable=True,
+            has_monitor=True,
+            sit_stand=False,
+            x=i % 10,
+            y=i // 10,
+            room_id=room_data.the_xl.id,
+        )
+        for i in range(SEATS)
+    ]
+    session.add_all(seats)
+
+    for _ in range(RESERVATIONS):
+        start = time[NOW] + timedelta(minutes=rng.randrange(0, 20 * 60, 5))
+        session.add(
+            ReservationEntity(
+                start=start,
+                end=start + timedelta(minutes=rng.choice([30, 60, 120])),
+                state=ReservationState.CONFIRMED,
+                walkin=False,
+                users=rng.sample(users, 2),
+                seats=rng.sample(seats, 2),
+            )
+        )
+    session.commit()
+
+
+def _measure(session: Session, read) -> tuple[int, float]:
+    """The rows fetched by read and its best latency in seconds."""
+    rows = 0
+
+    def count_rows(conn, cursor, statement, parameters, context, executemany):
+        nonlocal rows
+        rows += max(cursor.rowcount, 0)
+
+    read()  # Warm up
+    event.listen(session.get_bind(), "after_cursor_execute", count_rows)
+    try:
+        session.expunge_all()
+        read()
+    finally:
+        event.remove(session.get_bind(), "after_cursor_execute", count_rows)
+
+    best = float("inf")
+    for _ in range(ROUNDS):
+        session.expunge_all()
+        start = timer.perf_counter()
+        read()
+        best = min(best, timer.perf_counter() - start)
+    return rows, best
+
+
+def test_benchmark_reservation_reads(
+    session: Session,
+    reservation_svc: ReservationService,
+    time: dict[str, datetime],
+    capsys: pytest.CaptureFixture[str],
+):
+    day = TimeRange(start=time[NOW], end=time[TOMORROW])
+    seats = reservation_svc._seat_svc.list()
+
+    def selectin():
+        return reservation_svc.get_seat_reservations(seats, day)
+
+    def joined():
+        # The reservation read before collections were loaded with selectinload.
+        reservations = (
+            session.query(ReservationEntity)
+            .join(ReservationEntity.seats)
+            .filter(
+                ReservationEntity.time_range.overlaps(
+                    Range(day.start, day.end, bounds="[)")
+                ),
+                SeatEntity.id.in_([seat.id for seat in seats]),
+            )
+            .options(
+                joinedload(ReservationEntity.seats), joinedload(ReservationEntity.users)
+            )
+            .all()
+        )
+        return [reservation.to_model() for reservation in reservations]
+
+    assert len(selectin()) == len(joined()) == RESERVATIONS
+
+    with capsys.disabled():
+        for label, read in (("selectinload", selectin), ("joinedload", joined)):
+            rows, seconds = _measure(session, read)
+            print(
+                f"\nget_seat_reservations, {RESERVATIONS} reservations, {label}: "
+                f"{rows} rows, {seconds * 1000:.2f} ms"
+            )
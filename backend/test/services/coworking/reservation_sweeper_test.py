@@ -0,0 +1,31 @@
+"""Tests for the background reservation sweeper loop."""
+
+import asyncio
+import pytest
+
+from ....services.coworking import reservation_sweeper
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def test_sweeper_keeps_running_after_a_failed_sweep(monkeypatch: pytest.MonkeyPatch):
+    sweeps: list[int] = []
+
+    def sweep() -> int:
+        sweeps.append(len(sweeps))
+        if len(sweeps) == 1:
+            raise ConnectionError("database unavailable")
+        return 0
+
+    monkeypatch.setattr(reservation_sweeper, "sweep_reservations", sweep)
+
+    async def scenario():
+        task = asyncio.create_task(reservation_sweeper.run_reservation_sweeper(0.01))
+        while len(sweeps) < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert len(sweeps) >= 3
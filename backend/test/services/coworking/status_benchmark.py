@@ -0,0 +1,141 @@
+"""Benchmark for the seat availability computation behind GET /api/coworking/status.
+
+This module is not collected with the rest of the suite; run it explicitly with:
+
+    pytest backend/test/services/coworking/status_benchmark.py
+
+Every seat in a busy XL is seeded with a day of short, randomly placed reservations and the
+availability search is timed both end to end (including the reservation query) and with the
+reservations already loaded, which isolates the in-memory availability engine.
+"""
+
+import random
+import time as timer
+from datetime import datetime, timedelta
+from typing import Callable
+
+import pytest
+from sqlalchemy.orm import Session
+
+from ....entities.coworking import OperatingHoursEntity, ReservationEntity, SeatEntity
+from ....entities import UserEntity
+from ....models.coworking import ReservationState, TimeRange
+from ....services.coworking import ReservationService, StatusService
+
+from .fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from .time import *
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .room_data import fake_data_fixture as insert_order_1
+from ..core_data import user_data
+from . import room_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+SEATS = 250
+RESERVATIONS_PER_SEAT = 12
+ROUNDS = 20
+
+
+@pytest.fixture(autouse=True)
+def insert_order_2(session: Session, time: dict[str, datetime]):
+    """Seed seats that are each reserved many times over the next day."""
+    rng = random.Random(2023)
+    session.add(OperatingHoursEntity(id=1, start=time[AN_HOUR_AGO], end=time[TOMORROW]))
+    users = [session.get(UserEntity, user.id) for user in user_data.users]
+
+    seats = []
+    for i in range(SEATS):
+        seat = SeatEntity(
+            id=i + 1,
+            title=f"Seat {i:03}",
+            shorthand=f"S{i:03}",
+            reservable=i % 5 == 0,
+            has_monitor=True,
+            sit_stand=False,
+            x=i % 25,
+            y=i // 25,
+            room_id=room_data.the_xl.id,
+        )
+        session.add(seat)
+        seats.append(seat)
+
+    for seat in seats:
+        for _ in range(RESERVATIONS_PER_SEAT):
+            start = time[NOW] + timedelta(minutes=rng.randrange(0, 20 * 60, 5))
+            session.add(
+                ReservationEntity(
+                    start=start,
+                    end=start + timedelta(minutes=rng.choice([15, 30, 60, 120])),
+                    state=ReservationState.CONFIRMED,
+                    walkin=False,
+                    users=[rng.choice(users)],
+                    seats=[seat],
+                )
+            )
+    session.commit()
+
+
+def _best_of(fn: Callable[[], object], rounds: int = ROUNDS) -> float:
+    fn()  # Warm up
+    best = float("inf")
+    for _ in range(rounds):
+        start = timer.perf_counter()
+        fn()
+        best = min(best, timer.perf_counter() - start)
+    return best
+
+
+def _report(label: str, seconds: float) -> None:
+    print(f"\n{label}: {seconds * 1000:.2f} ms")
+
+
+def test_benchmark_coworking_status(
+    reservation_svc: ReservationService, capsys: pytest.CaptureFixture[str]
+):
+    status_svc = StatusService(
+        reservation_svc._policy_svc,
+        reservation_svc._operating_hours_svc,
+        reservation_svc._seat_svc,
+        reservation_svc,
+    )
+    seconds = _best_of(lambda: status_svc.get_coworking_status(user_data.user))
+    with capsys.disabled():
+        _report("get_coworking_status", seconds)
+
+
+def test_benchmark_seat_availability(
+    reservation_svc: ReservationService, capsys: pytest.CaptureFixture[str]
+):
+    seats = reservation_svc._seat_svc.list()
+
+    def day_of_availability():
+        now = datetime.now()
+        return reservation_svc.seat_availability(
+            seats, TimeRange(start=now, end=now + timedelta(hours=20))
+        )
+
+    assert len(day_of_availability()) > 0
+    end_to_end = _best_of(day_of_availability)
+
+    # Serve the reservations from memory to time the availability engine on its own.
+    now = datetime.now()
+    reservations = reservation_svc.get_seat_reservations(
+        seats, TimeRange(start=now - ONE_HOUR, end=now + ONE_DAY)
+    )
+    reservation_svc.get_seat_reservations = lambda *_: reservations
+    in_memory = _best_of(day_of_availability)
+
+    with capsys.disabled():
+        _report(
+            f"seat_availability, {SEATS} seats x {RESERVATIONS_PER_SEAT} reservations",
+            end_to_end,
+        )
+        _report("seat_availability, reservations preloaded", in_memory)
@@ -1,7 +1,27 @@
 """Test coworking StatusService"""
 
-from .fixtures import status_svc
-from ....services.coworking.status import StatusService
+import asyncio
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .fixtures import (
+    status_svc,
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from ....services.coworking import (
+    AsyncReservationService,
+    OperatingHoursService,
+    PolicyService,
+    ReservationService,
+    SeatService,
+)
+from ....services.coworking.status import AsyncStatusService, StatusService
 from ....models.coworking.availability import SeatAvailability
 from datetime import timedelta
 
@@ -59,3 +79,52 @@ def test_status_dispatch(status_svc: StatusService):
     assert status.my_reservations == [reservation_data.reservation_1]
     assert status.seat_availability == seat_availability
     assert status.operating_hours == [operating_hours_data.today]
+
+
+def test_async_status_is_served_on_the_event_loop(
+    reservation_svc: ReservationService,
+    operating_hours_svc: OperatingHoursService,
+    seat_svc: SeatService,
+    async_session: async_sessionmaker,
+):
+    """Once the snapshot and catalog are warm, the async status only reads the subject's
+    reservations, and every statement is awaited on the event loop's thread."""
+    threads: set[int] = set()
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        threads.add(threading.get_ident())
+        statements.append(statement)
+
+    event.listen(async_session.kw["bind"].sync_engine, "before_cursor_execute", record)
+
+    async def status():
+        async with async_session() as session:
+            return await AsyncStatusService(
+                session, PolicyService()
+            ).get_coworking_status(user_data.user)
+
+    async def reservations():
+        async with async_session() as session:
+            return await AsyncReservationService(
+                session, PolicyService()
+            ).get_current_reservations_for_user(user_data.user, user_data.user)
+
+    asyncio.run(status())
+    statements.clear()
+    status = asyncio.run(status())
+    warm_statements = list(statements)
+    statements.clear()
+    asyncio.run(reservations())
+
+    assert len(warm_statements) == len(statements)
+    assert threads == {threading.get_ident()}
+
+    expected = StatusService(
+        PolicyService(), operating_hours_svc, seat_svc, reservation_svc
+    ).get_coworking_status(user_data.user)
+    assert status.my_reservations == expected.my_reservations
+    assert status.operating_hours == expected.operating_hours
+    assert sorted(seat.id for seat in status.seat_availability) == sorted(
+        seat.id for seat in expected.seat_availability
+    )
@@ -1,20 +1,47 @@
 # Import necessary libraries and fixtures
+import asyncio
 import pytest
+from unittest.mock import create_autospec
 from backend.models.user import User
+from backend.models.pagination import KeysetPaginationParams
 from backend.services.exceptions import (
     ResourceNotFoundException,
     UserPermissionException,
 )
-from backend.services.friendship import FriendshipService
+from backend.services.friendship import (
+    AsyncFriendshipService,
+    FriendshipService,
+    received_request_counts,
+)
+from backend.services.presence import presence_hub
+from backend.services.permission import PermissionService
+from backend.services.coworking import (
+    ReservationService,
+    PolicyService,
+    OperatingHoursService,
+    SeatService,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from backend.entities.friendship_entity import FriendshipEntity
 from backend.entities.user_entity import UserEntity
+from backend.entities.friend_adjacency_entity import FriendAdjacencyEntity
+from backend.entities.friend_suggestion_entity import FriendSuggestionEntity
 
 from backend.test.services.friendship.friendship_test_data import mock_friend_request
 
 from backend.test.services.user_data import user, root, ambassador
 
 
+@pytest.fixture(autouse=True)
+def clear_request_counts():
+    # The counter cache outlives the per-test database, so start each test empty
+    received_request_counts.flushall()
+    yield
+    received_request_counts.flushall()
+
+
 @pytest.fixture
 def prepared_session(session: Session):
     # Insert the predefined users into the database
@@ -44,6 +71,30 @@ def test_create_duplicate_friend_request(prepared_session: Session):
     assert "A friend request already exists between these users" in str(exc_info.value)
 
 
+def test_create_reverse_duplicate_friend_request(prepared_session: Session):
+    service = FriendshipService(session=prepared_session)
+    service.create_friend_request(root.pid, user.pid)
+
+    # A request in the opposite direction is the same unordered pair
+    with pytest.raises(Exception) as exc_info:
+        service.create_friend_request(user.pid, root.pid)
+    assert "A friend request already exists between these users" in str(exc_info.value)
+    assert prepared_session.query(FriendshipEntity).count() == 1
+
+
+def test_friendship_pair_is_unique(prepared_session: Session):
+    prepared_session.add(
+        FriendshipEntity(sender=root.pid, receiver=user.pid, status="requested")
+    )
+    prepared_session.commit()
+
+    prepared_session.add(
+        FriendshipEntity(sender=user.pid, receiver=root.pid, status="requested")
+    )
+    with pytest.raises(IntegrityError):
+        prepared_session.commit()
+
+
 def test_create_friend_request(prepared_session: Session):
     # Ensure user PIDs exist in the database
     assert (
@@ -83,6 +134,69 @@ def test_list_eligible_users(prepared_session: Session):  # Updated parameter na
     assert any(user.id == root.id for user in eligible_users)
 
 
+@pytest.fixture
+def many_users_session(prepared_session: Session):
+    for i in range(7):
+        prepared_session.add(
+            UserEntity(
+                id=10 + i,
+                pid=100 + i,
+                onyen=f"student{i}",
+                email=f"student{i}@unc.edu",
+                first_name=f"First{i % 2}",
+                last_name=f"Last{i // 2}",
+            )
+        )
+    prepared_session.commit()
+    return prepared_session
+
+
+def test_list_eligible_users_page_walks_all_users(many_users_session: Session):
+    service = FriendshipService(many_users_session)
+    service.create_friend_request(user.pid, 103)
+
+    seen = []
+    params = KeysetPaginationParams(page_size=3)
+    while True:
+        page = service.list_eligible_users_page(user.pid, params)
+        assert len(page.items) <= 3
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        params = KeysetPaginationParams(cursor=page.next_cursor, page_size=3)
+
+    expected = sorted(
+        service.list_eligible_users(user.pid),
+        key=lambda u: (u.last_name, u.first_name, u.pid),
+    )
+    assert [u.pid for u in seen] == [u.pid for u in expected]
+    assert 103 not in [u.pid for u in seen]
+    assert user.pid not in [u.pid for u in seen]
+
+
+def test_list_eligible_users_page_filter(many_users_session: Session):
+    service = FriendshipService(many_users_session)
+
+    page = service.list_eligible_users_page(
+        user.pid, KeysetPaginationParams(page_size=10, filter="last1")
+    )
+    assert [u.pid for u in page.items] == [102, 103]
+    assert page.next_cursor is None
+
+    page = service.list_eligible_users_page(
+        user.pid, KeysetPaginationParams(page_size=10, filter="%")
+    )
+    assert page.items == []
+
+
+def test_list_eligible_users_page_invalid_cursor(prepared_session: Session):
+    service = FriendshipService(prepared_session)
+    with pytest.raises(ValueError):
+        service.list_eligible_users_page(
+            user.pid, KeysetPaginationParams(cursor="not-a-cursor")
+        )
+
+
 def test_list_all_users(prepared_session: Session):
     service = FriendshipService(session=prepared_session)
 
@@ -283,3 +397,307 @@ def test_get_friends_identifies_sender_as_friend(prepared_session: Session):
     assert (
         friends[0].pid == root.pid
     )  # Check if root (the sender) is identified as a friend
+
+
+def test_accept_friend_request_links_both_directions(
+    prepared_session: Session, mock_friend_request: FriendshipEntity
+):
+    service = FriendshipService(session=prepared_session)
+    service.accept_request(root.pid, user.pid)
+
+    pairs = {
+        (row.user_pid, row.friend_pid)
+        for row in prepared_session.query(FriendAdjacencyEntity).all()
+    }
+    assert pairs == {(root.pid, user.pid), (user.pid, root.pid)}
+    assert [friend.pid for friend in service.get_friends(root.pid)] == [user.pid]
+    assert [friend.pid for friend in service.get_friends(user.pid)] == [root.pid]
+
+
+def test_pending_friend_request_is_not_a_friend(
+    prepared_session: Session, mock_friend_request: FriendshipEntity
+):
+    service = FriendshipService(session=prepared_session)
+    assert service.get_friends(user.pid) == []
+    assert prepared_session.query(FriendAdjacencyEntity).count() == 0
+
+
+def test_unfriend_removes_adjacency(
+    prepared_session: Session, mock_friend_request: FriendshipEntity
+):
+    service = FriendshipService(session=prepared_session)
+    service.accept_request(root.pid, user.pid)
+
+    mock_friend_request.status = "rejected"
+    prepared_session.commit()
+    assert service.get_friends(user.pid) == []
+
+    mock_friend_request.status = "accepted"
+    prepared_session.commit()
+    assert len(service.get_friends(user.pid)) == 1
+
+    prepared_session.delete(mock_friend_request)
+    prepared_session.commit()
+    assert service.get_friends(root.pid) == []
+    assert prepared_session.query(FriendAdjacencyEntity).count() == 0
+
+
+def test_received_requests_count_is_cached(
+    prepared_session: Session, mock_friend_request: FriendshipEntity
+):
+    service = FriendshipService(session=prepared_session)
+    assert service.get_received_requests_count(user.pid) == 1
+
+    # A change made behind the service's back is not seen until the entry expires
+    prepared_session.delete(mock_friend_request)
+    prepared_session.commit()
+    assert service.get_received_requests_count(user.pid) == 1
+
+
+def test_received_requests_count_tracks_requests(prepared_session: Session):
+    service = FriendshipService(session=prepared_session)
+    assert service.get_received_requests_count(user.pid) == 0
+
+    service.create_friend_request(root.pid, user.pid)
+    assert received_request_counts.get(user.pid) == 1
+
+    service.accept_request(root.pid, user.pid)
+    assert received_request_counts.get(user.pid) == 0
+
+    # Accepting again does not decrement a request that is no longer pending
+    service.accept_request(root.pid, user.pid)
+    assert service.get_received_requests_count(user.pid) == 0
+
+
+def test_received_requests_count_tracks_rejection(
+    prepared_session: Session, mock_friend_request: FriendshipEntity
+):
+    service = FriendshipService(session=prepared_session)
+    assert service.get_received_requests_count(user.pid) == 1
+    service.reject_request(root.pid, user.pid)
+    assert service.get_received_requests_count(user.pid) == 0
+
+
+def test_coworking_status_change_is_published_to_friends(
+    prepared_session: Session, mock_friend_request: FriendshipEntity
+):
+    FriendshipService(session=prepared_session).accept_request(root.pid, user.pid)
+    reservation_service = ReservationService(
+        prepared_session,
+        create_autospec(PermissionService),
+        create_autospec(PolicyService),
+        create_autospec(OperatingHoursService),
+        create_autospec(SeatService),
+    )
+
+    async def scenario():
+        friend = presence_hub.subscribe(user.pid)
+        stranger = presence_hub.subscribe(ambassador.pid)
+        try:
+            reservation_service.update_coworking_status(root.pid, True)
+            message = await asyncio.wait_for(friend.get(), 1)
+            assert message["friend_pid"] == root.pid
+            assert message["is_coworking"] is True
+
+            # Setting the same status again is not a change
+            reservation_service.update_coworking_status(root.pid, True)
+            await asyncio.sleep(0)
+            assert friend._queue.empty()
+            assert stranger._queue.empty()
+        finally:
+            presence_hub.unsubscribe(friend)
+            presence_hub.unsubscribe(stranger)
+
+    asyncio.run(scenario())
+
+
+def test_create_friend_requests(many_users_session: Session):
+    service = FriendshipService(session=many_users_session)
+    service.create_friend_request(102, user.pid)
+    assert service.get_received_requests_count(100) == 0
+
+    results = service.create_friend_requests(
+        user.pid, [100, 101, 101, 102, user.pid, 42]
+    )
+
+    assert [(r.pid, r.success) for r in results] == [
+        (100, True),
+        (101, True),
+        (102, False),
+        (user.pid, False),
+        (42, False),
+    ]
+    assert results[3].message == "Cannot send friend request to yourself."
+    assert (
+        many_users_session.query(FriendshipEntity).filter_by(sender=user.pid).count()
+        == 2
+    )
+    assert service.get_received_requests_count(100) == 1
+
+
+def test_accept_all_friend_requests(many_users_session: Session):
+    service = FriendshipService(session=many_users_session)
+    for pid in (100, 101, 102):
+        service.create_friend_request(pid, user.pid)
+    service.create_friend_request(user.pid, 103)
+    assert service.get_received_requests_count(user.pid) == 3
+
+    results = service.accept_requests(user.pid)
+
+    assert sorted(r.pid for r in results) == [100, 101, 102]
+    assert all(r.success for r in results)
+    assert sorted(f.pid for f in service.get_friends(user.pid)) == [100, 101, 102]
+    assert [f.pid for f in service.get_friends(101)] == [user.pid]
+    assert service.get_received_requests_count(user.pid) == 0
+    # The request sent by the user is not theirs to accept
+    assert service.get_received_requests_count(103) == 1
+
+
+def test_accept_some_friend_requests(many_users_session: Session):
+    service = FriendshipService(session=many_users_session)
+    for pid in (100, 101):
+        service.create_friend_request(pid, user.pid)
+
+    results = service.accept_requests(user.pid, [101, 105])
+
+    assert [(r.pid, r.success) for r in results] == [(101, True), (105, False)]
+    assert results[1].message == "Friend request not found."
+    assert [f.pid for f in service.get_friends(user.pid)] == [101]
+
+
+def test_reject_many_friend_requests(many_users_session: Session):
+    service = FriendshipService(session=many_users_session)
+    for pid in (100, 101, 102):
+        service.create_friend_request(pid, user.pid)
+    assert service.get_received_requests_count(user.pid) == 3
+
+    results = service.reject_requests(user.pid, [100, 102])
+
+    assert all(r.success for r in results)
+    assert [u.pid for u in service.get_received_requests(user.pid)] == [101]
+    assert service.get_received_requests_count(user.pid) == 1
+    assert service.get_friends(user.pid) == []
+    assert service.reject_requests(user.pid, []) == []
+
+
+@pytest.fixture
+def friend_graph_session(many_users_session: Session):
+    """user is friends with 100, 101 and 102; those friends know 103, 104 and 105."""
+    edges = [
+        (user.pid, 100),
+        (user.pid, 101),
+        (user.pid, 102),
+        (100, 103),
+        (101, 103),
+        (102, 103),
+        (100, 104),
+        (101, 104),
+        (102, 105),
+    ]
+    for sender, receiver in edges:
+        many_users_session.add(
+            FriendshipEntity(sender=sender, receiver=receiver, status="accepted")
+        )
+    many_users_session.commit()
+    return many_users_session
+
+
+def test_suggest_friends_ranks_by_mutual_friends(friend_graph_session: Session):
+    service = FriendshipService(session=friend_graph_session)
+
+    suggestions = service.suggest_friends(user.pid, 10)
+
+    assert [(s.user.pid, s.mutual_friends) for s in suggestions] == [
+        (103, 3),
+        (104, 2),
+        (105, 1),
+    ]
+    assert [s.user.pid for s in service.suggest_friends(user.pid, 2)] == [103, 104]
+
+
+def test_suggest_friends_excludes_existing_requests(friend_graph_session: Session):
+    service = FriendshipService(session=friend_graph_session)
+    service.create_friend_request(104, user.pid)
+
+    suggestions = service.suggest_friends(user.pid, 10)
+
+    assert [s.user.pid for s in suggestions] == [103, 105]
+
+
+def test_refresh_friend_suggestions(friend_graph_session: Session):
+    service = FriendshipService(session=friend_graph_session)
+
+    stored = service.refresh_friend_suggestions(k=2)
+
+    assert stored == friend_graph_session.query(FriendSuggestionEntity).count()
+    rows = (
+        friend_graph_session.query(FriendSuggestionEntity)
+        .filter_by(user_pid=user.pid)
+        .order_by(FriendSuggestionEntity.rank)
+        .all()
+    )
+    assert [(r.rank, r.candidate_pid, r.mutual_friends) for r in rows] == [
+        (1, 103, 3),
+        (2, 104, 2),
+    ]
+    # Suggestions are symmetric: 103 shares 100, 101 and 102 with user and 100, 101 with 104
+    assert [
+        (r.candidate_pid, r.mutual_friends)
+        for r in friend_graph_session.query(FriendSuggestionEntity)
+        .filter_by(user_pid=103)
+        .order_by(FriendSuggestionEntity.rank)
+    ] == [(user.pid, 3), (104, 2)]
+
+
+def test_suggest_friends_reads_precomputed_rankings(friend_graph_session: Session):
+    service = FriendshipService(session=friend_graph_session)
+    service.refresh_friend_suggestions(k=2)
+
+    # Rankings are served from the table until the next refresh, minus new requests
+    assert [s.user.pid for s in service.suggest_friends(user.pid, 10)] == [103, 104]
+    service.create_friend_request(user.pid, 103)
+    assert [s.user.pid for s in service.suggest_friends(user.pid, 10)] == [104]
+
+
+def test_suggest_friends_skips_requested_before_limit(friend_graph_session: Session):
+    service = FriendshipService(session=friend_graph_session)
+    service.refresh_friend_suggestions(k=3)
+    service.create_friend_request(user.pid, 103)
+
+    # The requested top suggestion does not use up one of the k slots
+    assert [s.user.pid for s in service.suggest_friends(user.pid, 2)] == [104, 105]
+
+
+def test_suggest_friends_without_friends(prepared_session: Session):
+    service = FriendshipService(session=prepared_session)
+    assert service.suggest_friends(user.pid) == []
+
+
+def test_async_reads_match_sync_reads(
+    friend_graph_session: Session, async_session: async_sessionmaker
+):
+    service = FriendshipService(session=friend_graph_session)
+    service.create_friend_request(104, user.pid)
+    params = KeysetPaginationParams(page_size=3, filter="first")
+
+    async def read():
+        async with async_session() as session:
+            async_service = AsyncFriendshipService(session)
+            return (
+                await async_service.get_friends(user.pid),
+                await async_service.get_received_requests(user.pid),
+                await async_service.get_received_requests_count(user.pid),
+                await async_service.list_eligible_users_page(user.pid, params),
+                await async_service.suggest_friends(user.pid),
+                await async_service.get_friends_coworking_status(user.pid),
+            )
+
+    friends, received, count, page, suggestions, statuses = asyncio.run(read())
+    assert friends == service.get_friends(user.pid)
+    assert received == service.get_received_requests(user.pid)
+    assert count == 1
+    assert page == service.list_eligible_users_page(user.pid, params)
+    assert suggestions == service.suggest_friends(user.pid)
+    assert [s.user.pid for s in suggestions] == [103, 105]
+    assert statuses == service.get_friends_coworking_status(user.pid)
+    assert [s["friend_pid"] for s in statuses] == [100, 101, 102]
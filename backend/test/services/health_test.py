@@ -1,10 +1,15 @@
 """Tests for the HealthService class."""
 
 # Tested Dependencies
+from ...database import make_async_engine, make_engine
 from ...services.health import HealthService
 
 # Library Requirements
+import asyncio
+import pytest
 from datetime import datetime, timezone
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session
 
 __authors__ = ["Kris Jordan"]
@@ -17,3 +22,90 @@ def test_health_check(session: Session):
     now = str(datetime.now(tz=timezone.utc))[:16]
     result = health_service.check()
     assert f"OK @ {now}" in health_service.check()
+
+
+@pytest.fixture()
+def pooled_engine(monkeypatch: pytest.MonkeyPatch, test_engine: Engine):
+    """An engine for the test database with a small pool and a statement timeout."""
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", "2")
+    monkeypatch.setenv("POSTGRES_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("POSTGRES_STATEMENT_TIMEOUT", "1500")
+    engine = make_engine(test_engine.url.database)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def pooled_async_engine(pooled_engine: Engine):
+    """An asyncpg engine for the test database configured like `pooled_engine`."""
+    engine = make_async_engine(pooled_engine.url.database)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def test_pool_status(pooled_engine: Engine, pooled_async_engine: AsyncEngine):
+    with Session(pooled_engine) as session:
+        health_service = HealthService(session, AsyncSession(pooled_async_engine))
+        health_service.check()
+        with pooled_engine.connect(), pooled_engine.connect():
+            status = health_service.pool_status().sync
+    assert status is not None
+    assert status.size == 2
+    assert status.max_overflow == 1
+    assert status.checked_out == 3
+    assert status.overflow == 1
+    assert status.checkouts == 3
+    assert status.wait_seconds_max <= status.wait_seconds_total
+
+
+def test_pool_status_after_release(
+    pooled_engine: Engine, pooled_async_engine: AsyncEngine
+):
+    with Session(pooled_engine) as session:
+        HealthService(session).check()
+    with Session(pooled_engine) as session:
+        status = (
+            HealthService(session, AsyncSession(pooled_async_engine)).pool_status().sync
+        )
+    assert status is not None
+    assert status.checked_out == 0
+    assert status.checked_in == 1
+
+
+def test_async_pool_status(pooled_engine: Engine, pooled_async_engine: AsyncEngine):
+    async def status_while_connected():
+        async with AsyncSession(pooled_async_engine) as async_session:
+            with Session(pooled_engine) as session:
+                health_service = HealthService(session, async_session)
+                async with pooled_async_engine.connect():
+                    return health_service.pool_status()
+
+    status = asyncio.run(status_while_connected())
+    assert status.async_ is not None
+    assert status.async_.size == 2
+    assert status.async_.max_overflow == 1
+    assert status.async_.checked_out == 1
+    assert status.async_.checkouts == 1
+    assert status.model_dump(by_alias=True)["async"] == status.async_.model_dump()
+
+
+def test_statement_timeout(pooled_engine: Engine):
+    with pooled_engine.connect() as connection:
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == "1500ms"
+
+
+def test_pool_status_behind_pgbouncer(
+    monkeypatch: pytest.MonkeyPatch, test_engine: Engine
+):
+    monkeypatch.setenv("POSTGRES_PGBOUNCER", "true")
+    engine = make_engine(test_engine.url.database)
+    async_engine = make_async_engine(test_engine.url.database)
+    try:
+        with Session(engine) as session:
+            health_service = HealthService(session, AsyncSession(async_engine))
+            assert health_service.check().startswith("OK")
+            status = health_service.pool_status()
+            assert status.sync is None
+            assert status.async_ is None
+    finally:
+        engine.dispose()
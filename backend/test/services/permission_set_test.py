@@ -0,0 +1,56 @@
+"""Tests for the compiled PermissionSet matcher."""
+
+from ...services.permission_set import PermissionSet, compile_pattern
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def test_empty_set_allows_nothing():
+    assert PermissionSet().allows("checkin.create", "checkin") is False
+
+
+def test_exact_permission():
+    permissions = PermissionSet([("checkin.create", "checkin/1")])
+    assert permissions.allows("checkin.create", "checkin/1")
+    assert permissions.allows("checkin.create", "checkin/2") is False
+    assert permissions.allows("checkin.delete", "checkin/1") is False
+
+
+def test_wildcard_action_and_resource():
+    permissions = PermissionSet([("checkin.*", "user/*")])
+    assert permissions.allows("checkin.create", "user/1")
+    assert permissions.allows("checkin.", "user/")
+    assert permissions.allows("checkin", "user/1") is False
+    assert permissions.allows("role.create", "user/1") is False
+    assert permissions.allows("checkin.create", "role/1") is False
+
+
+def test_catch_all():
+    permissions = PermissionSet([("*", "*")])
+    assert permissions.allows("permission.grant", "*")
+    assert permissions.allows("", "")
+
+
+def test_many_grants_pair_actions_with_their_resources():
+    permissions = PermissionSet(
+        [(f"organization.{i}.*", f"organization/{i}") for i in range(100)]
+        + [("role.details", "role/1"), ("role.*", "role/2")]
+    )
+    assert permissions.allows("organization.42.update", "organization/42")
+    assert permissions.allows("organization.42.update", "organization/43") is False
+    assert permissions.allows("role.details", "role/1")
+    assert permissions.allows("role.details", "role/2")
+    assert permissions.allows("role.create", "role/1") is False
+
+
+def test_only_asterisk_is_special():
+    permissions = PermissionSet([("checkin.create", "user/[0-9]+")])
+    assert permissions.allows("checkin.create", "user/[0-9]+")
+    assert permissions.allows("checkinXcreate", "user/[0-9]+") is False
+    assert permissions.allows("checkin.create", "user/1") is False
+
+
+def test_compile_pattern_is_cached():
+    assert compile_pattern("coworking.*") is compile_pattern("coworking.*")
@@ -1,10 +1,12 @@
 """Tests for the PermissionService class."""
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 # Tested Dependencies
 from ...models import Permission, User
-from ...services import PermissionService
+from ...services import PermissionService, RoleService
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
@@ -76,6 +78,102 @@ def test_revoke_nonexistent_permission(permission_svc: PermissionService):
     )
 
 
+def test_check_memoizes_permissions(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that repeated checks for a subject are answered without querying again"""
+    assert permission_svc.check(ambassador, "checkin.create", "checkin")
+
+    statements = []
+    event.listen(
+        session, "do_orm_execute", lambda state: statements.append(state.statement)
+    )
+    assert permission_svc.check(ambassador, "checkin.create", "checkin")
+    assert permission_svc.check(ambassador, "checkin.delete", "checkin") is False
+    permission_svc.enforce(ambassador, "checkin.create", "checkin")
+    assert statements == []
+
+
+def test_check_forgets_permissions_after_commit(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that permissions memoized in one transaction are reloaded in the next"""
+    assert permission_svc.check(user, "checkin.delete", "checkin") is False
+    other_svc = PermissionService(session)
+    other_svc.grant(root, user, Permission(action="checkin.delete", resource="*"))
+    assert permission_svc.check(user, "checkin.delete", "checkin")
+
+
+def test_check_caches_permission_sets_across_transactions(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that compiled permissions are reused after the transaction that loaded them"""
+    assert permission_svc.check(ambassador, "checkin.create", "checkin")
+    session.commit()
+
+    statements = []
+    event.listen(
+        session, "do_orm_execute", lambda state: statements.append(state.statement)
+    )
+    assert PermissionService(session).check(ambassador, "checkin.create", "checkin")
+    assert statements == []
+
+
+def test_add_member_invalidates_user_roles(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that a new role member is granted the role's permissions"""
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
+    RoleService(session, permission_svc).add_member(root, ambassador_role.id, user)
+    assert permission_svc.check(user, "checkin.create", "checkin")
+
+
+def _count_round_trips(session: Session, fn) -> int:
+    """Count the statements sent to the database while calling fn."""
+    round_trips = []
+    engine = session.get_bind()
+
+    def count(*_):
+        round_trips.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return len(round_trips)
+
+
+def test_check_round_trips(session: Session, permission_svc: PermissionService):
+    """Tests that a cold check loads direct and role permissions in one round-trip"""
+    assert (
+        _count_round_trips(
+            session,
+            lambda: permission_svc.check(ambassador, "checkin.create", "checkin"),
+        )
+        == 1
+    )
+    assert (
+        _count_round_trips(
+            session,
+            lambda: permission_svc.check(ambassador, "checkin.delete", "checkin"),
+        )
+        == 0
+    )
+
+
+def test_check_round_trips_user_without_permissions(
+    session: Session, permission_svc: PermissionService
+):
+    """Tests that a cold check of a user without any permission or role is a single round-trip"""
+    assert (
+        _count_round_trips(
+            session, lambda: permission_svc.check(user, "checkin.create", "checkin")
+        )
+        == 1
+    )
+
+
 def test_root_resource_access(permission_svc: PermissionService):
     """Tests the permissions for the root user"""
     assert permission_svc.check(root, "access_control.grant", "access_control")
@@ -125,5 +223,5 @@ def test_check_specific_permission(permission_svc: PermissionService):
 
 
 def test_get_user_roles_permissions(permission_svc: PermissionService):
-    """Test covers an edge case of _get_user_roles_permissions when user does not exist"""
-    assert permission_svc._get_user_roles_permissions(User(id=423)) == []
+    """Test covers an edge case of get_permissions when user does not exist"""
+    assert permission_svc.get_permissions(User(id=423)) == []
@@ -0,0 +1,68 @@
+"""Tests for the in-process presence publish/subscribe hub."""
+
+import asyncio
+import threading
+
+from ...services.presence import PresenceHub
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def test_publish_reaches_only_recipients():
+    hub = PresenceHub()
+
+    async def scenario():
+        first = hub.subscribe(1)
+        second = hub.subscribe(2)
+        hub.publish([1], {"friend_pid": 3})
+        assert await asyncio.wait_for(first.get(), 1) == {"friend_pid": 3}
+        await asyncio.sleep(0)
+        assert second._queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_another_thread():
+    hub = PresenceHub()
+
+    async def scenario():
+        subscription = hub.subscribe(1)
+        publisher = threading.Thread(
+            target=hub.publish, args=([1, 2], {"friend_pid": 3})
+        )
+        publisher.start()
+        publisher.join()
+        assert await asyncio.wait_for(subscription.get(), 1) == {"friend_pid": 3}
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribe():
+    hub = PresenceHub()
+
+    async def scenario():
+        subscription = hub.subscribe(1)
+        assert hub.has_subscribers()
+        hub.unsubscribe(subscription)
+        assert not hub.has_subscribers()
+        hub.publish([1], {"friend_pid": 3})
+        await asyncio.sleep(0)
+        assert subscription._queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drops_messages():
+    hub = PresenceHub(queue_size=1)
+
+    async def scenario():
+        subscription = hub.subscribe(1)
+        hub.publish([1], {"friend_pid": 2})
+        hub.publish([1], {"friend_pid": 3})
+        assert await asyncio.wait_for(subscription.get(), 1) == {"friend_pid": 2}
+        await asyncio.sleep(0)
+        assert subscription._queue.empty()
+
+    asyncio.run(scenario())
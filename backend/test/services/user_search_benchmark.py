@@ -0,0 +1,105 @@
+"""Benchmark for UserService#search behind GET /api/user.
+
+This module is not collected with the rest of the suite; run it explicitly with:
+
+    pytest backend/test/services/user_search_benchmark.py
+
+The user table is seeded with synthetic users and searches typical of the user picker are timed
+with the trigram indexes in place and again after dropping them, which falls back to scanning
+every user for each keystroke.
+"""
+
+import random
+import string
+import time as timer
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from ...entities import UserEntity
+from ...services import UserService
+
+from .fixtures import user_svc_integration
+from .core_data import setup_insert_data_fixture
+from .user_data import ambassador
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+USERS = 50_000
+ROUNDS = 10
+QUERIES = ("sal", "stud", "ambassador", "kjordan", "zzqx")
+
+
+def _name(rng: random.Random) -> str:
+    return rng.choice(string.ascii_uppercase) + "".join(
+        rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))
+    )
+
+
+@pytest.fixture(autouse=True)
+def seed_users(setup_insert_data_fixture, session: Session):
+    """Seed synthetic users with random names after the core data."""
+    rng = random.Random(2023)
+    rows = []
+    for i in range(USERS):
+        first_name, last_name = _name(rng), _name(rng)
+        onyen = f"{first_name[:3]}{last_name[:4]}{i}".lower()
+        rows.append(
+            {
+                "id": 100 + i,
+                "pid": 100_000_000 + i,
+                "onyen": onyen,
+                "email": f"{onyen}@unc.edu",
+                "first_name": first_name,
+                "last_name": last_name,
+            }
+        )
+    session.execute(insert(UserEntity), rows)
+    session.commit()
+    # Move the new rows out of the GIN pending lists, as after the migration built the indexes
+    # over existing users, and refresh the planner's statistics.
+    with session.get_bind().connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+            text('VACUUM ANALYZE "user"')
+        )
+
+
+def _measure(user_svc: UserService) -> float:
+    """The best latency in seconds of searching for every query."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = timer.perf_counter()
+        for query in QUERIES:
+            user_svc.search(ambassador, query)
+        best = min(best, timer.perf_counter() - start)
+    return best
+
+
+def test_benchmark_user_search(
+    session: Session,
+    user_svc_integration: UserService,
+    capsys: pytest.CaptureFixture[str],
+):
+    indexed_results = [user_svc_integration.search(ambassador, q) for q in QUERIES]
+    indexed = _measure(user_svc_integration)
+
+    for column in ("first_name", "last_name", "onyen", "email"):
+        session.execute(text(f"DROP INDEX user_{column}_trgm_idx"))
+    session.commit()
+    assert [user_svc_integration.search(ambassador, q) for q in QUERIES] == (
+        indexed_results
+    )
+    scanned = _measure(user_svc_integration)
+
+    with capsys.disabled():
+        for label, seconds in (
+            ("trigram indexes", indexed),
+            ("sequential scan", scanned),
+        ):
+            print(
+                f"\nsearch, {USERS} users, {len(QUERIES)} queries, {label}: "
+                f"{seconds * 1000:.2f} ms"
+            )
@@ -1,13 +1,27 @@
 """Tests for the UserService class."""
 
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
 # Tested Dependencies
+from ...entities import UserEntity
+from ...models import Permission
 from ...models.user import User, NewUser
 from ...models.pagination import PaginationParams
-from ...services import UserService, PermissionService
+from ...services import AsyncUserService, UserService, PermissionService
+from ...services.user_cache import registered_users
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
-from .fixtures import user_svc, user_svc_integration, permission_svc_mock
+from .fixtures import (
+    user_svc,
+    user_svc_integration,
+    permission_svc,
+    permission_svc_mock,
+)
 
 # Data Models for Fake Data Inserted in Setup
 from .user_data import root, ambassador, user
@@ -93,6 +107,38 @@ def test_search_no_match(user_svc: UserService):
     assert len(users) == 0
 
 
+def _add_ambassadors(session: Session):
+    """Add users whose names contain "ambassador" to a varying degree."""
+    session.add_all(
+        [
+            UserEntity(
+                id=4,
+                pid=444444444,
+                onyen="ambrose",
+                email="ambrose@unc.edu",
+                first_name="Ambrose",
+                last_name="Ambassadorial",
+            ),
+            UserEntity(
+                id=5,
+                pid=555555555,
+                onyen="amber",
+                email="amber@unc.edu",
+                first_name="Amber",
+                last_name="Ambassador",
+            ),
+        ]
+    )
+    session.commit()
+
+
+def test_search_ranks_by_similarity(session: Session, user_svc: UserService):
+    """Test that the users most similar to the query are listed first."""
+    _add_ambassadors(session)
+    users = user_svc.search(ambassador, "ambassador")
+    assert [user.id for user in users] == [ambassador.id, 5, 4]
+
+
 def test_list(user_svc: UserService):
     """Test that a paginated list of users can be produced."""
     pagination_params = PaginationParams(page=0, page_size=2, order_by="id", filter="")
@@ -140,6 +186,17 @@ def test_list_filter(user_svc: UserService):
     assert users.items[0].id == ambassador.id
 
 
+def test_list_filter_ranks_by_similarity(session: Session, user_svc: UserService):
+    """Test that filtered users are ranked by similarity when no order is specified."""
+    _add_ambassadors(session)
+    pagination_params = PaginationParams(
+        page=0, page_size=2, order_by="", filter="ambassador"
+    )
+    users = user_svc.list(ambassador, pagination_params)
+    assert users.length == 3
+    assert [user.id for user in users.items] == [ambassador.id, 5]
+
+
 def test_list_enforces_permission(
     user_svc: UserService, permission_svc_mock: PermissionService
 ):
@@ -217,3 +274,114 @@ def test_update_user_enforces_permission(
     permission_svc_mock.enforce.assert_called_with(
         root, "user.update", f"user/{user.id}"
     )
+
+
+def _count_round_trips(session: Session, fn) -> int:
+    """Count the statements sent to the database while calling fn."""
+    round_trips = []
+    engine = session.get_bind()
+
+    def count(*_):
+        round_trips.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return len(round_trips)
+
+
+def test_get_registered_is_cached(session: Session, user_svc_integration: UserService):
+    """Test that a registered user is served from the cache after it is first loaded."""
+    assert _count_round_trips(
+        session, lambda: user_svc_integration.get_registered(ambassador.pid)
+    )
+    assert (
+        _count_round_trips(
+            session, lambda: user_svc_integration.get_registered(ambassador.pid)
+        )
+        == 0
+    )
+    assert user_svc_integration.get_registered(
+        ambassador.pid
+    ) == user_svc_integration.get(ambassador.pid)
+
+
+def test_get_registered_nonexistent_is_not_cached(user_svc_integration: UserService):
+    """Test that a nonexistent PID is looked up again rather than cached."""
+    assert user_svc_integration.get_registered(423) is None
+    assert registered_users.get(423) is None
+
+
+def test_get_registered_returns_copies(user_svc_integration: UserService):
+    """Test that changing a user served from the cache does not change the cached user."""
+    user = user_svc_integration.get_registered(ambassador.pid)
+    assert user is not None
+    user.first_name = "Changed"
+    cached = user_svc_integration.get_registered(ambassador.pid)
+    assert cached is not None
+    assert cached.first_name == ambassador.first_name
+
+
+def test_get_registered_after_update(user_svc_integration: UserService):
+    """Test that updating a user invalidates its cached copy."""
+    user = user_svc_integration.get_registered(ambassador.pid)
+    assert user is not None
+    user.first_name = "Andy"
+    user_svc_integration.update(root, user)
+    cached = user_svc_integration.get_registered(ambassador.pid)
+    assert cached is not None
+    assert cached.first_name == "Andy"
+
+
+def test_get_registered_after_grant(
+    user_svc_integration: UserService, permission_svc: PermissionService
+):
+    """Test that granting a user a permission invalidates its cached copy."""
+    user_svc_integration.get_registered(user.pid)
+    permission = Permission(action="checkin.create", resource="checkin")
+    permission_svc.grant(root, user, permission)
+    cached = user_svc_integration.get_registered(user.pid)
+    assert cached is not None
+    assert [(p.action, p.resource) for p in cached.permissions] == [
+        ("checkin.create", "checkin")
+    ]
+
+
+def test_get_registered_ignores_load_racing_invalidation(
+    user_svc_integration: UserService,
+):
+    """Test that a user loaded before an invalidation finished is not cached."""
+    generation = registered_users.generation
+    loaded = user_svc_integration.get(ambassador.pid)
+    assert loaded is not None
+    registered_users.invalidate(ambassador.pid)
+    registered_users.set(loaded, generation)
+    assert registered_users.get(ambassador.pid) is None
+
+
+def test_async_search(user_svc: UserService, async_session: async_sessionmaker):
+    """Test that the asynchronous search finds the same users as the synchronous one."""
+
+    async def search(query: str):
+        async with async_session() as session:
+            return await AsyncUserService(session).search(ambassador, query)
+
+    for query in ("amy", "bassad", "rhonda", "nobody"):
+        assert asyncio.run(search(query)) == user_svc.search(ambassador, query)
+
+
+def test_async_get_registered(
+    user_svc_integration: UserService, async_session: async_sessionmaker
+):
+    """Test that the asynchronous lookup loads the same user and fills the shared cache."""
+
+    async def get_registered(pid: int):
+        async with async_session() as session:
+            return await AsyncUserService(session).get_registered(pid)
+
+    user = asyncio.run(get_registered(ambassador.pid))
+    assert user == user_svc_integration.get(ambassador.pid)
+    assert registered_users.get(ambassador.pid) == user
+    assert asyncio.run(get_registered(423)) is None